@@ -1,129 +1,70 @@
 import sys
 import os
-import shutil
+import multiprocessing
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton,
     QLabel, QFileDialog, QLineEdit, QProgressBar, QMessageBox,
-    QHBoxLayout, QTextEdit, QSizePolicy, QScrollArea
+    QHBoxLayout, QPlainTextEdit, QSizePolicy, QScrollArea, QComboBox,
+    QCheckBox
 )
-from PyQt6.QtCore import QThread, pyqtSignal, Qt, QDateTime
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal, Qt
 from PyQt6.QtGui import QIntValidator
 
+from pdfsplitter import (DEFAULT_INCLUDE, DEFAULT_WORKERS, BufferedLogSink, PdfSplitter, Rebalancer, WatchSplitter,
+                         output_index)
+
+# Label strategi pengepakan yang ditampilkan di GUI
+STRATEGY_LABELS = {
+    "ffd": "First-Fit Decreasing",
+    "bfd": "Best-Fit Decreasing",
+    "refine": "Best-Fit + Penyempurnaan",
+}
+
+LOG_FLUSH_INTERVAL_MS = 100  # Interval pengambilan log/progres dari thread pekerja
+DEFAULT_MAX_LOG_LINES = 5000  # Jumlah baris maksimum yang disimpan di tampilan log
+LOG_FILE_NAME = "pdf_splitter_log.txt"  # Log lengkap ditulis ke folder tujuan
+METRICS_FILE_NAME = "pdf_splitter_metrics.json"  # Metrik kinerja run terakhir
+PROFILE_FILE_NAME = "pdf_splitter_profile.prof"  # Statistik cProfile (jika diaktifkan)
+
 # --- (Bagian PdfSplitterThread tanpa logika pembatalan) ---
 class PdfSplitterThread(QThread):
     progress_signal = pyqtSignal(int)
     status_signal = pyqtSignal(str)
     log_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(bool, str, dict)
+    metrics_signal = pyqtSignal(dict)
 
-    def __init__(self, source_folder, destination_folder, size_limit_mb, parent=None):
+    def __init__(self, source_folder, destination_folder, size_limit_mb, parent=None, log_sink=None, **options):
         super().__init__(parent)
-        self.source_folder = source_folder
-        self.destination_folder = destination_folder
-        self.size_limit_bytes = size_limit_mb * 1024 * 1024
-
-    def _log(self, message):
-        timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd hh:mm:ss")
-        self.log_signal.emit(f"[{timestamp}] {message}")
+        # Seluruh logika ada di pdfsplitter.PdfSplitter; thread ini hanya
+        # meneruskan callback-nya ke sinyal Qt, atau ke log_sink (jika ada)
+        # yang kemudian diambil GUI secara berkala.
+        self.splitter = PdfSplitter(source_folder, destination_folder, size_limit_mb,
+                                    on_metrics=self.metrics_signal.emit, **self._callbacks(log_sink), **options)
+
+    def _callbacks(self, log_sink):
+        if log_sink is not None:
+            return dict(on_progress=log_sink.progress, on_status=log_sink.status, on_log=log_sink.log)
+        return dict(on_progress=self.progress_signal.emit, on_status=self.status_signal.emit,
+                    on_log=self.log_signal.emit)
 
     def run(self):
-        folder_sizes = {}
-        try:
-            self._log("Memulai proses pembagian PDF...")
-            self.status_signal.emit("Memvalidasi folder dan mencari file PDF...")
+        success, message, folder_sizes = self.splitter.run()
+        self.finished_signal.emit(success, message, folder_sizes)
 
-            if not os.path.isdir(self.source_folder):
-                self._log(f"Error: Folder sumber '{self.source_folder}' tidak ditemukan atau bukan direktori.")
-                self.finished_signal.emit(False, "Folder sumber tidak ditemukan.", {})
-                return
 
-            if not os.path.exists(self.destination_folder):
-                os.makedirs(self.destination_folder)
-                self.status_signal.emit(f"Membuat folder tujuan: {self.destination_folder}")
-                self._log(f"Membuat folder tujuan: {self.destination_folder}")
-            else:
-                self._log(f"Folder tujuan sudah ada: {self.destination_folder}")
-
-            pdf_files = []
-            self._log(f"Mencari file PDF di '{self.source_folder}'...")
-            for root, _, files in os.walk(self.source_folder):
-                for file in files:
-                    if file.lower().endswith('.pdf'):
-                        file_path = os.path.join(root, file)
-                        try:
-                            file_size = os.path.getsize(file_path)
-                            pdf_files.append((file_path, file_size))
-                            self._log(f"Ditemukan: '{os.path.basename(file_path)}' ({file_size / (1024 * 1024):.2f} MB)")
-                        except OSError as e:
-                            self._log(f"Peringatan: Gagal mendapatkan ukuran file '{os.path.basename(file_path)}': {e}. Melewatkan file ini.")
-
-            if not pdf_files:
-                self._log("Tidak ada file PDF yang ditemukan di folder sumber.")
-                self.finished_signal.emit(False, "Tidak ada file PDF yang ditemukan di folder sumber.", {})
-                return
+class RebalanceThread(PdfSplitterThread):
+    def __init__(self, destination_folder, size_limit_mb, parent=None, log_sink=None, **options):
+        QThread.__init__(self, parent)
+        self.splitter = Rebalancer(destination_folder, size_limit_mb, **self._callbacks(log_sink), **options)
 
-            self._log(f"Total {len(pdf_files)} file PDF ditemukan.")
-            self._log("Mengurutkan file berdasarkan ukuran (dari terbesar ke terkecil) untuk efisiensi...")
-            pdf_files.sort(key=lambda x: x[1], reverse=True)
-
-            current_folder_index = 1
-            current_folder_size = 0
-            current_folder_path = os.path.join(self.destination_folder, f"output_{current_folder_index:01d}")
-            os.makedirs(current_folder_path, exist_ok=True)
-            folder_sizes[current_folder_path] = 0
-            self._log(f"Membuat folder output awal: {os.path.basename(current_folder_path)}")
-            self.status_signal.emit(f"Mulai menyalin ke '{os.path.basename(current_folder_path)}' (0.00 MB)")
-
-            total_files = len(pdf_files)
-            processed_files = 0
-
-            for file_path, file_size in pdf_files:
-                if current_folder_size > 0 and (current_folder_size + file_size > self.size_limit_bytes):
-                    current_folder_size_mb = current_folder_size / (1024 * 1024)
-                    limit_mb = self.size_limit_bytes / (1024 * 1024)
-                    self._log(f"Batas {limit_mb:.2f} MB tercapai untuk '{os.path.basename(current_folder_path)}'. Ukuran final folder ini: {current_folder_size_mb:.2f} MB")
-
-                    current_folder_index += 1
-                    current_folder_size = 0
-                    current_folder_path = os.path.join(self.destination_folder, f"output_{current_folder_index:01d}")
-                    os.makedirs(current_folder_path, exist_ok=True)
-                    folder_sizes[current_folder_path] = 0
-                    self._log(f"Membuat folder output baru: {os.path.basename(current_folder_path)}")
-                    self.status_signal.emit(f"Pindah ke folder baru: '{os.path.basename(current_folder_path)}' (0.00 MB)")
-
-                dest_file_path = os.path.join(current_folder_path, os.path.basename(file_path))
-                try:
-                    file_size_mb = file_size / (1024 * 1024)
-                    self._log(f"Menyalin '{os.path.basename(file_path)}' ({file_size_mb:.2f} MB) ke '{os.path.basename(current_folder_path)}'")
-                    shutil.move(file_path, dest_file_path)
-                    current_folder_size += file_size
-                    folder_sizes[current_folder_path] += file_size
-                    self.status_signal.emit(f"Menyalin '{os.path.basename(file_path)}' ({current_folder_size / (1024 * 1024):.2f} MB)")
-                except Exception as e:
-                    self._log(f"Gagal menyalin '{os.path.basename(file_path)}': {e}")
-                    self.status_signal.emit(f"Gagal menyalin '{os.path.basename(file_path)}'")
-
-                processed_files += 1
-                progress = int((processed_files / total_files) * 100)
-                self.progress_signal.emit(progress)
-
-            self._log("Proses pembagian PDF selesai. Melakukan verifikasi ukuran akhir folder...")
-            final_folder_sizes_display = {}
-            for folder_path, _ in folder_sizes.items():
-                if os.path.exists(folder_path):
-                    total_size_bytes_in_folder = sum(os.path.getsize(os.path.join(folder_path, f))
-                                                     for f in os.listdir(folder_path)
-                                                     if os.path.isfile(os.path.join(folder_path, f)))
-                    final_folder_sizes_display[os.path.basename(folder_path)] = total_size_bytes_in_folder
-                else:
-                    final_folder_sizes_display[os.path.basename(folder_path)] = 0
-
-            self._log("Semua file telah diproses.")
-            self.finished_signal.emit(True, "Pembagian file PDF selesai!", final_folder_sizes_display)
 
-        except Exception as e:
-            self._log(f"Terjadi kesalahan fatal selama proses: {e}")
-            self.finished_signal.emit(False, f"Terjadi kesalahan: {e}", {})
+class WatchThread(PdfSplitterThread):
+    def __init__(self, source_folder, destination_folder, size_limit_mb, parent=None, log_sink=None, **options):
+        QThread.__init__(self, parent)
+        # Berjalan sampai splitter.stop() dipanggil dari tombol "Hentikan Pemantauan".
+        self.splitter = WatchSplitter(source_folder, destination_folder, size_limit_mb,
+                                      **self._callbacks(log_sink), **options)
 
 # --- (Bagian PdfSplitterApp tanpa tombol batal) ---
 class PdfSplitterApp(QWidget):
@@ -135,6 +76,11 @@ class PdfSplitterApp(QWidget):
         self.source_folder = ""
         self.destination_folder = ""
         self.splitter_thread = None
+        self.log_sink = None
+
+        self.log_timer = QTimer(self)
+        self.log_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self.log_timer.timeout.connect(self.flush_log_sink)
 
         self.init_ui()
 
@@ -157,6 +103,13 @@ class PdfSplitterApp(QWidget):
                 padding: 6px; /* Padding sedikit lebih besar */
                 border-radius: 4px; /* Sudut lebih membulat */
             }
+            QComboBox {
+                background-color: #2b2b2b;
+                border: 1px solid #444444;
+                color: #e0e0e0;
+                padding: 5px;
+                border-radius: 4px;
+            }
             QPushButton {
                 background-color: #007acc; /* Biru cerah, umum di tema gelap */
                 color: white;
@@ -176,7 +129,7 @@ class PdfSplitterApp(QWidget):
                 background-color: #333333; /* Warna gelap untuk tombol nonaktif */
                 color: #777777; /* Teks abu-abu untuk tombol nonaktif */
             }
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #2b2b2b;
                 color: #c0c0c0; /* Warna teks log sedikit lebih redup */
                 border: 1px solid #444444;
@@ -284,9 +237,97 @@ class PdfSplitterApp(QWidget):
         self.size_input.setValidator(QIntValidator(1, 10000, self))
         self.size_input.setMaximumWidth(100)
         size_layout.addWidget(self.size_input)
+        size_layout.addWidget(QLabel("<b>Strategi:</b>"))
+        self.strategy_input = QComboBox()
+        for key, label in STRATEGY_LABELS.items():
+            self.strategy_input.addItem(label, key)
+        self.strategy_input.setCurrentIndex(list(STRATEGY_LABELS).index("bfd"))
+        size_layout.addWidget(self.strategy_input)
+        size_layout.addWidget(QLabel("<b>Mode:</b>"))
+        self.mode_input = QComboBox()
+        self.mode_input.addItem("Pindahkan", "move")
+        self.mode_input.addItem("Salin", "copy")
+        size_layout.addWidget(self.mode_input)
+        size_layout.addWidget(QLabel("<b>Output:</b>"))
+        self.format_input = QComboBox()
+        self.format_input.addItem("Folder", "folder")
+        self.format_input.addItem("ZIP", "zip")
+        self.format_input.addItem("TAR", "tar")
+        size_layout.addWidget(self.format_input)
+        size_layout.addWidget(QLabel("<b>Worker:</b>"))
+        self.workers_input = QLineEdit()
+        self.workers_input.setText(str(DEFAULT_WORKERS))
+        self.workers_input.setValidator(QIntValidator(1, 64, self))
+        self.workers_input.setMaximumWidth(50)
+        size_layout.addWidget(self.workers_input)
+        size_layout.addWidget(QLabel("<b>Maks. Baris Log:</b>"))
+        self.log_lines_input = QLineEdit()
+        self.log_lines_input.setText(str(DEFAULT_MAX_LOG_LINES))
+        self.log_lines_input.setValidator(QIntValidator(100, 1000000, self))
+        self.log_lines_input.setMaximumWidth(70)
+        size_layout.addWidget(self.log_lines_input)
+        size_layout.addWidget(QLabel("<b>Memori (MB):</b>"))
+        self.memory_budget_input = QLineEdit()
+        self.memory_budget_input.setPlaceholderText("Tanpa batas")
+        self.memory_budget_input.setValidator(QIntValidator(16, 1000000, self))
+        self.memory_budget_input.setMaximumWidth(80)
+        self.memory_budget_input.setToolTip("Untuk jutaan file: daftar file disimpan ringkas dan diurutkan di disk "
+                                            "jika melebihi anggaran ini (strategi FFD/BFD, output folder)")
+        size_layout.addWidget(self.memory_budget_input)
+        size_layout.addWidget(QLabel("<b>Maks. Halaman:</b>"))
+        self.max_pages_input = QLineEdit()
+        self.max_pages_input.setPlaceholderText("Tanpa batas")
+        self.max_pages_input.setValidator(QIntValidator(1, 100000000, self))
+        self.max_pages_input.setMaximumWidth(80)
+        self.max_pages_input.setToolTip("Batas jumlah halaman per folder, selain batas ukuran")
+        size_layout.addWidget(self.max_pages_input)
+        size_layout.addWidget(QLabel("<b>Maks. File:</b>"))
+        self.max_files_input = QLineEdit()
+        self.max_files_input.setPlaceholderText("Tanpa batas")
+        self.max_files_input.setValidator(QIntValidator(1, 100000000, self))
+        self.max_files_input.setMaximumWidth(80)
+        self.max_files_input.setToolTip("Batas jumlah file per folder, selain batas ukuran")
+        size_layout.addWidget(self.max_files_input)
         size_layout.addStretch()
         main_layout.addLayout(size_layout)
 
+        # --- Filter Pencarian File ---
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("<b>Sertakan:</b>"))
+        self.include_input = QLineEdit()
+        self.include_input.setText(", ".join(DEFAULT_INCLUDE))
+        self.include_input.setPlaceholderText("Pola glob, pisahkan dengan koma")
+        filter_layout.addWidget(self.include_input)
+        filter_layout.addWidget(QLabel("<b>Kecualikan:</b>"))
+        self.exclude_input = QLineEdit()
+        self.exclude_input.setPlaceholderText("Contoh: arsip*, */tmp/*")
+        filter_layout.addWidget(self.exclude_input)
+        self.follow_symlinks_input = QCheckBox("Ikuti symlink")
+        filter_layout.addWidget(self.follow_symlinks_input)
+        filter_layout.addWidget(QLabel("<b>Duplikat:</b>"))
+        self.dedup_input = QComboBox()
+        self.dedup_input.addItem("Tidak dicek", None)
+        self.dedup_input.addItem("Laporkan saja", "keep")
+        self.dedup_input.addItem("Lewati", "skip")
+        self.dedup_input.addItem("Hardlink", "hardlink")
+        self.dedup_input.setToolTip("Deteksi file PDF yang isinya identik sebelum dibagi")
+        filter_layout.addWidget(self.dedup_input)
+        self.split_oversize_input = QCheckBox("Pecah PDF yang melebihi batas")
+        self.split_oversize_input.setChecked(True)
+        self.split_oversize_input.setToolTip("PDF yang lebih besar dari batas folder dipecah per halaman")
+        filter_layout.addWidget(self.split_oversize_input)
+        self.resume_input = QCheckBox("Lanjutkan run terputus")
+        filter_layout.addWidget(self.resume_input)
+        self.verify_input = QCheckBox("Verifikasi checksum")
+        filter_layout.addWidget(self.verify_input)
+        self.paranoid_input = QCheckBox("Baca ulang tujuan")
+        self.paranoid_input.setToolTip("Verifikasi paranoid: setiap file tujuan dibaca ulang dan dibandingkan "
+                                       "(satu pembacaan penuh tambahan per file)")
+        filter_layout.addWidget(self.paranoid_input)
+        self.profile_input = QCheckBox("Profil (cProfile)")
+        filter_layout.addWidget(self.profile_input)
+        main_layout.addLayout(filter_layout)
+
         # --- Tombol Mulai ---
         button_layout = QHBoxLayout()
         self.start_button = QPushButton("Mulai Pembagian PDF")
@@ -311,6 +352,21 @@ class PdfSplitterApp(QWidget):
             }
         """)
         button_layout.addWidget(self.start_button)
+        self.rebalance_button = QPushButton("Rebalance Folder Tujuan")
+        self.rebalance_button.setToolTip("Susun ulang output_N yang sudah ada di folder tujuan sesuai batas ukuran saat ini")
+        self.rebalance_button.clicked.connect(self.start_rebalance)
+        self.rebalance_button.setEnabled(False)
+        button_layout.addWidget(self.rebalance_button)
+        self.watch_button = QPushButton("Pantau Folder Sumber")
+        self.watch_button.setToolTip("Tempatkan PDF baru di folder sumber secara otomatis begitu selesai ditulis "
+                                     "(mode pindahkan)")
+        self.watch_button.clicked.connect(self.start_watch)
+        self.watch_button.setEnabled(False)
+        button_layout.addWidget(self.watch_button)
+        self.stop_watch_button = QPushButton("Hentikan Pemantauan")
+        self.stop_watch_button.clicked.connect(self.stop_watch)
+        self.stop_watch_button.setEnabled(False)
+        button_layout.addWidget(self.stop_watch_button)
         main_layout.addLayout(button_layout)
 
         # --- Progress Bar ---
@@ -326,8 +382,9 @@ class PdfSplitterApp(QWidget):
         main_layout.addWidget(self.status_label)
 
         # --- Area Log Display ---
-        self.log_display = QTextEdit()
+        self.log_display = QPlainTextEdit()
         self.log_display.setReadOnly(True)
+        self.log_display.setMaximumBlockCount(DEFAULT_MAX_LOG_LINES)
         self.log_display.setPlaceholderText("Log proses akan muncul di sini...")
         self.log_display.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         
@@ -357,11 +414,68 @@ class PdfSplitterApp(QWidget):
     def update_start_button_state(self):
         is_ready = bool(self.source_folder and self.destination_folder and self.size_input.text())
         self.start_button.setEnabled(is_ready)
+        self.watch_button.setEnabled(is_ready)
+        self.rebalance_button.setEnabled(bool(self.destination_folder and self.size_input.text()))
+
+    def _set_inputs_enabled(self, enabled):
+        self.start_button.setEnabled(enabled)
+        self.rebalance_button.setEnabled(enabled)
+        self.watch_button.setEnabled(enabled)
+        self.source_button.setEnabled(enabled)
+        self.dest_button.setEnabled(enabled)
+        self.size_input.setReadOnly(not enabled)
+        self.strategy_input.setEnabled(enabled)
+        self.mode_input.setEnabled(enabled)
+        self.format_input.setEnabled(enabled)
+        self.workers_input.setReadOnly(not enabled)
+        self.log_lines_input.setReadOnly(not enabled)
+        self.memory_budget_input.setReadOnly(not enabled)
+        self.max_pages_input.setReadOnly(not enabled)
+        self.max_files_input.setReadOnly(not enabled)
+        self.include_input.setReadOnly(not enabled)
+        self.exclude_input.setReadOnly(not enabled)
+        self.follow_symlinks_input.setEnabled(enabled)
+        self.profile_input.setEnabled(enabled)
+        self.verify_input.setEnabled(enabled)
+        self.paranoid_input.setEnabled(enabled)
+        self.resume_input.setEnabled(enabled)
+        self.split_oversize_input.setEnabled(enabled)
+        self.dedup_input.setEnabled(enabled)
+
+    def _start_log_session(self):
+        max_log_lines = int(self.log_lines_input.text() or DEFAULT_MAX_LOG_LINES)
+        self.log_display.clear()
+        self.log_display.setMaximumBlockCount(max_log_lines)
+        if not os.path.exists(self.destination_folder):
+            os.makedirs(self.destination_folder)
+        self.log_sink = BufferedLogSink(os.path.join(self.destination_folder, LOG_FILE_NAME))
+        self.log_timer.start()
+
+    @staticmethod
+    def _split_patterns(text):
+        return [pattern.strip() for pattern in text.split(",") if pattern.strip()]
 
     def append_log(self, message):
-        self.log_display.append(message)
+        # Selama proses berjalan, semua log lewat log_sink agar urutannya
+        # terjaga dan ikut tertulis ke file log.
+        if self.log_sink is not None:
+            self.log_sink.log(message)
+            return
+        self.log_display.appendPlainText(message)
         self.log_display.verticalScrollBar().setValue(self.log_display.verticalScrollBar().maximum())
 
+    def flush_log_sink(self):
+        if self.log_sink is None:
+            return
+        lines, status, progress = self.log_sink.drain()
+        if lines:
+            self.log_display.appendPlainText("\n".join(lines))
+            self.log_display.verticalScrollBar().setValue(self.log_display.verticalScrollBar().maximum())
+        if status is not None:
+            self.status_label.setText(status)
+        if progress is not None:
+            self.progress_bar.setValue(progress)
+
     # --- Metode Logika Utama (tanpa pembatalan) ---
 
     def start_splitting(self):
@@ -376,6 +490,23 @@ class PdfSplitterApp(QWidget):
                 QMessageBox.warning(self, "Input Error", "Batas ukuran harus lebih besar dari 0 MB.")
                 return
 
+            workers = int(self.workers_input.text() or DEFAULT_WORKERS)
+            include = self._split_patterns(self.include_input.text()) or list(DEFAULT_INCLUDE)
+            exclude = self._split_patterns(self.exclude_input.text())
+            memory_budget_mb = int(self.memory_budget_input.text()) if self.memory_budget_input.text() else None
+            if memory_budget_mb and (self.strategy_input.currentData() == "refine"
+                                     or self.format_input.currentData() != "folder"
+                                     or self.dedup_input.currentData() is not None):
+                QMessageBox.warning(self, "Input Error", "Batas memori hanya bisa dipakai dengan strategi FFD/BFD, "
+                                                         "output Folder, dan tanpa deteksi duplikat.")
+                return
+            max_pages = int(self.max_pages_input.text()) if self.max_pages_input.text() else None
+            max_files = int(self.max_files_input.text()) if self.max_files_input.text() else None
+            if memory_budget_mb and (max_pages or max_files):
+                QMessageBox.warning(self, "Input Error", "Batas memori tidak bisa dipakai bersama batas "
+                                                         "halaman/file per folder.")
+                return
+
             if os.path.abspath(self.source_folder) == os.path.abspath(self.destination_folder):
                 reply = QMessageBox.question(self, 'Peringatan Folder',
                                              "Folder sumber dan tujuan sama. Ini dapat menimpa atau mengganggu file asli. Lanjutkan?",
@@ -384,25 +515,124 @@ class PdfSplitterApp(QWidget):
                 if reply == QMessageBox.StandardButton.No:
                     return
 
-            self.log_display.clear()
+            self._start_log_session()
             self.append_log("--- Memulai Sesi Baru ---")
             self.append_log(f"Folder Sumber: {self.source_folder}")
             self.append_log(f"Folder Tujuan: {self.destination_folder}")
             self.append_log(f"Batas Ukuran Per Folder: {size_limit_mb} MB")
-
-            self.start_button.setEnabled(False)
-            self.source_button.setEnabled(False)
-            self.dest_button.setEnabled(False)
-            self.size_input.setReadOnly(True)
+            self.append_log(f"Strategi Pengepakan: {self.strategy_input.currentText()}")
+            self.append_log(f"Mode Distribusi: {self.mode_input.currentText()}")
+            self.append_log(f"Format Output: {self.format_input.currentText()}")
+            self.append_log(f"Worker Per Perangkat: {workers}")
+            if memory_budget_mb:
+                self.append_log(f"Anggaran Memori Daftar File: {memory_budget_mb} MB")
+            if max_pages:
+                self.append_log(f"Batas Halaman Per Folder: {max_pages}")
+            if max_files:
+                self.append_log(f"Batas File Per Folder: {max_files}")
+            self.append_log(f"Filter: sertakan {include}, kecualikan {exclude}")
+            self.append_log(f"Log lengkap: {self.log_sink.log_path}")
+
+            self._set_inputs_enabled(False)
             self.status_label.setText("Memulai proses pembagian...")
             self.progress_bar.setValue(0)
 
             self.splitter_thread = PdfSplitterThread(
-                self.source_folder, self.destination_folder, size_limit_mb
+                self.source_folder, self.destination_folder, size_limit_mb,
+                strategy=self.strategy_input.currentData(), mode=self.mode_input.currentData(),
+                output_format=self.format_input.currentData(),
+                workers=workers,
+                include=include, exclude=exclude,
+                follow_symlinks=self.follow_symlinks_input.isChecked(),
+                log_sink=self.log_sink,
+                dedup=self.dedup_input.currentData(),
+                split_oversize=self.split_oversize_input.isChecked(),
+                max_pages=max_pages,
+                max_files=max_files,
+                memory_budget_mb=memory_budget_mb,
+                resume=self.resume_input.isChecked(),
+                verify=self.verify_input.isChecked(),
+                paranoid=self.paranoid_input.isChecked(),
+                metrics_json=os.path.join(self.destination_folder, METRICS_FILE_NAME),
+                profile_path=(os.path.join(self.destination_folder, PROFILE_FILE_NAME)
+                              if self.profile_input.isChecked() else None)
+            )
+            self.splitter_thread.metrics_signal.connect(self.on_metrics)
+            self.splitter_thread.finished_signal.connect(self.on_splitting_finished)
+            self.splitter_thread.start()
+
+        except ValueError:
+            QMessageBox.warning(self, "Input Error", "Batas ukuran harus berupa angka integer yang valid.")
+            self.update_start_button_state()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Terjadi kesalahan yang tidak terduga saat memulai: {e}")
+            self.on_splitting_finished(False, f"Error tak terduga: {e}", {})
+
+    def start_rebalance(self):
+        try:
+            size_limit_mb = int(self.size_input.text())
+            if size_limit_mb <= 0:
+                QMessageBox.warning(self, "Input Error", "Batas ukuran harus lebih besar dari 0 MB.")
+                return
+            workers = int(self.workers_input.text() or DEFAULT_WORKERS)
+
+            reply = QMessageBox.question(self, 'Rebalance',
+                                         f"Susun ulang folder output_N di '{self.destination_folder}' dengan batas "
+                                         f"{size_limit_mb} MB? Sebagian file akan dipindah antar folder.",
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                         QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.No:
+                return
+
+            self._start_log_session()
+            self.append_log("--- Memulai Rebalance ---")
+            self.append_log(f"Folder Tujuan: {self.destination_folder}")
+            self.append_log(f"Batas Ukuran Per Folder: {size_limit_mb} MB")
+
+            self._set_inputs_enabled(False)
+            self.status_label.setText("Memulai rebalance...")
+            self.progress_bar.setValue(0)
+
+            self.splitter_thread = RebalanceThread(self.destination_folder, size_limit_mb, workers=workers,
+                                                   log_sink=self.log_sink)
+            self.splitter_thread.finished_signal.connect(self.on_splitting_finished)
+            self.splitter_thread.start()
+
+        except ValueError:
+            QMessageBox.warning(self, "Input Error", "Batas ukuran harus berupa angka integer yang valid.")
+            self.update_start_button_state()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Terjadi kesalahan yang tidak terduga saat memulai: {e}")
+            self.on_splitting_finished(False, f"Error tak terduga: {e}", {})
+
+    def start_watch(self):
+        try:
+            size_limit_mb = int(self.size_input.text())
+            if size_limit_mb <= 0:
+                QMessageBox.warning(self, "Input Error", "Batas ukuran harus lebih besar dari 0 MB.")
+                return
+            include = self._split_patterns(self.include_input.text()) or list(DEFAULT_INCLUDE)
+            exclude = self._split_patterns(self.exclude_input.text())
+
+            self._start_log_session()
+            self.append_log("--- Memulai Pemantauan ---")
+            self.append_log(f"Folder Sumber: {self.source_folder}")
+            self.append_log(f"Folder Tujuan: {self.destination_folder}")
+            self.append_log(f"Batas Ukuran Per Folder: {size_limit_mb} MB")
+            self.append_log(f"Filter: sertakan {include}, kecualikan {exclude}")
+            self.append_log(f"Log lengkap: {self.log_sink.log_path}")
+
+            self._set_inputs_enabled(False)
+            self.stop_watch_button.setEnabled(True)
+            self.status_label.setText("Memantau folder sumber...")
+            self.progress_bar.setValue(0)
+
+            self.splitter_thread = WatchThread(
+                self.source_folder, self.destination_folder, size_limit_mb,
+                include=include, exclude=exclude,
+                split_oversize=self.split_oversize_input.isChecked(),
+                log_sink=self.log_sink
             )
-            self.splitter_thread.progress_signal.connect(self.progress_bar.setValue)
-            self.splitter_thread.status_signal.connect(self.status_label.setText)
-            self.splitter_thread.log_signal.connect(self.append_log)
             self.splitter_thread.finished_signal.connect(self.on_splitting_finished)
             self.splitter_thread.start()
 
@@ -413,15 +643,28 @@ class PdfSplitterApp(QWidget):
             QMessageBox.critical(self, "Error", f"Terjadi kesalahan yang tidak terduga saat memulai: {e}")
             self.on_splitting_finished(False, f"Error tak terduga: {e}", {})
 
+    def stop_watch(self):
+        self.stop_watch_button.setEnabled(False)
+        self.status_label.setText("Menghentikan pemantauan...")
+        self.splitter_thread.splitter.stop()
+
+    def on_metrics(self, metrics):
+        if metrics.get("slowest_files"):
+            slowest = metrics["slowest_files"][0]
+            self.append_log(f"File paling lambat: '{os.path.basename(slowest['path'])}' ({slowest['seconds']:.2f} s)")
+
     def on_splitting_finished(self, success, message, folder_sizes):
+        # Ambil sisa log dari thread pekerja sebelum ringkasan ditampilkan.
+        self.flush_log_sink()
+        self.stop_watch_button.setEnabled(False)
         if success:
             QMessageBox.information(self, "Selesai", message)
-            self.status_label.setText("Pembagian file PDF selesai!")
-            self.append_log("--- Pembagian Selesai ---")
+            self.status_label.setText(message)
+            self.append_log("--- Proses Selesai ---")
             self.append_log("Ukuran Akhir Setiap Folder:")
             if folder_sizes:
                 # Mengurutkan berdasarkan nomor folder
-                sorted_folder_sizes = sorted(folder_sizes.items(), key=lambda item: int(item[0].split('_')[-1]))
+                sorted_folder_sizes = sorted(folder_sizes.items(), key=lambda item: output_index(item[0]))
                 for folder_name, size_bytes in sorted_folder_sizes:
                     size_mb = size_bytes / (1024 * 1024)
                     self.append_log(f"  - {folder_name}: {size_mb:.2f} MB")
@@ -432,16 +675,21 @@ class PdfSplitterApp(QWidget):
             self.status_label.setText(f"Gagal: {message}")
             self.append_log(f"--- Proses Gagal: {message} ---")
 
-        self.start_button.setEnabled(True)
-        self.source_button.setEnabled(True)
-        self.dest_button.setEnabled(True)
-        self.size_input.setReadOnly(False)
+        self.log_timer.stop()
+        self.flush_log_sink()
+        if self.log_sink is not None:
+            self.log_sink.close()
+            self.log_sink = None
+
+        self._set_inputs_enabled(True)
         self.update_start_button_state()
 
         self.splitter_thread = None
 
 
 if __name__ == "__main__":
+    # Deteksi duplikat memakai pool proses; wajib untuk build PyInstaller di Windows.
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = PdfSplitterApp()
     window.show()
@@ -0,0 +1,114 @@
+import argparse
+import math
+import os
+import random
+import time
+
+# --- Generator pohon PDF sintetis untuk benchmark ---
+#
+# Membuat pohon direktori berisi file .pdf dengan jumlah, distribusi ukuran
+# dan kedalaman yang bisa diatur. Secara default file dibuat sparse (header
+# PDF minimal lalu truncate ke ukuran target), sehingga jutaan file bisa
+# dibuat cepat tanpa menghabiskan disk; --fill menulis isi sungguhan agar
+# throughput salin terukur realistis.
+#
+#   python -m benchmarks.generate /dev/shm/pdf-bench --files 100000 --distribution lognormal
+
+DISTRIBUTIONS = ("uniform", "lognormal", "heavytail")
+DEFAULT_MEAN_KB = 512
+DEFAULT_DEPTH = 3
+DEFAULT_FANOUT = 16
+
+_PDF_HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+_LOGNORMAL_SIGMA = 1.0
+_PARETO_ALPHA = 1.5
+
+
+def sample_sizes(count, distribution="lognormal", mean_kb=DEFAULT_MEAN_KB, seed=0):
+    """Mengembalikan `count` ukuran file (byte) dengan rata-rata kira-kira `mean_kb`."""
+    rng = random.Random(seed)
+    mean = mean_kb * 1024
+    minimum = len(_PDF_HEADER)
+    if distribution == "uniform":
+        draw = lambda: rng.uniform(0, 2 * mean)
+    elif distribution == "lognormal":
+        # E[X] = exp(mu + sigma^2 / 2)
+        mu = math.log(mean) - _LOGNORMAL_SIGMA ** 2 / 2
+        draw = lambda: rng.lognormvariate(mu, _LOGNORMAL_SIGMA)
+    elif distribution == "heavytail":
+        # Pareto dengan x_m dipilih agar E[X] = alpha * x_m / (alpha - 1) = mean
+        scale = mean * (_PARETO_ALPHA - 1) / _PARETO_ALPHA
+        draw = lambda: scale * rng.paretovariate(_PARETO_ALPHA)
+    else:
+        raise ValueError(f"Distribusi tidak dikenal: {distribution}")
+    return [max(minimum, int(draw())) for _ in range(count)]
+
+
+def _directory_for(index, depth, fanout):
+    parts = []
+    for _ in range(depth):
+        index, digit = divmod(index, fanout)
+        parts.append(f"d{digit:02d}")
+    return os.path.join(*parts) if parts else ""
+
+
+def generate_tree(root, files, distribution="lognormal", depth=DEFAULT_DEPTH, fanout=DEFAULT_FANOUT,
+                  mean_kb=DEFAULT_MEAN_KB, fill=False, seed=0):
+    """Membuat pohon sintetis di `root`; mengembalikan ringkasan (dict)."""
+    sizes = sample_sizes(files, distribution, mean_kb, seed)
+    leaves = fanout ** depth
+    created = set()
+    chunk = os.urandom(1024 * 1024) if fill else None
+    start = time.perf_counter()
+    for index, size in enumerate(sizes):
+        directory = os.path.join(root, _directory_for(index % leaves, depth, fanout))
+        if directory not in created:
+            os.makedirs(directory, exist_ok=True)
+            created.add(directory)
+        with open(os.path.join(directory, f"doc_{index:07d}.pdf"), "wb") as f:
+            f.write(_PDF_HEADER)
+            if fill:
+                written = len(_PDF_HEADER)
+                while written < size:
+                    written += f.write(chunk[:size - written])
+            else:
+                f.truncate(size)
+    return {
+        "root": os.path.abspath(root),
+        "files": files,
+        "distribution": distribution,
+        "depth": depth,
+        "fanout": fanout,
+        "mean_kb": mean_kb,
+        "fill": fill,
+        "seed": seed,
+        "directories": len(created),
+        "bytes": sum(sizes),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.generate",
+                                     description="Membuat pohon file PDF sintetis untuk benchmark.")
+    parser.add_argument("root", help="Folder tempat pohon dibuat.")
+    parser.add_argument("--files", type=int, default=10000, help="Jumlah file (default: %(default)s).")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal",
+                        help="Distribusi ukuran file (default: %(default)s).")
+    parser.add_argument("--mean-kb", type=int, default=DEFAULT_MEAN_KB, help="Rata-rata ukuran file dalam KB.")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="Kedalaman direktori (default: %(default)s).")
+    parser.add_argument("--fanout", type=int, default=DEFAULT_FANOUT,
+                        help="Jumlah subfolder per tingkat (default: %(default)s).")
+    parser.add_argument("--fill", action="store_true", help="Tulis isi file sungguhan alih-alih file sparse.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed acak agar pohon bisa dibuat ulang persis.")
+    args = parser.parse_args(argv)
+
+    summary = generate_tree(args.root, args.files, args.distribution, args.depth, args.fanout,
+                            args.mean_kb, args.fill, args.seed)
+    print(f"{summary['files']} file ({summary['bytes'] / (1024 * 1024):.1f} MB) di "
+          f"{summary['directories']} folder dibuat dalam {summary['seconds']:.2f} detik.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,279 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from pdfsplitter import STRATEGIES, PdfSplitter, discover, lower_bound, pack
+
+from .generate import DEFAULT_DEPTH, DEFAULT_FANOUT, DEFAULT_MEAN_KB, DISTRIBUTIONS, generate_tree
+
+# --- Benchmark discovery, kualitas packing, throughput transfer dan RSS puncak ---
+#
+# Untuk setiap kombinasi (folder akar, jumlah file, distribusi) dibuat pohon
+# sintetis, lalu tiap fase diukur di proses anak tersendiri (spawn) agar RSS
+# puncaknya terpisah dan tidak terbawa dari fase sebelumnya. Hasilnya disimpan
+# sebagai JSON; --compare membandingkannya dengan hasil lama dan mengembalikan
+# exit code 1 jika ada regresi.
+#
+#   python -m benchmarks.run --files 1000 100000 --distribution lognormal heavytail
+#   python -m benchmarks.run --compare baseline.json --output hasil.json
+#
+# Catatan: page cache tidak dikosongkan di antara fase (butuh root), jadi
+# angka discovery mencerminkan cache hangat.
+
+PHASES = ("discovery", "packing", "transfer")
+DEFAULT_FILE_COUNTS = (1000, 10000)
+DEFAULT_LIMIT_MB = 100
+DEFAULT_TOLERANCE = 0.10
+RESULT_VERSION = 1
+
+
+def _default_roots():
+    roots = []
+    if os.path.isdir("/dev/shm"):
+        roots.append("/dev/shm")  # tmpfs
+    roots.append(tempfile.gettempdir())
+    return roots
+
+
+def _peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss dalam KB di Linux, tetapi dalam byte di macOS.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# --- Fase yang dijalankan di proses anak ---
+
+def _bench_discovery(source, workers):
+    files = 0
+    total = 0
+    start = time.perf_counter()
+    for _, size in discover(source, workers=workers):
+        files += 1
+        total += size
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "files": files,
+        "bytes": total,
+        "files_per_second": files / seconds if seconds else 0.0,
+    }
+
+
+def _bench_packing(source, limit_mb, strategy):
+    items = list(discover(source))
+    limit = limit_mb * 1024 * 1024
+    start = time.perf_counter()
+    bins = pack(items, limit, strategy)
+    seconds = time.perf_counter() - start
+    bound = lower_bound(items, limit)
+    return {
+        "seconds": seconds,
+        "strategy": strategy,
+        "folders": len(bins),
+        "lower_bound": bound,
+        "ratio": len(bins) / bound if bound else 1.0,
+    }
+
+
+def _bench_transfer(source, destination, limit_mb, strategy, workers, hardlink, memory_budget_mb=None):
+    # Mode salin agar pohon sumber tetap utuh untuk kombinasi berikutnya.
+    splitter = PdfSplitter(source, destination, limit_mb, strategy=strategy, mode="copy", workers=workers,
+                           hardlink=hardlink, memory_budget_mb=memory_budget_mb)
+    success, message, _ = splitter.run()
+    if not success:
+        raise RuntimeError(message)
+    metrics = splitter.metrics.as_dict()
+    return {
+        "seconds": metrics["phases"].get("transfer", 0.0),
+        "wall_seconds": metrics["wall_seconds"],
+        "phases": metrics["phases"],
+        "files": metrics["files"],
+        "bytes": metrics["bytes"],
+        "files_per_second": metrics["files_per_second"],
+        "mb_per_second": metrics["mb_per_second"],
+        "mechanisms": metrics["mechanisms"],
+    }
+
+
+_BENCHMARKS = {
+    "discovery": _bench_discovery,
+    "packing": _bench_packing,
+    "transfer": _bench_transfer,
+}
+
+
+def _child(phase, params, results):
+    try:
+        result = _BENCHMARKS[phase](**params)
+        result["peak_rss_kb"] = _peak_rss_kb()
+        results.put(result)
+    except Exception as e:
+        results.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def measure(phase, **params):
+    """Menjalankan satu fase di proses anak baru; mengembalikan dict hasil."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_child, args=(phase, params, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+# --- Perbandingan antar-run ---
+
+def _key(result):
+    return (result["filesystem"], result["files_requested"], result["distribution"], result["depth"],
+            result["phase"], result.get("strategy"), result.get("memory_budget_mb"))
+
+
+def compare(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """Mengembalikan daftar pesan regresi dari `current` terhadap `baseline`."""
+    previous = {_key(result): result for result in baseline["results"] if "error" not in result}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get(_key(result))
+        if old is None or "error" in result:
+            continue
+        label = "/".join(str(part) for part in _key(result) if part is not None)
+        for metric in ("seconds", "peak_rss_kb"):
+            if old.get(metric) and result.get(metric) and result[metric] > old[metric] * (1 + tolerance):
+                regressions.append(f"{label}: {metric} {old[metric]:.4g} -> {result[metric]:.4g} "
+                                   f"(+{(result[metric] / old[metric] - 1) * 100:.0f}%)")
+        if "folders" in old and result.get("folders", 0) > old["folders"]:
+            regressions.append(f"{label}: folders {old['folders']} -> {result['folders']}")
+    return regressions
+
+
+def _print_result(result):
+    label = f"{result['phase']}" + (f"[{result['strategy']}]" if result.get("strategy") else "")
+    if "error" in result:
+        print(f"  {label:<18} ERROR {result['error']}")
+        return
+    details = []
+    if "files_per_second" in result:
+        details.append(f"{result['files_per_second']:.0f} file/s")
+    if "mb_per_second" in result:
+        details.append(f"{result['mb_per_second']:.1f} MB/s")
+    if "folders" in result:
+        details.append(f"{result['folders']} folder (batas bawah {result['lower_bound']})")
+    if result.get("peak_rss_kb") is not None:
+        details.append(f"RSS puncak {result['peak_rss_kb'] / 1024:.1f} MB")
+    print(f"  {label:<18} {result['seconds']:.4f} s  " + ", ".join(details))
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run",
+                                     description="Benchmark PDF Splitter pada pohon file sintetis.")
+    parser.add_argument("--root", action="append", dest="roots", metavar="FOLDER",
+                        help="Folder tempat pohon sintetis dibuat; bisa diulang (default: /dev/shm dan folder temp).")
+    parser.add_argument("--files", type=int, nargs="+", default=list(DEFAULT_FILE_COUNTS),
+                        help="Jumlah file per pohon (default: %(default)s).")
+    parser.add_argument("--distribution", nargs="+", choices=DISTRIBUTIONS, default=["lognormal"],
+                        help="Distribusi ukuran file (default: %(default)s).")
+    parser.add_argument("--mean-kb", type=int, default=DEFAULT_MEAN_KB, help="Rata-rata ukuran file dalam KB.")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="Kedalaman direktori (default: %(default)s).")
+    parser.add_argument("--fanout", type=int, default=DEFAULT_FANOUT, help="Subfolder per tingkat.")
+    parser.add_argument("--fill", action="store_true",
+                        help="Tulis isi file sungguhan (throughput salin realistis, tetapi butuh ruang disk).")
+    parser.add_argument("--phase", nargs="+", choices=PHASES, default=list(PHASES),
+                        help="Fase yang diukur (default: semua).")
+    parser.add_argument("-l", "--limit", type=int, default=DEFAULT_LIMIT_MB, help="Batas ukuran per folder dalam MB.")
+    parser.add_argument("--strategy", nargs="+", choices=STRATEGIES, default=list(STRATEGIES),
+                        help="Strategi packing yang diukur (transfer memakai yang pertama).")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="Jumlah thread discovery/transfer.")
+    parser.add_argument("--hardlink", action="store_true",
+                        help="Izinkan hardlink saat transfer (default: mati, agar data benar-benar disalin).")
+    parser.add_argument("--memory-budget", type=int, metavar="MB",
+                        help="Jalankan fase transfer dalam mode memori terbatas dengan anggaran MB.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed generator pohon.")
+    parser.add_argument("--keep", action="store_true", help="Jangan hapus pohon sintetis setelah selesai.")
+    parser.add_argument("-o", "--output", metavar="FILE", help="File JSON hasil (default: bench-<waktu>.json).")
+    parser.add_argument("--compare", metavar="FILE", help="Bandingkan dengan hasil JSON sebelumnya.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Ambang regresi relatif untuk waktu/RSS (default: %(default)s).")
+    return parser
+
+
+def main(argv=None):
+    args = _build_parser().parse_args(argv)
+    report = {
+        "version": RESULT_VERSION,
+        "created": time.time(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "trees": [],
+        "results": [],
+    }
+
+    for root in args.roots or _default_roots():
+        for files in args.files:
+            for distribution in args.distribution:
+                workdir = tempfile.mkdtemp(prefix="pdf-bench-", dir=root)
+                source = os.path.join(workdir, "source")
+                try:
+                    tree = generate_tree(source, files, distribution, args.depth, args.fanout, args.mean_kb,
+                                         args.fill, args.seed)
+                    report["trees"].append(tree)
+                    print(f"{root}: {files} file, {distribution} "
+                          f"({tree['bytes'] / (1024 * 1024):.1f} MB, dibuat dalam {tree['seconds']:.1f} s)")
+                    base = {"filesystem": root, "files_requested": files, "distribution": distribution,
+                            "depth": args.depth}
+
+                    runs = []
+                    if "discovery" in args.phase:
+                        runs.append(("discovery", dict(source=source, workers=args.workers)))
+                    if "packing" in args.phase:
+                        for strategy in args.strategy:
+                            runs.append(("packing", dict(source=source, limit_mb=args.limit, strategy=strategy)))
+                    if "transfer" in args.phase:
+                        runs.append(("transfer", dict(source=source, destination=os.path.join(workdir, "dest"),
+                                                      limit_mb=args.limit, strategy=args.strategy[0],
+                                                      workers=args.workers, hardlink=args.hardlink,
+                                                      memory_budget_mb=args.memory_budget)))
+                    for phase, params in runs:
+                        result = {**base, "phase": phase, **measure(phase, **params)}
+                        if phase == "transfer" and args.memory_budget:
+                            result["memory_budget_mb"] = args.memory_budget
+                        report["results"].append(result)
+                        _print_result(result)
+                        if phase == "transfer":
+                            shutil.rmtree(params["destination"], ignore_errors=True)
+                finally:
+                    if not args.keep:
+                        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or time.strftime("bench-%Y%m%d-%H%M%S.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil disimpan ke {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regresi dibanding {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"Tidak ada regresi dibanding {args.compare}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+# Inti pembagian file PDF yang dipakai oleh GUI (PDF.py) dan CLI
+# (python -m pdfsplitter). Modul-modul di paket ini sengaja tidak mengimpor PyQt6.
+#
+# Kelas dan fungsi dari modul yang berat (zipfile/tarfile, parser PDF,
+# watcher) baru diimpor saat pertama kali diakses lewat __getattr__, agar
+# `python -m pdfsplitter --help` tidak ikut memuatnya.
+
+from importlib import import_module
+
+from .discovery import DEFAULT_INCLUDE, discover
+from .fastcopy import copy_file
+from .ledger import Ledger, output_index
+from .logsink import BufferedLogSink
+from .packing import STRATEGIES, assign, lower_bound, pack, pack_limits
+from .transfer import DEFAULT_WORKERS, TransferExecutor, TransferJob
+
+_LAZY = {
+    "PdfSplitter": ".core",
+    "Rebalancer": ".rebalance",
+    "RunMetrics": ".metrics",
+    "WatchSplitter": ".watch",
+    "page_count": ".pages",
+    "scan_pages": ".pages",
+    "split_pdf": ".oversize",
+}
+
+__all__ = [
+    "BufferedLogSink",
+    "DEFAULT_INCLUDE",
+    "DEFAULT_WORKERS",
+    "Ledger",
+    "PdfSplitter",
+    "Rebalancer",
+    "RunMetrics",
+    "STRATEGIES",
+    "TransferExecutor",
+    "TransferJob",
+    "WatchSplitter",
+    "assign",
+    "copy_file",
+    "discover",
+    "lower_bound",
+    "output_index",
+    "pack",
+    "pack_limits",
+    "page_count",
+    "scan_pages",
+    "split_pdf",
+]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,147 @@
+import os
+import re
+import tarfile
+import time
+import zipfile
+
+from .fastcopy import COPY_BUFFER_SIZE
+from .verify import new_hasher
+
+# --- Output langsung ke volume arsip (ZIP64 stored / TAR) ---
+#
+# Alih-alih membuat folder output_N lalu mengarsipkannya di langkah
+# berikutnya, setiap bin ditulis langsung menjadi output_N.zip atau
+# output_N.tar tanpa kompresi. Overhead header arsip ikut dihitung saat
+# packing (entry_overhead + VOLUME_OVERHEAD), sehingga ukuran file volume
+# tetap di bawah batas. Volume ditulis ke file sementara lalu di-rename,
+# jadi volume yang terlihat selalu lengkap.
+
+EXTENSIONS = {"zip": ".zip", "tar": ".tar"}
+
+# ZIP: local header 30 + nama + extra ZIP64 20, central directory 46 + nama
+# + extra ZIP64 maks. 28, data descriptor maks. 24 (hanya jika output tidak
+# bisa di-seek). Akhir arsip: EOCD 22 + EOCD ZIP64 56 + locator 20.
+_ZIP_ENTRY_OVERHEAD = 30 + 20 + 46 + 28 + 24
+_ZIP_VOLUME_OVERHEAD = 22 + 56 + 20
+
+# TAR: header 512 per entri, data dibulatkan ke kelipatan 512, header PAX
+# tambahan untuk nama panjang/non-ASCII atau ukuran >= 8 GiB. Akhir arsip:
+# dua blok kosong, lalu dibulatkan ke kelipatan RECORDSIZE.
+_TAR_MAX_SIZE = 8 ** 11
+_TAR_VOLUME_OVERHEAD = 2 * tarfile.BLOCKSIZE + tarfile.RECORDSIZE
+
+
+def _round_up(value, multiple):
+    return -(-value // multiple) * multiple
+
+
+def entry_overhead(output_format, name, size):
+    """Batas atas byte tambahan di arsip untuk satu file bernama `name`."""
+    encoded = name.encode("utf-8")
+    if output_format == "zip":
+        return _ZIP_ENTRY_OVERHEAD + 2 * len(encoded)
+    if output_format == "tar":
+        overhead = tarfile.BLOCKSIZE + _round_up(size, tarfile.BLOCKSIZE) - size
+        if len(encoded) != len(name) or len(encoded) > tarfile.LENGTH_NAME or size >= _TAR_MAX_SIZE:
+            # Rekaman PAX "<panjang> path=<nama>\n" (+ "size=") dalam satu header tambahan.
+            overhead += tarfile.BLOCKSIZE + _round_up(len(encoded) + 64, tarfile.BLOCKSIZE)
+        return overhead
+    return 0
+
+
+def volume_overhead(output_format):
+    if output_format == "zip":
+        return _ZIP_VOLUME_OVERHEAD
+    if output_format == "tar":
+        return _TAR_VOLUME_OVERHEAD
+    return 0
+
+
+def volume_path(destination, index, output_format):
+    return os.path.join(destination, f"output_{index:01d}{EXTENSIONS[output_format]}")
+
+
+def next_volume_index(destination, output_format):
+    """Nomor volume berikutnya setelah volume yang sudah ada (run sebelumnya)."""
+    pattern = re.compile(rf"^output_(\d+){re.escape(EXTENSIONS[output_format])}$")
+    highest = 0
+    for name in os.listdir(destination):
+        match = pattern.match(name)
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest + 1
+
+
+class _HashingReader:
+    """Membungkus file sumber agar isi yang dibaca tarfile ikut di-hash."""
+
+    def __init__(self, f, hasher):
+        self._f = f
+        self._hasher = hasher
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        if self._hasher is not None:
+            self._hasher.update(data)
+        return data
+
+
+def _add_zip(archive, source, name, buffer, hasher):
+    info = zipfile.ZipInfo.from_file(source, name, strict_timestamps=False)
+    info.compress_type = zipfile.ZIP_STORED
+    view = memoryview(buffer)
+    with open(source, "rb", buffering=0) as src, archive.open(info, "w") as dst:
+        while True:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            if hasher is not None:
+                hasher.update(view[:count])
+            dst.write(view[:count])
+
+
+def _add_tar(archive, source, name, buffer, hasher):
+    stat = os.stat(source)
+    info = tarfile.TarInfo(name)
+    info.size = stat.st_size
+    info.mtime = int(stat.st_mtime)  # Detik bulat: tidak memicu header PAX "mtime"
+    info.mode = stat.st_mode & 0o777
+    with open(source, "rb") as src:
+        archive.addfile(info, _HashingReader(src, hasher))
+
+
+def write_volume(output_format, path, files, buffer_size=COPY_BUFFER_SIZE, hash_algorithm=None,
+                 on_file=None):
+    """Menulis `files` [(sumber, nama_di_arsip, ukuran)] ke volume `path`.
+
+    `on_file(sumber, nama, ukuran, detik, digest)` dipanggil setelah setiap
+    file selesai ditulis (dari thread penulis). Mengembalikan ukuran volume.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            if output_format == "zip":
+                archive = zipfile.ZipFile(out, "w", zipfile.ZIP_STORED, allowZip64=True)
+                add = _add_zip
+                buffer = bytearray(buffer_size)
+            else:
+                archive = tarfile.open(fileobj=out, mode="w", format=tarfile.PAX_FORMAT,
+                                       copybufsize=buffer_size)
+                add = _add_tar
+                buffer = None
+            with archive:
+                for source, name, size in files:
+                    start = time.perf_counter()
+                    hasher = new_hasher(hash_algorithm) if hash_algorithm else None
+                    add(archive, source, name, buffer, hasher)
+                    if on_file is not None:
+                        on_file(source, name, size, time.perf_counter() - start,
+                                hasher.hexdigest() if hasher is not None else None)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return os.path.getsize(path)
@@ -0,0 +1,222 @@
+import argparse
+import json
+import sys
+
+from .discovery import DEFAULT_INCLUDE
+from .fastcopy import COPY_BUFFER_SIZE
+from .ledger import output_index
+from .options import (DEDUP_MODES, DEFAULT_HASH_ALGORITHM, DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_SECONDS, FORMATS,
+                      MODES)
+from .packing import STRATEGIES, STREAMING_STRATEGIES
+from .transfer import DEFAULT_WORKERS
+
+# --- Antarmuka baris perintah tanpa GUI ---
+#
+#   python -m pdfsplitter SUMBER TUJUAN --limit 100 [--json]
+#   python -m pdfsplitter --rebalance TUJUAN --limit 50
+#   python -m pdfsplitter SUMBER TUJUAN --limit 100 --watch
+#
+# Tidak pernah mengimpor PyQt6, sehingga bisa dipakai di server/cron. Kelas
+# yang menjalankan pekerjaan baru diimpor setelah argumen valid, agar
+# `--help` dan kesalahan argumen tetap instan.
+
+
+def _device_workers(values):
+    # --device-workers PATH=JUMLAH, boleh diulang
+    result = {}
+    for value in values or ():
+        path, sep, count = value.rpartition("=")
+        if not sep or not path:
+            raise argparse.ArgumentTypeError(f"Format --device-workers harus PATH=JUMLAH: {value}")
+        result[path] = int(count)
+    return result
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m pdfsplitter",
+        description="Membagi file PDF ke folder output_N dengan batas ukuran per folder.",
+    )
+    parser.add_argument("source", nargs="?", help="Folder sumber yang berisi file PDF")
+    parser.add_argument("destination", nargs="?", help="Folder tujuan output")
+    parser.add_argument("--rebalance", metavar="TUJUAN",
+                        help="Susun ulang folder output_N yang sudah ada di TUJUAN dengan batas baru")
+    parser.add_argument("--no-consolidate", action="store_true",
+                        help="Saat --rebalance, jangan bongkar folder untuk mengurangi jumlah folder")
+    parser.add_argument("--watch", action="store_true",
+                        help="Pantau SUMBER terus-menerus dan tempatkan PDF baru begitu selesai ditulis "
+                             "(hanya mode move; hentikan dengan Ctrl+C)")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE_SECONDS, metavar="DETIK",
+                        help="Saat --watch, lama ukuran/mtime file harus stabil sebelum ditempatkan "
+                             f"(default: {DEFAULT_SETTLE_SECONDS:g})")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL, metavar="DETIK",
+                        help="Saat --watch tanpa inotify, jeda antar pemeriksaan direktori "
+                             f"(default: {DEFAULT_POLL_INTERVAL:g})")
+    parser.add_argument("--polling", action="store_true",
+                        help="Saat --watch, pakai polling walaupun inotify tersedia")
+    parser.add_argument("-l", "--limit", type=int, default=100,
+                        help="Batas ukuran per folder dalam MB (default: 100)")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="bfd",
+                        help="Strategi pengepakan (default: bfd)")
+    parser.add_argument("--mode", choices=MODES, default="move",
+                        help="move: pindahkan file sumber; copy: salin dan biarkan sumber utuh (default: move)")
+    parser.add_argument("--format", choices=FORMATS, default="folder", dest="output_format",
+                        help="folder: buat output_N/; zip/tar: tulis setiap bin langsung ke output_N.zip/.tar "
+                             "tanpa kompresi (default: folder)")
+    parser.add_argument("--buffer-size", type=int, default=COPY_BUFFER_SIZE, metavar="BYTE",
+                        help=f"Ukuran buffer untuk salinan biasa pada mode copy (default: {COPY_BUFFER_SIZE})")
+    parser.add_argument("--no-hardlink", action="store_true",
+                        help="Jangan pakai hardlink pada mode copy (selalu buat salinan terpisah)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Jumlah transfer bersamaan per perangkat (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--device-workers", action="append", metavar="PATH=JUMLAH",
+                        help="Jumlah worker khusus untuk perangkat tempat PATH berada")
+    parser.add_argument("--include", action="append", metavar="GLOB",
+                        help="Pola file yang disertakan (default: *.pdf)")
+    parser.add_argument("--exclude", action="append", metavar="GLOB", default=[],
+                        help="Pola file/direktori yang dikecualikan")
+    parser.add_argument("--follow-symlinks", action="store_true",
+                        help="Ikuti symlink ke direktori")
+    parser.add_argument("--dedup", choices=DEDUP_MODES,
+                        help="Deteksi file identik sebelum packing dan tulis laporan duplikat: keep (pindahkan "
+                             "semua), skip (lewati duplikat), hardlink (duplikat jadi hardlink ke salinan pertama)")
+    parser.add_argument("--no-split-oversize", action="store_true",
+                        help="Jangan pecah PDF yang melebihi batas; tempatkan utuh di foldernya sendiri")
+    parser.add_argument("--max-pages", type=int, metavar="HALAMAN",
+                        help="Batas jumlah halaman per folder/volume, selain batas ukuran")
+    parser.add_argument("--max-files", type=int, metavar="JUMLAH",
+                        help="Batas jumlah file per folder/volume, selain batas ukuran")
+    parser.add_argument("--page-workers", type=int, metavar="JUMLAH",
+                        help="Jumlah proses untuk menghitung halaman (default: jumlah inti CPU)")
+    parser.add_argument("--memory-budget", type=int, metavar="MB",
+                        help="Batasi memori untuk daftar file: daftar disimpan ringkas dan diurutkan di disk jika "
+                             "melebihi MB (untuk sumber berisi jutaan file; hanya strategi ffd/bfd, format folder)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Lanjutkan run yang terputus memakai rencana dan jurnal di folder tujuan")
+    parser.add_argument("--verify", action="store_true",
+                        help="Hitung checksum setiap file selama penyalinan dan tulis manifest per folder")
+    parser.add_argument("--paranoid", action="store_true",
+                        help="Seperti --verify, tetapi setiap file tujuan dibaca ulang dan dibandingkan "
+                             "(satu pembacaan penuh tambahan per file yang disalin)")
+    parser.add_argument("--hash-algorithm", default=DEFAULT_HASH_ALGORITHM,
+                        help=f"Algoritme checksum untuk --verify (default: {DEFAULT_HASH_ALGORITHM})")
+    parser.add_argument("--metrics-json", metavar="FILE",
+                        help="Simpan metrik kinerja run sebagai JSON")
+    parser.add_argument("--metrics-prom", metavar="FILE",
+                        help="Simpan metrik kinerja run sebagai textfile Prometheus")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Jalankan dengan cProfile dan simpan statistiknya ke FILE")
+    parser.add_argument("--json", action="store_true",
+                        help="Tulis ringkasan hasil sebagai JSON ke stdout (log ke stderr)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Jangan tampilkan log")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.limit <= 0:
+        parser.error("Batas ukuran harus lebih besar dari 0 MB.")
+    if args.rebalance and (args.source or args.destination):
+        parser.error("--rebalance tidak memakai argumen SUMBER/TUJUAN.")
+    if not args.rebalance and not (args.source and args.destination):
+        parser.error("SUMBER dan TUJUAN wajib diisi.")
+    if args.watch and (args.rebalance or args.mode != "move" or args.output_format != "folder"
+                       or args.dedup or args.resume):
+        parser.error("--watch hanya didukung untuk mode move ke folder output_N, "
+                     "tanpa --rebalance/--dedup/--resume.")
+    for option, value in (("--max-pages", args.max_pages), ("--max-files", args.max_files),
+                          ("--page-workers", args.page_workers)):
+        if value is not None and value <= 0:
+            parser.error(f"{option} harus lebih besar dari 0.")
+    if (args.max_pages or args.max_files) and (args.rebalance or args.watch or args.memory_budget is not None):
+        parser.error("--max-pages/--max-files tidak didukung bersama --rebalance/--watch/--memory-budget.")
+    if args.memory_budget is not None:
+        if args.memory_budget <= 0:
+            parser.error("--memory-budget harus lebih besar dari 0 MB.")
+        if args.strategy not in STREAMING_STRATEGIES or args.output_format != "folder" or args.dedup:
+            parser.error(f"--memory-budget hanya didukung untuk strategi {'/'.join(STREAMING_STRATEGIES)}, "
+                         "--format folder, tanpa --dedup.")
+    try:
+        device_workers = _device_workers(args.device_workers)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    if args.verify or args.paranoid:
+        from .verify import new_hasher
+        try:
+            new_hasher(args.hash_algorithm)
+        except ValueError as e:
+            parser.error(str(e))
+
+    log_stream = sys.stderr if args.json else sys.stdout
+
+    def on_log(message):
+        if not args.quiet:
+            print(message, file=log_stream, flush=True)
+
+    if args.rebalance:
+        from .rebalance import Rebalancer
+        splitter = Rebalancer(args.rebalance, args.limit, workers=args.workers,
+                              consolidate=not args.no_consolidate, on_log=on_log)
+        success, message, folder_sizes = splitter.run()
+        return _report(args, splitter, success, message, folder_sizes)
+
+    if args.watch:
+        from .watch import WatchSplitter
+        splitter = WatchSplitter(
+            args.source, args.destination, args.limit,
+            include=args.include or list(DEFAULT_INCLUDE),
+            exclude=args.exclude,
+            split_oversize=not args.no_split_oversize,
+            settle_seconds=args.settle,
+            poll_interval=args.poll_interval,
+            polling=args.polling,
+            on_log=on_log,
+        )
+        success, message, folder_sizes = splitter.run()
+        return _report(args, splitter, success, message, folder_sizes)
+
+    from .core import PdfSplitter
+    splitter = PdfSplitter(
+        args.source, args.destination, args.limit,
+        strategy=args.strategy,
+        mode=args.mode,
+        output_format=args.output_format,
+        copy_buffer_size=args.buffer_size,
+        hardlink=not args.no_hardlink,
+        workers=args.workers,
+        device_workers=device_workers,
+        include=args.include or list(DEFAULT_INCLUDE),
+        exclude=args.exclude,
+        follow_symlinks=args.follow_symlinks,
+        dedup=args.dedup,
+        split_oversize=not args.no_split_oversize,
+        max_pages=args.max_pages,
+        max_files=args.max_files,
+        page_workers=args.page_workers,
+        memory_budget_mb=args.memory_budget,
+        resume=args.resume,
+        verify=args.verify,
+        paranoid=args.paranoid,
+        hash_algorithm=args.hash_algorithm,
+        metrics_json=args.metrics_json,
+        metrics_prom=args.metrics_prom,
+        profile_path=args.profile,
+        on_log=on_log,
+    )
+    success, message, folder_sizes = splitter.run()
+    return _report(args, splitter, success, message, folder_sizes)
+
+
+def _report(args, splitter, success, message, folder_sizes):
+    if args.json:
+        summary = {"success": success, "message": message, "folders": folder_sizes,
+                   "metrics": splitter.metrics.as_dict()}
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif not args.quiet:
+        print(message)
+        for folder_name, size_bytes in sorted(folder_sizes.items(), key=lambda item: output_index(item[0])):
+            print(f"  - {folder_name}: {size_bytes / (1024 * 1024):.2f} MB")
+    return 0 if success else 1
@@ -0,0 +1,842 @@
+import json
+import math
+import os
+import shutil
+import time
+
+from . import journal
+from .discovery import DEFAULT_INCLUDE, discover
+from .ledger import Ledger
+from .metrics import RunMetrics, _atomic_write
+from .options import DEDUP_MODES, FORMATS, MODES, PARTS_DIR_NAME
+from .packing import STREAMING_STRATEGIES, assign, lower_bound, lower_bound_limits, pack, pack_limits
+from .fastcopy import COPY_BUFFER_SIZE, copy_file
+from .spill import SPILL_DIR_NAME, DirectoryTable, ExternalSorter, JobSpill
+from .transfer import DEFAULT_WORKERS, TransferExecutor, TransferJob, move_job, unique_name
+from .verify import DEFAULT_HASH_ALGORITHM, HASH_BUFFER_SIZE, copy_verified, hash_file, move_verified
+
+# --- Inti proses pembagian PDF, tanpa ketergantungan pada Qt ---
+#
+# GUI (PdfSplitterThread) dan CLI (python -m pdfsplitter) sama-sama memakai
+# PdfSplitter. Kemajuan dilaporkan lewat callback biasa:
+#   on_progress(int persen), on_status(str), on_log(str), on_metrics(dict)
+#
+# Modul untuk fitur opsional (archive, dedup, oversize/pdfdoc, pages,
+# rebalance) diimpor di dalam jalur kode yang memakainya, agar `import
+# pdfsplitter` dan startup CLI tidak ikut memuat zipfile/tarfile dan parser PDF.
+
+
+def _ignore(_):
+    pass
+
+
+class PdfSplitter:
+    def __init__(self, source_folder, destination_folder, size_limit_mb, strategy="bfd", mode="move",
+                 output_format="folder", workers=DEFAULT_WORKERS, device_workers=None, include=DEFAULT_INCLUDE, exclude=(),
+                 follow_symlinks=False, dedup=None, split_oversize=True, resume=False, verify=False, paranoid=False,
+                 hash_algorithm=DEFAULT_HASH_ALGORITHM,
+                 hash_buffer_size=HASH_BUFFER_SIZE, copy_buffer_size=COPY_BUFFER_SIZE, hardlink=True,
+                 max_pages=None, max_files=None, page_workers=None, memory_budget_mb=None, metrics_json=None, metrics_prom=None, profile_path=None,
+                 on_progress=None, on_status=None, on_log=None, on_metrics=None):
+        self.source_folder = source_folder
+        self.destination_folder = destination_folder
+        self.size_limit_bytes = size_limit_mb * 1024 * 1024
+        self.strategy = strategy
+        if mode not in MODES:
+            raise ValueError(f"Mode distribusi tidak dikenal: {mode}")
+        # "move" memindahkan file sumber; "copy" membiarkan sumber utuh
+        self.mode = mode
+        if output_format not in FORMATS:
+            raise ValueError(f"Format output tidak dikenal: {output_format}")
+        # "folder" membuat output_N/; "zip"/"tar" menulis bin langsung ke output_N.zip/.tar
+        self.output_format = output_format
+        self.copy_buffer_size = copy_buffer_size
+        self.hardlink = hardlink
+        # Jumlah transfer bersamaan per perangkat; device_workers: {path: jumlah}
+        self.workers = workers
+        self.device_workers = device_workers
+        # Pola glob untuk pencarian file dan opsi mengikuti symlink direktori
+        self.include = include
+        self.exclude = exclude
+        self.follow_symlinks = follow_symlinks
+        # Deteksi file identik sebelum packing: None (mati), "keep" (laporan
+        # saja), "skip" (duplikat tidak dipindahkan) atau "hardlink"
+        if dedup is not None and dedup not in DEDUP_MODES:
+            raise ValueError(f"Mode duplikat tidak dikenal: {dedup}")
+        self.dedup = dedup
+        self._duplicates = []  # [(sumber_kanonik, sumber_duplikat, ukuran)] untuk mode hardlink
+        self._links = []  # [(tujuan_kanonik, sumber_duplikat, tujuan_hardlink)]
+        self._split_sources = []  # [(pdf_asli, ukuran, mtime_ns, [path_bagian])]
+        # PDF yang melebihi batas dipecah per halaman menjadi beberapa bagian
+        self.split_oversize = split_oversize
+        # Lanjutkan run yang terputus memakai rencana + jurnal di folder tujuan
+        self.resume = resume
+        # Verifikasi checksum opsional + manifest per folder. Digest dihitung
+        # selama penyalinan; paranoid juga membaca ulang setiap file tujuan.
+        self.verify = verify or paranoid
+        self.paranoid = paranoid
+        self.hash_algorithm = hash_algorithm
+        self.hash_buffer_size = hash_buffer_size
+        # Daftar nama per folder hanya perlu disimpan untuk manifest checksum.
+        self.ledger = Ledger(keep_entries=self.verify)
+        # Batas tambahan per folder/volume: jumlah halaman dan jumlah file
+        # (None = tidak dibatasi). Jumlah halaman dipindai di pool proses.
+        self.max_pages = max_pages
+        self.max_files = max_files
+        self.page_workers = page_workers
+        # Anggaran memori untuk daftar file: None = semua di memori; selain
+        # itu daftar disimpan ringkas dan di-spill ke disk (external sort).
+        if memory_budget_mb is not None and (strategy not in STREAMING_STRATEGIES or output_format != "folder"
+                                             or dedup is not None):
+            raise ValueError("Mode memori terbatas hanya mendukung strategi "
+                             f"{'/'.join(STREAMING_STRATEGIES)}, output folder, dan tanpa deteksi duplikat.")
+        if memory_budget_mb is not None and (max_pages or max_files):
+            raise ValueError("Mode memori terbatas tidak mendukung batas halaman/file per folder.")
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024 if memory_budget_mb else None
+        # Ekspor metrik di akhir run (JSON / textfile Prometheus) dan profil cProfile
+        self.metrics_json = metrics_json
+        self.metrics_prom = metrics_prom
+        self.profile_path = profile_path
+        self.metrics = RunMetrics()
+
+        self.on_progress = on_progress or _ignore
+        self.on_status = on_status or _ignore
+        self.on_log = on_log or _ignore
+        self.on_metrics = on_metrics or _ignore
+
+    def _log(self, message):
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.on_log(f"[{timestamp}] {message}")
+
+    def _log_discovery_error(self, path, error):
+        self._log(f"Peringatan: Gagal membaca '{os.path.basename(path)}': {error}. Melewatkan entri ini.")
+
+    def run(self):
+        """Menjalankan seluruh proses; mengembalikan (sukses, pesan, ukuran_folder)."""
+        if not self.profile_path:
+            result = self._run()
+        else:
+            # cProfile hanya memprofil thread ini (discovery/planning/loop
+            # penyelesaian), bukan worker transfer.
+            import cProfile
+            profiler = cProfile.Profile()
+            result = profiler.runcall(self._run)
+            profiler.dump_stats(self.profile_path)
+            self._log(f"Profil cProfile disimpan ke '{self.profile_path}'")
+        self._publish_metrics()
+        return result
+
+    def _publish_metrics(self):
+        data = self.metrics.as_dict()
+        if data["phases"]:
+            phases = ", ".join(f"{name} {seconds:.2f} s" for name, seconds in data["phases"].items())
+            self._log(f"Waktu per fase: {phases}")
+            self._log(f"Throughput transfer: {data['files_per_second']:.1f} file/s, {data['mb_per_second']:.2f} MB/s")
+            if data["mechanisms"]:
+                mechanisms = ", ".join(f"{name}: {count}" for name, count in sorted(data["mechanisms"].items()))
+                self._log(f"Mekanisme transfer yang dipakai: {mechanisms}")
+        self.on_metrics(data)
+        try:
+            if self.metrics_json:
+                self.metrics.write_json(self.metrics_json)
+                self._log(f"Metrik JSON disimpan ke '{self.metrics_json}'")
+            if self.metrics_prom:
+                self.metrics.write_prometheus(self.metrics_prom)
+                self._log(f"Metrik Prometheus disimpan ke '{self.metrics_prom}'")
+        except OSError as e:
+            self._log(f"Peringatan: Gagal menyimpan metrik: {e}")
+
+    def _transfer_function(self):
+        if self.mode == "move" and not self.verify:
+            return move_job
+        if self.mode == "move":
+            def transfer(job):
+                job.mechanism, job.digest = move_verified(job.source, job.destination, self.hash_algorithm,
+                                                          self.hash_buffer_size, self.paranoid)
+                return job.mechanism
+        elif not self.verify:
+            def transfer(job):
+                return copy_file(job.source, job.destination, self.copy_buffer_size, self.hardlink)
+        else:
+            def transfer(job):
+                job.mechanism, job.digest = copy_verified(job.source, job.destination, self.hash_algorithm,
+                                                          self.hash_buffer_size, self.hardlink, self.paranoid)
+                return job.mechanism
+        return transfer
+
+    def _run(self):
+        try:
+            self._log("Memulai proses pembagian PDF...")
+            self.on_status("Memvalidasi folder dan mencari file PDF...")
+
+            if not os.path.isdir(self.source_folder):
+                self._log(f"Error: Folder sumber '{self.source_folder}' tidak ditemukan atau bukan direktori.")
+                return False, "Folder sumber tidak ditemukan.", {}
+
+            if not os.path.exists(self.destination_folder):
+                os.makedirs(self.destination_folder)
+                self.on_status(f"Membuat folder tujuan: {self.destination_folder}")
+                self._log(f"Membuat folder tujuan: {self.destination_folder}")
+            else:
+                self._log(f"Folder tujuan sudah ada: {self.destination_folder}")
+
+            if self.output_format != "folder":
+                return self._run_archives()
+
+            if journal.has_plan(self.destination_folder):
+                if not self.resume:
+                    self._log("Error: Folder tujuan berisi run sebelumnya yang belum selesai. "
+                              "Gunakan mode lanjutkan atau hapus file rencana terlebih dahulu.")
+                    return False, "Ada run sebelumnya yang belum selesai di folder tujuan.", {}
+                jobs, completed = self._resume_jobs()
+            else:
+                jobs = self._plan_bounded() if self.memory_budget_bytes else self._plan_jobs()
+                if not jobs:
+                    self._log("Tidak ada file PDF yang ditemukan di folder sumber.")
+                    return False, "Tidak ada file PDF yang ditemukan di folder sumber.", {}
+                completed = {}
+
+            failures = self._execute(jobs, completed)
+            if self.mode == "move" and self._split_sources:
+                self._remove_split_originals()
+            if self._links:
+                with self.metrics.phase("hardlink"):
+                    self._apply_links()
+
+            self._log("Proses pembagian PDF selesai.")
+            with self.metrics.phase("summary"):
+                # Ringkasan dari ledger; tidak perlu memindai ulang folder output.
+                final_folder_sizes_display = self.ledger.folder_sizes()
+                if self.verify:
+                    manifests = self.ledger.write_manifests(self.hash_algorithm)
+                    self._log(f"{len(manifests)} manifest checksum ditulis ke '{self.destination_folder}'")
+
+            if failures:
+                self._log(f"{failures} file gagal dipindahkan. Rencana dan jurnal disimpan; "
+                          "jalankan lagi dengan mode lanjutkan untuk mencoba ulang.")
+                return (False, f"{failures} file gagal dipindahkan; jalankan lagi dengan mode lanjutkan.",
+                        final_folder_sizes_display)
+            journal.clear(self.destination_folder)
+            shutil.rmtree(os.path.join(self.destination_folder, PARTS_DIR_NAME), ignore_errors=True)
+            self._log("Semua file telah diproses.")
+            return True, "Pembagian file PDF selesai!", final_folder_sizes_display
+
+        except Exception as e:
+            self._log(f"Terjadi kesalahan fatal selama proses: {e}")
+            return False, f"Terjadi kesalahan: {e}", {}
+        finally:
+            if self.memory_budget_bytes:
+                shutil.rmtree(os.path.join(self.destination_folder, SPILL_DIR_NAME), ignore_errors=True)
+
+    def _find_files(self):
+        """Discovery (+ pemecahan PDF yang melebihi batas); mengembalikan [(path, ukuran)]."""
+        metrics = self.metrics
+        pdf_files = []
+        self._log(f"Mencari file PDF di '{self.source_folder}'...")
+        with metrics.phase("discovery"):
+            pdf_files.extend(self._iter_discover())
+
+        if not pdf_files:
+            return []
+
+        self._log(f"Total {len(pdf_files)} file PDF ditemukan.")
+        if self.dedup:
+            with metrics.phase("dedup"):
+                pdf_files = self._deduplicate(pdf_files)
+        if self.split_oversize:
+            with metrics.phase("split"):
+                pdf_files = self._split_oversize(pdf_files)
+        return pdf_files
+
+    def _iter_discover(self):
+        for file_path, file_size in discover(self.source_folder, self.include, self.exclude,
+                                             self.follow_symlinks, on_error=self._log_discovery_error):
+            self._log(f"Ditemukan: '{os.path.basename(file_path)}' ({file_size / (1024 * 1024):.2f} MB)")
+            yield file_path, file_size
+
+    def _plan_jobs(self):
+        metrics = self.metrics
+        pdf_files = self._find_files()
+        if not pdf_files:
+            return []
+
+        # Hardlink tetap dihitung dengan ukuran penuh: isi folder yang dibaca
+        # (mis. saat disalin ke media lain) tidak boleh melebihi batas. Duplikat
+        # ikut di-packing seperti file biasa, lalu dibuat sebagai hardlink ke
+        # salinan kanoniknya di folder mana pun salinan itu ditempatkan.
+        link_sources = {}
+        if self._duplicates:
+            present = {path for path, _ in pdf_files}
+            for canonical, duplicate, size in self._duplicates:
+                if canonical not in present:
+                    self._log(f"Catatan: '{os.path.basename(duplicate)}' tidak di-hardlink karena file aslinya dipecah.")
+                    continue
+                link_sources[duplicate] = canonical
+                pdf_files.append((duplicate, size))
+
+        self._log(f"Menyusun rencana penempatan file (strategi: {self.strategy})...")
+        bins = self._pack(pdf_files, self.size_limit_bytes)
+        self._log(f"Rencana selesai: {len(bins)} folder output (batas bawah teoretis: {metrics.extra['folders_lower_bound']}).")
+
+        jobs = []
+        links = []
+        placed = {}
+        first_index = self._first_folder_index()
+        with metrics.phase("mkdir"):
+            for current_folder_index, folder_files in enumerate(bins, start=first_index):
+                current_folder_path = os.path.join(self.destination_folder, f"output_{current_folder_index:01d}")
+                os.makedirs(current_folder_path, exist_ok=True)
+                self.ledger.open_folder(current_folder_path)
+                self._log(f"Membuat folder output: {os.path.basename(current_folder_path)}")
+                names = set(os.listdir(current_folder_path))
+                for file_path, file_size in folder_files:
+                    # Nama yang sama dari subfolder sumber berbeda tidak boleh saling menimpa.
+                    file_name = unique_name(names, os.path.basename(file_path))
+                    names.add(file_name)
+                    if file_name != os.path.basename(file_path):
+                        self._log(f"Nama '{os.path.basename(file_path)}' sudah dipakai di "
+                                  f"'{os.path.basename(current_folder_path)}'; disimpan sebagai '{file_name}'")
+                    dest_file_path = os.path.join(current_folder_path, file_name)
+                    if file_path in link_sources:
+                        links.append((link_sources[file_path], file_path, dest_file_path))
+                        continue
+                    jobs.append(TransferJob(file_path, dest_file_path, file_size, current_folder_path))
+                    placed[file_path] = dest_file_path
+        # Tujuan kanonik baru diketahui setelah semua folder disusun.
+        self._links = [(placed[canonical], duplicate, link_path) for canonical, duplicate, link_path in links]
+
+        settings = {"source": self.source_folder, "size_limit_bytes": self.size_limit_bytes,
+                    "strategy": self.strategy, "mode": self.mode, "split_oversize": self.split_oversize,
+                    "max_pages": self.max_pages, "max_files": self.max_files, "links": self._links,
+                    "split_sources": self._split_sources}
+        journal.save_plan(self.destination_folder, jobs, settings)
+        self._log(f"Rencana disimpan ke '{journal.plan_path(self.destination_folder)}'")
+        return jobs
+
+    def _first_folder_index(self):
+        # Folder output_N yang sudah ada tidak diisi lagi (ukurannya tidak ikut
+        # dihitung saat packing); folder baru dimulai setelah nomor tertinggi.
+        from .rebalance import list_output_folders
+        existing = list_output_folders(self.destination_folder)
+        if not existing:
+            return 1
+        highest = existing[-1][0]
+        self._log(f"Folder tujuan sudah berisi {len(existing)} folder output (tertinggi output_{highest}); "
+                  f"folder baru dimulai dari output_{highest + 1}.")
+        return highest + 1
+
+    def _pack(self, items, limit):
+        """Membagi item (path, ukuran) ke bin; mencatat jumlah folder dan batas bawahnya."""
+        metrics = self.metrics
+        if not (self.max_pages or self.max_files):
+            with metrics.phase("planning"):
+                bins = pack(items, limit, self.strategy)
+            metrics.extra["folders"] = len(bins)
+            metrics.extra["folders_lower_bound"] = lower_bound(items, limit)
+            return bins
+
+        pages = {}
+        if self.max_pages:
+            from .pages import PAGE_CACHE_FILE_NAME, PageCache, scan_pages
+            self.on_status("Menghitung jumlah halaman PDF...")
+            self._log(f"Menghitung jumlah halaman {len(items)} file...")
+            cache = PageCache(os.path.join(self.destination_folder, PAGE_CACHE_FILE_NAME))
+
+            def on_error(path, error):
+                self._log(f"Peringatan: Jumlah halaman '{os.path.basename(path)}' tidak bisa dibaca: {error}. "
+                          "Dihitung sebagai 1 halaman.")
+
+            with metrics.phase("pages"):
+                pages, hits = scan_pages([path for path, _ in items], self.page_workers, cache, on_error)
+                try:
+                    cache.save()
+                except OSError as e:
+                    self._log(f"Peringatan: Gagal menyimpan cache jumlah halaman: {e}")
+            metrics.extra["page_cache_hits"] = hits
+            self._log(f"Jumlah halaman selesai dihitung ({hits} dari cache).")
+
+        if self.strategy != "bfd":
+            self._log("Catatan: dengan batas halaman/file, penempatan selalu memakai best-fit multi-dimensi.")
+        limits = (limit, self.max_pages, self.max_files)
+        triples = [(path, size, pages.get(path, 1)) for path, size in items]
+        with metrics.phase("planning"):
+            bins = pack_limits(triples, limits)
+        metrics.extra["folders"] = len(bins)
+        metrics.extra["folders_lower_bound"] = lower_bound_limits(triples, limits)
+        if self.max_pages:
+            folder_pages = [sum(item[2] for item in folder_items) for folder_items in bins]
+            metrics.extra["max_folder_pages"] = max(folder_pages)
+            self._log(f"Halaman per folder: terbanyak {max(folder_pages)}, tersedikit {min(folder_pages)}.")
+            for path, _, item_pages in triples:
+                if item_pages > self.max_pages:
+                    self._log(f"Peringatan: '{os.path.basename(path)}' berisi {item_pages} halaman, "
+                              "melebihi batas; ditempatkan sendirian.")
+        return [[(path, size) for path, size, _ in folder_items] for folder_items in bins]
+
+    def _plan_bounded(self):
+        """Seperti _plan_jobs, tetapi daftar file tidak pernah dimuat utuh ke memori.
+
+        File diurutkan lewat ExternalSorter (ukuran menurun, lalu direktori
+        dan nama, sama dengan _sorted_decreasing()), ditempatkan satu per satu
+        dengan assign(), lalu diurutkan ulang per folder agar nama unik bisa
+        ditentukan folder demi folder. Mengembalikan JobSpill.
+        """
+        metrics = self.metrics
+        limit = self.size_limit_bytes
+        spill_dir = os.path.join(self.destination_folder, SPILL_DIR_NAME)
+        shutil.rmtree(spill_dir, ignore_errors=True)
+        os.makedirs(spill_dir)
+        # Dua penampung bisa terisi bersamaan (urut ukuran, lalu urut folder).
+        budget = self.memory_budget_bytes // 2
+        directories = DirectoryTable()
+
+        def size_order(record):
+            return -record[1], directories.path(record[0]), record[4]
+
+        by_size = ExternalSorter(size_order, budget, spill_dir)
+        oversize = 0
+        fitting_bytes = 0
+
+        self._log(f"Mencari file PDF di '{self.source_folder}' (mode memori terbatas, anggaran "
+                  f"{self.memory_budget_bytes / (1024 * 1024):.0f} MB)...")
+        with metrics.phase("discovery"):
+            found = self._iter_discover()
+            if self.split_oversize:
+                found = self._iter_split_oversize(found)
+            for file_path, file_size in found:
+                directory, file_name = os.path.split(file_path)
+                by_size.add(directories.intern(directory), file_size, 0, 0, file_name)
+                if file_size > limit:
+                    oversize += 1
+                else:
+                    fitting_bytes += file_size
+        if not len(by_size):
+            return []
+        self._log(f"Total {len(by_size)} file PDF ditemukan di {len(directories)} direktori.")
+
+        self._log(f"Menyusun rencana penempatan file (strategi: {self.strategy})...")
+        by_folder = ExternalSorter(lambda record: (record[0], record[1]), budget, spill_dir)
+        folders = 0
+        with metrics.phase("planning"):
+            for rank, (record, bin_id) in enumerate(assign(by_size, limit, self.strategy)):
+                dir_id, file_size, _, _, file_name = record
+                by_folder.add(bin_id, rank, file_size, dir_id, file_name)
+                folders = max(folders, bin_id + 1)
+            spill_runs = len(by_size.runs)
+            by_size.close()
+        metrics.extra["folders"] = folders
+        metrics.extra["folders_lower_bound"] = oversize + math.ceil(fitting_bytes / limit)
+        self._log(f"Rencana selesai: {folders} folder output (batas bawah teoretis: {metrics.extra['folders_lower_bound']}).")
+
+        settings = {"source": self.source_folder, "size_limit_bytes": self.size_limit_bytes,
+                    "strategy": self.strategy, "mode": self.mode, "split_oversize": self.split_oversize,
+                    "links": [], "split_sources": self._split_sources}
+        plan = journal.PlanWriter(self.destination_folder, settings)
+        jobs = JobSpill(os.path.join(spill_dir, "jobs.jsonl"))
+        first_index = self._first_folder_index()
+        current_bin = -1
+        with metrics.phase("mkdir"):
+            for bin_id, _, file_size, dir_id, file_name in by_folder:
+                if bin_id != current_bin:
+                    current_bin = bin_id
+                    current_folder_path = os.path.join(self.destination_folder, f"output_{bin_id + first_index:01d}")
+                    os.makedirs(current_folder_path, exist_ok=True)
+                    self.ledger.open_folder(current_folder_path)
+                    self._log(f"Membuat folder output: {os.path.basename(current_folder_path)}")
+                    names = set(os.listdir(current_folder_path))
+                unique = unique_name(names, file_name)
+                names.add(unique)
+                if unique != file_name:
+                    self._log(f"Nama '{file_name}' sudah dipakai di "
+                              f"'{os.path.basename(current_folder_path)}'; disimpan sebagai '{unique}'")
+                job = TransferJob(os.path.join(directories.path(dir_id), file_name),
+                                  os.path.join(current_folder_path, unique), file_size, current_folder_path)
+                jobs.add(job)
+                plan.add(job)
+            spill_runs += len(by_folder.runs)
+            by_folder.close()
+            jobs.close()
+        plan.close()
+        metrics.extra["spill_runs"] = spill_runs
+        if spill_runs:
+            self._log(f"Daftar file melebihi anggaran memori; {spill_runs} run diurutkan di disk.")
+        self._log(f"Rencana disimpan ke '{journal.plan_path(self.destination_folder)}'")
+        return jobs
+
+    def _deduplicate(self, pdf_files):
+        """Mencari file identik, menulis laporan, dan membuang duplikat sesuai mode."""
+        from .dedup import REPORT_FILE_NAME, find_duplicates
+        self.on_status("Mencari file duplikat...")
+        groups = find_duplicates(pdf_files, self.hash_algorithm, on_error=self._log_discovery_error)
+        duplicate_files = sum(len(paths) - 1 for _, _, paths in groups)
+        duplicate_bytes = sum(size * (len(paths) - 1) for _, size, paths in groups)
+        self.metrics.extra["duplicates"] = duplicate_files
+        self.metrics.extra["duplicate_bytes"] = duplicate_bytes
+        if not groups:
+            self._log("Tidak ada file duplikat.")
+            return pdf_files
+
+        report = {
+            "algorithm": self.hash_algorithm,
+            "mode": self.dedup,
+            "duplicate_files": duplicate_files,
+            "duplicate_bytes": duplicate_bytes,
+            "groups": [{"digest": digest, "size": size, "keep": paths[0], "duplicates": paths[1:]}
+                       for digest, size, paths in groups],
+        }
+        report_path = os.path.join(self.destination_folder, REPORT_FILE_NAME)
+        _atomic_write(report_path, json.dumps(report, indent=2))
+        self._log(f"{duplicate_files} file duplikat ({duplicate_bytes / (1024 * 1024):.2f} MB) dalam "
+                  f"{len(groups)} kelompok. Laporan disimpan ke '{report_path}'")
+        if self.dedup == "keep":
+            return pdf_files
+
+        duplicates = {}
+        sizes = {}
+        for _, size, paths in groups:
+            for path in paths[1:]:
+                duplicates[path] = paths[0]
+                sizes[path] = size
+        if self.dedup == "hardlink":
+            self._duplicates = [(canonical, duplicate, sizes[duplicate]) for duplicate, canonical in duplicates.items()]
+        else:
+            self._log("Duplikat dilewati dan tetap berada di folder sumber.")
+        return [(path, size) for path, size in pdf_files if path not in duplicates]
+
+    def _apply_links(self):
+        """Membuat hardlink duplikat ke salinan kanoniknya di folder output."""
+        linked = 0
+        for target, duplicate, link_path in self._links:
+            if os.path.exists(link_path):
+                continue
+            link_name = os.path.basename(link_path)
+            if not os.path.exists(target):
+                self._log(f"Catatan: '{link_name}' tidak di-hardlink karena file aslinya gagal dipindahkan.")
+                continue
+            try:
+                os.link(target, link_path)
+            except OSError as e:
+                self._log(f"Peringatan: Gagal membuat hardlink '{link_name}': {e}")
+                continue
+            linked += 1
+            # Ruang disk tidak bertambah, tetapi ukuran logis folder bertambah penuh.
+            self.ledger.record(os.path.dirname(link_path), link_name, os.path.getsize(link_path))
+            if self.mode == "move":
+                try:
+                    os.unlink(duplicate)
+                except OSError as e:
+                    self._log(f"Peringatan: Gagal menghapus duplikat '{duplicate}': {e}")
+        self._log(f"{linked} duplikat dibuat sebagai hardlink.")
+
+    def _split_oversize(self, pdf_files):
+        """Mengganti setiap PDF yang melebihi batas dengan bagian-bagian per halamannya."""
+        return list(self._iter_split_oversize(pdf_files))
+
+    def _iter_split_oversize(self, pdf_files):
+        # Versi generator: dipakai langsung oleh mode memori terbatas.
+        from .oversize import split_pdf
+        from .pdfdoc import PdfError
+        split_files = 0
+        parts_root = os.path.join(self.destination_folder, PARTS_DIR_NAME)
+        for file_path, file_size in pdf_files:
+            if file_size <= self._item_limit():
+                yield file_path, file_size
+                continue
+            file_name = os.path.basename(file_path)
+            self.on_status(f"Memecah '{file_name}' per halaman...")
+            # Subfolder per file agar bagian dari file bernama sama tidak bertabrakan.
+            parts_dir = os.path.join(parts_root, str(split_files + 1))
+            try:
+                stat = os.stat(file_path)
+                os.makedirs(parts_dir, exist_ok=True)
+                parts = split_pdf(file_path, self._item_limit(), parts_dir)
+            except (PdfError, OSError) as e:
+                self._log(f"Peringatan: '{file_name}' ({file_size / (1024 * 1024):.2f} MB) melebihi batas "
+                          f"dan tidak bisa dipecah: {e}. File ditempatkan utuh.")
+                yield file_path, file_size
+                continue
+            split_files += 1
+            self._split_sources.append((file_path, stat.st_size, stat.st_mtime_ns, [part for part, _ in parts]))
+            if self.mode == "move":
+                kept = "file asli dihapus setelah semua bagiannya dipindahkan."
+            else:
+                kept = "file asli tetap di folder sumber."
+            self._log(f"'{file_name}' ({file_size / (1024 * 1024):.2f} MB) dipecah menjadi {len(parts)} bagian; {kept}")
+            for part_path, part_size in parts:
+                if part_size > self._item_limit():
+                    self._log(f"Peringatan: Bagian '{os.path.basename(part_path)}' "
+                              f"({part_size / (1024 * 1024):.2f} MB) berisi satu halaman yang sudah melebihi batas.")
+            yield from parts
+        if split_files:
+            self.metrics.extra["split_files"] = split_files
+
+    def _remove_split_originals(self):
+        """Mode move: menghapus PDF asli yang semua bagiannya sudah dipindahkan.
+
+        Tanpa ini, run berikutnya atas sumber yang sama akan memecahnya lagi
+        dan menghasilkan bagian ganda. PDF asli yang salah satu bagiannya
+        gagal dipindahkan dipertahankan untuk run lanjutan.
+        """
+        removed = 0
+        for original, size, mtime_ns, parts in self._split_sources:
+            if any(os.path.exists(part) for part in parts):
+                continue
+            try:
+                stat = os.stat(original)
+                if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                    self._log(f"Peringatan: '{os.path.basename(original)}' berubah sejak dipecah; tidak dihapus.")
+                    continue
+                os.unlink(original)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                self._log(f"Peringatan: Gagal menghapus PDF asli '{os.path.basename(original)}': {e}")
+                continue
+            removed += 1
+        if removed:
+            self._log(f"{removed} PDF asli yang sudah dipecah dihapus dari folder sumber.")
+
+    def _item_limit(self):
+        # Ukuran maksimum satu file agar masih muat sendirian di satu volume arsip.
+        if self.output_format == "folder":
+            return self.size_limit_bytes
+        from .archive import entry_overhead, volume_overhead
+        longest_name = "x" * 255
+        return (self.size_limit_bytes - volume_overhead(self.output_format)
+                - entry_overhead(self.output_format, longest_name, self.size_limit_bytes))
+
+    def _run_archives(self):
+        from .archive import entry_overhead, next_volume_index, volume_overhead, volume_path
+        output_format = self.output_format
+        metrics = self.metrics
+        if self.resume:
+            self._log("Catatan: mode lanjutkan tidak dipakai untuk output arsip; "
+                      "volume yang sudah lengkap tidak ditulis ulang.")
+        pdf_files = self._find_files()
+        if self._duplicates:
+            self._log("Catatan: hardlink tidak didukung untuk output arsip; duplikat dilewati.")
+        if not pdf_files:
+            self._log("Tidak ada file PDF yang ditemukan di folder sumber.")
+            return False, "Tidak ada file PDF yang ditemukan di folder sumber.", {}
+
+        # Overhead header per file ikut dihitung sebagai bagian dari ukuran item.
+        limit = self.size_limit_bytes - volume_overhead(output_format)
+        items = [(path, size + entry_overhead(output_format, os.path.basename(path), size))
+                 for path, size in pdf_files]
+        sizes = dict(pdf_files)
+        self._log(f"Menyusun rencana volume {output_format.upper()} (strategi: {self.strategy})...")
+        bins = self._pack(items, limit)
+        self._log(f"Rencana selesai: {len(bins)} volume (batas bawah teoretis: {metrics.extra['folders_lower_bound']}).")
+
+        first_index = next_volume_index(self.destination_folder, output_format)
+        volumes = []
+        for offset, volume_items in enumerate(bins):
+            path = volume_path(self.destination_folder, first_index + offset, output_format)
+            self.ledger.open_folder(path)
+            names = set()
+            files = []
+            for source, _ in volume_items:
+                name = unique_name(names, os.path.basename(source))
+                names.add(name)
+                files.append((source, name, sizes[source]))
+            volumes.append((path, files))
+
+        failures, volume_sizes = self._write_volumes(volumes)
+        if self.mode == "move" and self._split_sources:
+            self._remove_split_originals()
+
+        self._log("Proses pembagian PDF selesai.")
+        with metrics.phase("summary"):
+            if self.verify:
+                manifests = self.ledger.write_manifests(self.hash_algorithm)
+                self._log(f"{len(manifests)} manifest checksum ditulis ke '{self.destination_folder}'")
+        if failures:
+            self._log(f"{failures} volume gagal ditulis; file sumbernya tidak diubah.")
+            return False, f"{failures} volume gagal ditulis.", volume_sizes
+        shutil.rmtree(os.path.join(self.destination_folder, PARTS_DIR_NAME), ignore_errors=True)
+        self._log("Semua file telah diproses.")
+        return True, "Pembagian file PDF selesai!", volume_sizes
+
+    def _write_volumes(self, volumes):
+        """Menulis setiap volume di thread tersendiri; mengembalikan (jumlah_gagal, ukuran_volume)."""
+        import queue
+        from concurrent.futures import ThreadPoolExecutor
+
+        from .archive import write_volume
+
+        output_format = self.output_format
+        hash_algorithm = self.hash_algorithm if self.verify else None
+        # Thread penulis hanya mengirim kejadian; log, ledger dan progres
+        # diperbarui di thread ini, sama seperti pada mode folder.
+        events = queue.Queue()
+
+        def write(path, files):
+            def on_file(source, name, size, seconds, digest):
+                events.put(("file", path, source, name, size, seconds, digest))
+            try:
+                volume_size = write_volume(output_format, path, files, self.copy_buffer_size, hash_algorithm, on_file)
+            except Exception as e:
+                events.put(("volume", path, e, None))
+                return
+            if self.mode == "move":
+                for source, _, _ in files:
+                    try:
+                        os.unlink(source)
+                    except OSError as e:
+                        events.put(("warning", path, f"Gagal menghapus sumber '{os.path.basename(source)}': {e}"))
+            events.put(("volume", path, None, volume_size))
+
+        total_bytes = sum(size for _, files in volumes for _, _, size in files)
+        volume_bytes = {path: sum(size for _, _, size in files) for path, files in volumes}
+        written_bytes = dict.fromkeys(volume_bytes, 0)
+        entries = {path: [] for path, _ in volumes}
+        processed_bytes = 0
+        last_progress = -1
+        failures = 0
+        volume_sizes = {}
+        self._log(f"Menulis {len(volumes)} volume {output_format.upper()} dengan {self.workers} penulis paralel...")
+        self.on_status(f"Menulis {len(volumes)} volume...")
+
+        with self.metrics.phase("transfer"):
+            with ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="pdf-archive") as pool:
+                for path, files in volumes:
+                    pool.submit(write, path, files)
+                remaining = len(volumes)
+                while remaining:
+                    event = events.get()
+                    kind, path = event[0], event[1]
+                    volume_name = os.path.basename(path)
+                    if kind == "file":
+                        _, _, source, name, size, seconds, digest = event
+                        entries[path].append((name, size, digest))
+                        written_bytes[path] += size
+                        processed_bytes += size
+                        self.metrics.record_transfer(source, size, seconds, output_format)
+                        self._log(f"Menulis '{name}' ({size / (1024 * 1024):.2f} MB) ke '{volume_name}'")
+                    elif kind == "warning":
+                        self._log(f"Peringatan: {event[2]}")
+                        continue
+                    else:
+                        _, _, error, volume_size = event
+                        remaining -= 1
+                        if error is None:
+                            # Ledger hanya diisi untuk volume yang selesai utuh.
+                            for name, size, digest in entries[path]:
+                                self.ledger.record(path, name, size, digest)
+                            volume_sizes[volume_name] = volume_size
+                            self._log(f"Volume '{volume_name}' selesai ({volume_size / (1024 * 1024):.2f} MB)")
+                            self.on_status(f"Volume '{volume_name}' selesai")
+                        else:
+                            failures += 1
+                            self.metrics.record_failure()
+                            processed_bytes += volume_bytes[path] - written_bytes[path]
+                            self._log(f"Gagal menulis volume '{volume_name}': {error}")
+                    if total_bytes:
+                        progress = int(processed_bytes * 100 / total_bytes)
+                        if progress != last_progress:
+                            last_progress = progress
+                            self.on_progress(progress)
+        self.on_progress(100)
+        return failures, volume_sizes
+
+    def _resume_jobs(self):
+        """Memuat rencana tersimpan dan merekonsiliasi entri yang belum tercatat."""
+        settings, entries = journal.load_plan(self.destination_folder)
+        completed = journal.read_journal(self.destination_folder)
+        self._log(f"Melanjutkan run sebelumnya: {len(entries)} entri dalam rencana, "
+                  f"{len(completed)} sudah selesai menurut jurnal.")
+        if settings.get("mode", self.mode) != self.mode:
+            self.mode = settings["mode"]
+            self._log(f"Catatan: memakai mode distribusi dari rencana asli ({self.mode}).")
+        self._links = [tuple(link) for link in settings.get("links", [])]
+        self._split_sources = settings.get("split_sources", [])
+        if settings.get("size_limit_bytes") not in (None, self.size_limit_bytes):
+            self._log(f"Catatan: memakai batas ukuran dari rencana asli "
+                      f"({settings['size_limit_bytes'] / (1024 * 1024):.2f} MB).")
+
+        jobs = []
+        reconciled = 0
+        with self.metrics.phase("reconcile"):
+            for index, (source, destination, size, folder) in enumerate(entries):
+                if not os.path.isdir(folder):
+                    os.makedirs(folder, exist_ok=True)
+                self.ledger.open_folder(folder)
+                job = TransferJob(source, destination, size, folder)
+                jobs.append(job)
+                if index in completed:
+                    continue
+                source_exists = os.path.exists(source)
+                destination_exists = os.path.exists(destination)
+                if not source_exists and destination_exists and os.path.getsize(destination) == size:
+                    # Transfer selesai tetapi proses mati sebelum jurnal ditulis.
+                    # Dengan verifikasi, digest dihitung dari file tujuan agar
+                    # entri ini tetap tercantum di manifest.
+                    completed[index] = (hash_file(destination, self.hash_algorithm, self.hash_buffer_size)
+                                        if self.verify else None)
+                    reconciled += 1
+                elif source_exists and destination_exists:
+                    # Salinan parsial dari transfer lintas perangkat: ulangi dari awal.
+                    os.unlink(destination)
+                    self._log(f"Menghapus salinan parsial '{os.path.basename(destination)}'")
+        if reconciled:
+            self._log(f"{reconciled} transfer yang tidak tercatat di jurnal ternyata sudah selesai.")
+        return jobs, completed
+
+    def _execute(self, jobs, completed):
+        """Menjalankan transfer untuk job yang belum selesai; mengembalikan jumlah gagal."""
+        metrics = self.metrics
+        ledger = self.ledger
+        total_files = len(jobs)
+        # Progres dihitung berdasarkan byte, bukan jumlah file, agar satu
+        # file besar tidak membuat persentase macet lalu melompat.
+        total_bytes = 0
+        processed_bytes = 0
+        # Satu putaran untuk indeks, total dan entri yang sudah selesai;
+        # `jobs` bisa berupa JobSpill yang dibaca ulang dari disk.
+        for index, job in enumerate(jobs):
+            job.index = index
+            total_bytes += job.size
+            if index in completed:
+                processed_bytes += job.size
+                ledger.record(job.folder, os.path.basename(job.destination), job.size, completed[index])
+        processed_files = len(completed)
+        pending = (job for job in jobs if job.index not in completed)
+        last_progress = -1
+        failures = 0
+        action = "Menyalin" if self.mode == "copy" else "Memindahkan"
+        self._log(f"{action} {total_files - processed_files} file dengan {self.workers} worker per perangkat...")
+        self.on_status(f"{action} {total_files - processed_files} file...")
+
+        if self.verify:
+            self._log(f"Verifikasi checksum aktif ({self.hash_algorithm}).")
+        executor = TransferExecutor(self.workers, self.device_workers, self._transfer_function())
+        run_journal = journal.Journal(self.destination_folder)
+        try:
+            with metrics.phase("transfer"):
+                for job, error in executor.run(pending):
+                    file_name = os.path.basename(job.source)
+                    folder_name = os.path.basename(job.folder)
+                    if error is None:
+                        run_journal.record(job.index, job.digest)
+                        ledger.record(job.folder, os.path.basename(job.destination), job.size, job.digest)
+                        metrics.record_transfer(job.source, job.size, job.elapsed, job.mechanism)
+                        self._log(f"Menyalin '{file_name}' ({job.size / (1024 * 1024):.2f} MB) ke '{folder_name}'")
+                        self.on_status(f"Menyalin '{file_name}' ke '{folder_name}' ({ledger.size_of(job.folder) / (1024 * 1024):.2f} MB)")
+                    else:
+                        failures += 1
+                        metrics.record_failure()
+                        self._log(f"Gagal menyalin '{file_name}': {error}")
+                        self.on_status(f"Gagal menyalin '{file_name}'")
+
+                    processed_files += 1
+                    processed_bytes += job.size
+                    if total_bytes:
+                        progress = int(processed_bytes * 100 / total_bytes)
+                    else:
+                        progress = int(processed_files * 100 / total_files)
+                    if progress != last_progress:
+                        last_progress = progress
+                        self.on_progress(progress)
+        finally:
+            run_journal.close()
+        return failures
@@ -0,0 +1,113 @@
+import os
+
+from .verify import DEFAULT_HASH_ALGORITHM, hash_file, new_hasher
+
+# --- Deteksi file identik sebelum packing ---
+#
+# Bertahap, dari yang paling murah:
+#   1. kelompokkan menurut ukuran (gratis, dari stat discovery); ukuran unik
+#      langsung dianggap unik tanpa dibaca sama sekali
+#   2. hash sebagian (awal + akhir file) untuk kandidat yang tersisa, di
+#      pool thread karena didominasi I/O
+#   3. hash penuh streaming hanya untuk kandidat yang masih bertabrakan, di
+#      pool proses agar hashing memakai semua inti CPU
+# File yang cukup kecil sudah terbaca utuh di tahap 2, jadi tidak diulang.
+
+PARTIAL_HASH_SIZE = 64 * 1024
+REPORT_FILE_NAME = "pdf_splitter_duplicates.json"
+
+
+def partial_hash(path, size, algorithm=DEFAULT_HASH_ALGORITHM, block_size=PARTIAL_HASH_SIZE):
+    """Hash `block_size` byte pertama dan terakhir; file kecil di-hash utuh."""
+    if size <= 2 * block_size:
+        return hash_file(path, algorithm)
+    hasher = new_hasher(algorithm)
+    with open(path, "rb") as f:
+        hasher.update(f.read(block_size))
+        f.seek(size - block_size)
+        hasher.update(f.read(block_size))
+    return hasher.hexdigest()
+
+
+def _collisions(groups):
+    return {key: paths for key, paths in groups.items() if len(paths) > 1}
+
+
+def _hash_all(executor, function, items, window, on_error):
+    """Menjalankan function(*item) untuk setiap item; mengembalikan {path: digest}.
+
+    Paling banyak `window` tugas diantrekan sekaligus, agar jutaan kandidat
+    tidak menjadi jutaan objek Future di memori.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    digests = {}
+    pending = {}
+
+    def collect():
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            path = pending.pop(future)
+            try:
+                digests[path] = future.result()
+            except OSError as e:
+                # File yang tidak terbaca diperlakukan sebagai unik.
+                on_error(path, e)
+
+    for item in items:
+        pending[executor.submit(function, *item)] = item[0]
+        if len(pending) >= window:
+            collect()
+    while pending:
+        collect()
+    return digests
+
+
+def find_duplicates(files, algorithm=DEFAULT_HASH_ALGORITHM, workers=None, block_size=PARTIAL_HASH_SIZE,
+                    on_error=None):
+    """Mencari kelompok file identik di `files` [(path, ukuran)].
+
+    Mengembalikan [(digest, ukuran, [path, ...])] untuk setiap kelompok
+    berisi dua path atau lebih, urut path; path pertama adalah salinan yang
+    dipertahankan. Urutan discovery tidak dipakai karena berubah-ubah
+    antar-run pada walker paralel.
+    """
+    on_error = on_error or (lambda path, error: None)
+    workers = workers or os.cpu_count() or 1
+    by_size = {}
+    for path, size in files:
+        by_size.setdefault(size, []).append(path)
+    by_size = _collisions(by_size)
+    if not by_size:
+        return []
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-dedup") as pool:
+        items = ((path, size, algorithm, block_size) for size, paths in by_size.items() for path in paths)
+        partial = _hash_all(pool, partial_hash, items, 4 * workers, on_error)
+    by_partial = {}
+    for size, paths in by_size.items():
+        for path in paths:
+            if path in partial:
+                by_partial.setdefault((size, partial[path]), []).append(path)
+    by_partial = _collisions(by_partial)
+
+    final = {}
+    needs_full = []
+    for (size, digest), paths in by_partial.items():
+        if size <= 2 * block_size:
+            final[(size, digest)] = paths  # Hash sebagian sudah mencakup seluruh isi
+        else:
+            needs_full.extend((path, size) for path in paths)
+    if needs_full:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            full = _hash_all(pool, hash_file, ((path, algorithm) for path, _ in needs_full), 4 * workers, on_error)
+        for path, size in needs_full:
+            if path in full:
+                final.setdefault((size, full[path]), []).append(path)
+
+    groups = []
+    for (size, digest), paths in _collisions(final).items():
+        paths.sort()
+        groups.append((digest, size, paths))
+    groups.sort(key=lambda group: group[2][0])
+    return groups
@@ -0,0 +1,184 @@
+import fnmatch
+import os
+import queue
+import threading
+from collections import deque
+from itertools import islice
+
+# --- Pencarian file PDF berbasis os.scandir ---
+#
+# Direktori dipindai paralel oleh beberapa thread dan hasilnya dialirkan
+# sebagai generator (path, ukuran), sehingga konsumen bisa mulai bekerja
+# sebelum seluruh pohon selesai dijelajahi. Ukuran diambil dari
+# DirEntry.stat(), yang di-cache oleh scandir (gratis di Windows, satu
+# syscall di POSIX) alih-alih os.path.getsize terpisah.
+
+DEFAULT_INCLUDE = ("*.pdf",)
+DEFAULT_DISCOVERY_WORKERS = 8
+
+_DONE = object()
+
+
+def _compile_patterns(patterns):
+    # Pola tanpa "/" dicocokkan ke nama file; pola dengan "/" ke path relatif.
+    return [(pattern.lower(), "/" in pattern) for pattern in patterns or ()]
+
+
+def _matches(patterns, name, relative):
+    for pattern, by_path in patterns:
+        if fnmatch.fnmatchcase(relative if by_path else name, pattern):
+            return True
+    return False
+
+
+class _Walker:
+    def __init__(self, root, include, exclude, follow_symlinks, workers, on_error):
+        self.root = os.path.abspath(root)
+        self.include = _compile_patterns(include)
+        self.exclude = _compile_patterns(exclude)
+        self.follow_symlinks = follow_symlinks
+        self.on_error = on_error
+        self.results = queue.Queue(maxsize=10000)
+        # Diimpor di sini agar `import pdfsplitter` (dan startup CLI) tetap ringan.
+        from concurrent.futures import ThreadPoolExecutor
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="pdf-discovery")
+        self.lock = threading.Lock()
+        self.outstanding = 0
+        self.window = max(1, workers) * 4  # Direktori yang dibaca di depan saat symlink diikuti
+        self.stopped = False
+
+    def _relative(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/").lower()
+
+    def _put(self, item):
+        # Setelah konsumen berhenti, hasil dibuang agar worker tidak tertahan.
+        while not self.stopped:
+            try:
+                self.results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _report(self, path, error):
+        if self.on_error is not None:
+            self._put(("error", path, error))
+
+    def _submit(self, path):
+        if self.stopped:
+            return
+        with self.lock:
+            self.outstanding += 1
+        self.pool.submit(self._scan, path)
+
+    def _read(self, path):
+        """Membaca satu direktori; mengembalikan (file_cocok, subdirektori, kesalahan).
+
+        Subdirektori berupa (nama, path, kunci); kunci (dev, inode) hanya
+        diisi jika symlink diikuti.
+        """
+        batch = []
+        subdirectories = []
+        errors = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name.lower()
+                    try:
+                        if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                            relative = self._relative(entry.path)
+                            if _matches(self.exclude, name, relative):
+                                continue
+                            key = None
+                            if self.follow_symlinks:
+                                stat_result = entry.stat()
+                                key = (stat_result.st_dev, stat_result.st_ino)
+                            subdirectories.append((entry.name, entry.path, key))
+                        elif entry.is_file():
+                            relative = self._relative(entry.path)
+                            if not _matches(self.include, name, relative) or _matches(self.exclude, name, relative):
+                                continue
+                            batch.append((entry.path, entry.stat().st_size))
+                    except OSError as e:
+                        errors.append((entry.path, e))
+        except OSError as e:
+            return [], [], [(path, e)]
+        return batch, subdirectories, errors
+
+    def _scan(self, path):
+        try:
+            if self.stopped:
+                return
+            batch, subdirectories, errors = self._read(path)
+            for _, subdirectory, _ in subdirectories:
+                self._submit(subdirectory)
+            for error_path, error in errors:
+                self._report(error_path, error)
+            if batch:
+                self._put(("files", batch, None))
+        finally:
+            with self.lock:
+                self.outstanding -= 1
+                finished = self.outstanding == 0
+            if finished:
+                self._put((_DONE, None, None))
+
+    def _walk_following_symlinks(self):
+        # Dengan symlink diikuti, satu direktori bisa dicapai lewat beberapa
+        # path dan hanya satu yang dipakai (juga mencegah loop). Agar pilihan
+        # itu tidak bergantung pada worker mana yang lebih dulu sampai,
+        # pohon dijelajahi per tingkat kedalaman dengan urutan nama: path
+        # yang pertama mengklaim (dev, inode) selalu yang terpendek, lalu
+        # yang terkecil secara leksikografis. Pembacaan direktori tetap
+        # paralel; hanya pengklaiman yang berurutan.
+        root_stat = os.stat(self.root)
+        visited = {(root_stat.st_dev, root_stat.st_ino)}
+        level = [self.root]
+        while level:
+            next_level = []
+            paths = iter(level)
+            pending = deque(self.pool.submit(self._read, path) for path in islice(paths, self.window))
+            while pending:
+                batch, subdirectories, errors = pending.popleft().result()
+                for path in islice(paths, 1):
+                    pending.append(self.pool.submit(self._read, path))
+                if self.on_error is not None:
+                    for error_path, error in errors:
+                        self.on_error(error_path, error)
+                yield from batch
+                for _, subdirectory, key in sorted(subdirectories):
+                    if key not in visited:
+                        visited.add(key)
+                        next_level.append(subdirectory)
+            level = next_level
+
+    def __iter__(self):
+        try:
+            if self.follow_symlinks:
+                yield from self._walk_following_symlinks()
+                return
+            self._submit(self.root)
+            while True:
+                kind, payload, error = self.results.get()
+                if kind is _DONE:
+                    break
+                if kind == "error":
+                    self.on_error(payload, error)
+                    continue
+                yield from payload
+        finally:
+            self.stopped = True
+            self.pool.shutdown(wait=True)
+
+
+def discover(root, include=DEFAULT_INCLUDE, exclude=(), follow_symlinks=False,
+             workers=DEFAULT_DISCOVERY_WORKERS, on_error=None):
+    """Generator (path, ukuran) untuk setiap file yang cocok di bawah `root`.
+
+    `include`/`exclude` adalah pola glob (tidak peka huruf besar/kecil).
+    Pola `exclude` juga memangkas direktori. Symlink ke direktori hanya
+    diikuti jika `follow_symlinks` aktif, dengan perlindungan terhadap loop;
+    direktori yang tercapai lewat beberapa path selalu memakai path yang
+    terpendek, lalu yang terkecil secara leksikografis.
+    Kesalahan per entri dilaporkan lewat `on_error(path, exception)`.
+    """
+    return iter(_Walker(root, include, exclude, follow_symlinks, workers, on_error))
@@ -0,0 +1,123 @@
+import errno
+import os
+import shutil
+import sys
+
+# --- Penyalinan file non-destruktif dengan mekanisme termurah yang tersedia ---
+#
+# Urutan percobaan per pasangan file:
+#   1. hardlink          (filesystem yang sama, tanpa I/O data sama sekali)
+#   2. reflink/FICLONE   (btrfs/XFS, berbagi blok copy-on-write)
+#   3. copy_file_range   (salinan di kernel, lintas filesystem jika didukung)
+#   4. sendfile          (salinan di kernel)
+#   5. buffered          (read/write biasa dengan buffer besar)
+# Mekanisme yang tidak didukung gagal dengan errno tertentu lalu dilewati.
+
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+_FICLONE = 0x40049409  # _IOW(0x94, 9, int) dari linux/fs.h
+
+# errno yang berarti "mekanisme ini tidak bisa dipakai di sini, coba berikutnya"
+_FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.EPERM,
+    errno.EOPNOTSUPP, getattr(errno, "ENOTSUP", errno.EOPNOTSUPP), errno.ENOTTY,
+}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _reflink(src_fd, dst_fd, size, buffer_size):
+    if not sys.platform.startswith("linux"):
+        raise _Unsupported()
+    import fcntl
+    fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd, dst_fd, size, buffer_size):
+    if not hasattr(os, "copy_file_range"):
+        raise _Unsupported()
+    copied = 0
+    while copied < size:
+        count = os.copy_file_range(src_fd, dst_fd, min(size - copied, 1 << 30))
+        if count == 0:
+            break
+        copied += count
+    if copied < size:
+        # Beberapa filesystem mengembalikan 0 alih-alih error.
+        raise _Unsupported()
+
+
+def _sendfile(src_fd, dst_fd, size, buffer_size):
+    if not hasattr(os, "sendfile") or sys.platform == "darwin":
+        raise _Unsupported()
+    copied = 0
+    while copied < size:
+        count = os.sendfile(dst_fd, src_fd, copied, min(size - copied, 1 << 30))
+        if count == 0:
+            break
+        copied += count
+    if copied < size:
+        raise _Unsupported()
+
+
+def _buffered(src_fd, dst_fd, size, buffer_size):
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(src_fd, "rb", buffering=0, closefd=False) as src, \
+            open(dst_fd, "wb", buffering=0, closefd=False) as dst:
+        while True:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            dst.write(view[:count])
+
+
+_METHODS = (
+    ("reflink", _reflink),
+    ("copy_file_range", _copy_file_range),
+    ("sendfile", _sendfile),
+    ("buffered", _buffered),
+)
+
+
+def copy_file(source, destination, buffer_size=COPY_BUFFER_SIZE, hardlink=True):
+    """Menyalin `source` ke `destination`; mengembalikan nama mekanisme yang dipakai."""
+    if hardlink:
+        try:
+            os.link(source, destination)
+            return "hardlink"
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS and e.errno != errno.EMLINK:
+                raise
+
+    src_fd = os.open(source, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            last_error = None
+            for mechanism, method in _METHODS:
+                try:
+                    method(src_fd, dst_fd, size, buffer_size)
+                    break
+                except _Unsupported:
+                    pass
+                except OSError as e:
+                    if e.errno not in _FALLBACK_ERRNOS:
+                        raise
+                    last_error = e
+                # Mulai ulang dari nol untuk mekanisme berikutnya.
+                os.ftruncate(dst_fd, 0)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                os.lseek(src_fd, 0, os.SEEK_SET)
+            else:
+                # Semua mekanisme gagal, termasuk salinan buffered biasa.
+                raise last_error or OSError(errno.EIO, "Tidak ada mekanisme salin yang berhasil", source)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(source, destination)
+    return mechanism
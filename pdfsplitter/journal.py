@@ -0,0 +1,134 @@
+import json
+import os
+import time
+
+# --- Rencana penempatan + jurnal transfer untuk run yang bisa dilanjutkan ---
+#
+# Sebelum transfer dimulai, rencana (sumber -> tujuan untuk setiap file)
+# disimpan di folder tujuan. Setiap transfer yang selesai ditambahkan ke
+# jurnal append-only; fsync dilakukan per kelompok agar murah. Jika proses
+# mati di tengah jalan, run berikutnya (mode lanjutkan) memakai rencana yang
+# sama dan melewati entri yang sudah tercatat di jurnal.
+
+PLAN_FILE_NAME = ".pdf_splitter_plan.json"
+JOURNAL_FILE_NAME = ".pdf_splitter_journal.jsonl"
+PLAN_VERSION = 1
+
+JOURNAL_SYNC_EVERY = 256  # fsync setelah sekian entri...
+JOURNAL_SYNC_INTERVAL = 1.0  # ...atau setelah sekian detik sejak fsync terakhir
+
+
+def plan_path(destination):
+    return os.path.join(destination, PLAN_FILE_NAME)
+
+
+def journal_path(destination):
+    return os.path.join(destination, JOURNAL_FILE_NAME)
+
+
+def has_plan(destination):
+    return os.path.exists(plan_path(destination))
+
+
+def save_plan(destination, jobs, settings):
+    """Menyimpan rencana secara atomik; `jobs` adalah daftar TransferJob."""
+    writer = PlanWriter(destination, settings)
+    for job in jobs:
+        writer.add(job)
+    writer.close()
+
+
+class PlanWriter:
+    """Menulis rencana entri demi entri, tanpa menampung semua job di memori.
+
+    Formatnya sama dengan save_plan(); rencana baru terlihat (dan jurnal lama
+    dihapus) setelah close().
+    """
+
+    def __init__(self, destination, settings):
+        self._destination = destination
+        self._path = plan_path(destination)
+        self._tmp_path = f"{self._path}.tmp"
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        header = json.dumps({"version": PLAN_VERSION, "created": time.time(), "settings": settings})
+        self._file.write(header[:-1] + ', "entries": [')
+        self._count = 0
+
+    def add(self, job):
+        if self._count:
+            self._file.write(", ")
+        self._file.write(json.dumps([job.source, job.destination, job.size, job.folder]))
+        self._count += 1
+
+    def close(self):
+        self._file.write("]}")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self._path)
+        # Jurnal lama (jika ada) tidak berlaku untuk rencana baru.
+        if os.path.exists(journal_path(self._destination)):
+            os.unlink(journal_path(self._destination))
+
+
+def load_plan(destination):
+    """Mengembalikan (settings, entries); entries = [(sumber, tujuan, ukuran, folder)]."""
+    with open(plan_path(destination), encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != PLAN_VERSION:
+        raise ValueError(f"Versi rencana tidak dikenal: {data.get('version')}")
+    return data.get("settings", {}), [tuple(entry) for entry in data["entries"]]
+
+
+def read_journal(destination):
+    """Mengembalikan {indeks: digest} untuk entri yang sudah selesai.
+
+    Baris terakhir yang terpotong (proses mati saat menulis) diabaikan.
+    """
+    completed = {}
+    path = journal_path(destination)
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            completed[record["i"]] = record.get("d")
+    return completed
+
+
+def clear(destination):
+    for path in (journal_path(destination), plan_path(destination)):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+class Journal:
+    def __init__(self, destination, sync_every=JOURNAL_SYNC_EVERY, sync_interval=JOURNAL_SYNC_INTERVAL):
+        self._file = open(journal_path(destination), "a", encoding="utf-8")
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def record(self, index, digest=None):
+        record = {"i": index}
+        if digest is not None:
+            record["d"] = digest
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._unsynced += 1
+        if self._unsynced >= self._sync_every or time.monotonic() - self._last_sync >= self._sync_interval:
+            self.sync()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
@@ -0,0 +1,72 @@
+import math
+import os
+import re
+import threading
+
+# --- Catatan byte yang sudah ditempatkan per folder output ---
+#
+# Diperbarui setiap kali transfer selesai, sehingga ringkasan ukuran akhir
+# tidak perlu memindai ulang folder output di disk. Jika verifikasi aktif,
+# digest setiap file juga disimpan untuk ditulis sebagai manifest; tanpa
+# manifest (keep_entries=False) hanya total per folder yang disimpan.
+
+_OUTPUT_NAME = re.compile(r"^output_(\d+)(?:\.[A-Za-z0-9]+)?$")
+
+
+def output_index(name):
+    """Nomor N dari nama 'output_N' atau 'output_N.zip'/'.tar'; nama lain diurutkan paling akhir."""
+    match = _OUTPUT_NAME.match(name)
+    return int(match.group(1)) if match else math.inf
+
+
+class Ledger:
+    def __init__(self, keep_entries=True):
+        self._lock = threading.Lock()
+        self._sizes = {}
+        self._entries = {}
+        self._keep_entries = keep_entries
+
+    def open_folder(self, folder):
+        with self._lock:
+            self._sizes.setdefault(folder, 0)
+            self._entries.setdefault(folder, [])
+
+    def record(self, folder, name, size, digest=None):
+        with self._lock:
+            self._sizes[folder] = self._sizes.get(folder, 0) + size
+            if self._keep_entries:
+                self._entries.setdefault(folder, []).append((name, size, digest))
+
+    def size_of(self, folder):
+        with self._lock:
+            return self._sizes.get(folder, 0)
+
+    def folder_sizes(self):
+        """Ukuran per folder, dikunci dengan nama folder (mis. 'output_1')."""
+        with self._lock:
+            return {os.path.basename(folder): size for folder, size in self._sizes.items()}
+
+    def folder_paths_sizes(self):
+        """Ukuran per folder, dikunci dengan path lengkap folder."""
+        with self._lock:
+            return dict(self._sizes)
+
+    def write_manifests(self, algorithm):
+        """Menulis <tujuan>/output_N.<algoritme> berformat `b2sum`/`sha256sum`.
+
+        Manifest disimpan di samping folder (bukan di dalamnya) agar tidak
+        menambah ukuran folder melewati batas. Verifikasi ulang bisa dilakukan
+        dari folder tujuan, mis. `b2sum -c output_1.blake2b`.
+        """
+        written = []
+        with self._lock:
+            entries = {folder: list(items) for folder, items in self._entries.items()}
+        for folder, items in entries.items():
+            folder_name = os.path.basename(folder)
+            manifest_path = os.path.join(os.path.dirname(folder), f"{folder_name}.{algorithm}")
+            with open(manifest_path, "w", encoding="utf-8", newline="\n") as f:
+                for name, _, digest in sorted(items):
+                    if digest is not None:
+                        f.write(f"{digest}  {folder_name}/{name}\n")
+            written.append(manifest_path)
+        return written
@@ -0,0 +1,66 @@
+import threading
+from collections import deque
+
+# --- Penampung log/progres yang dikirim ke GUI secara berkala ---
+#
+# Thread pekerja memanggil log()/status()/progress() sesering apa pun; GUI
+# mengambil semuanya sekaligus lewat drain() dari timer. Status dan progres
+# digabung (hanya nilai terakhir yang disimpan), sedangkan baris log yang
+# menunggu dibatasi jumlahnya. Log lengkap tetap ditulis ke file di disk.
+
+DEFAULT_MAX_PENDING_LINES = 10000
+_FILE_BUFFER_SIZE = 1024 * 1024
+
+
+class BufferedLogSink:
+    def __init__(self, log_path=None, max_pending_lines=DEFAULT_MAX_PENDING_LINES):
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._lines = deque(maxlen=max_pending_lines)
+        self._dropped = 0
+        self._status = None
+        self._progress = None
+        self._file = None
+        if log_path:
+            self._file = open(log_path, "a", encoding="utf-8", buffering=_FILE_BUFFER_SIZE)
+
+    def log(self, message):
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(message)
+            if self._file is not None:
+                self._file.write(message)
+                self._file.write("\n")
+
+    def status(self, text):
+        with self._lock:
+            self._status = text
+
+    def progress(self, percent):
+        with self._lock:
+            self._progress = percent
+
+    def drain(self):
+        """Mengambil (baris_log, status, progres) sejak drain() terakhir.
+
+        Status/progres bernilai None jika tidak berubah. Jika ada baris yang
+        terbuang karena antrean penuh, satu baris pemberitahuan ditambahkan
+        di depan.
+        """
+        with self._lock:
+            lines = list(self._lines)
+            self._lines.clear()
+            status, self._status = self._status, None
+            progress, self._progress = self._progress, None
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            where = f" (lihat {self.log_path})" if self.log_path else ""
+            lines.insert(0, f"... {dropped} baris log dilewati{where} ...")
+        return lines, status, progress
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
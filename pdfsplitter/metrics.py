@@ -0,0 +1,141 @@
+import heapq
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# --- Instrumentasi kinerja per fase dan metrik run yang bisa dibaca mesin ---
+#
+# RunMetrics mencatat durasi tiap fase (discovery, planning, mkdir, transfer,
+# summary), throughput, histogram latensi transfer per file, jumlah
+# mekanisme transfer (rename/copy) dan file paling lambat. Hasilnya bisa
+# diekspor sebagai JSON atau textfile Prometheus (node_exporter textfile
+# collector).
+
+# Batas atas bucket histogram latensi dalam detik (kumulatif, gaya Prometheus)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SLOWEST_FILES = 10
+
+_MB = 1024 * 1024
+
+
+class RunMetrics:
+    def __init__(self, slowest_files=SLOWEST_FILES):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.phases = {}
+        self.files = 0
+        self.bytes = 0
+        self.failures = 0
+        self.mechanisms = {}
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self._slowest_limit = slowest_files
+        self._slowest = []  # min-heap (detik, path, ukuran)
+        self.extra = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def record_transfer(self, path, size, seconds, mechanism):
+        with self._lock:
+            self.files += 1
+            self.bytes += size
+            self.mechanisms[mechanism] = self.mechanisms.get(mechanism, 0) + 1
+            self.latency_sum += seconds
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    self.bucket_counts[i] += 1
+                    break
+            else:
+                self.bucket_counts[-1] += 1
+            entry = (seconds, path, size)
+            if len(self._slowest) < self._slowest_limit:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def as_dict(self):
+        with self._lock:
+            transfer_time = self.phases.get("transfer", 0.0)
+            cumulative = []
+            running = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self.bucket_counts):
+                running += count
+                cumulative.append({"le": "+Inf" if bound == float("inf") else bound, "count": running})
+            return {
+                "started": self.started,
+                "wall_seconds": sum(self.phases.values()),
+                "phases": dict(self.phases),
+                "files": self.files,
+                "bytes": self.bytes,
+                "failures": self.failures,
+                "files_per_second": self.files / transfer_time if transfer_time else 0.0,
+                "mb_per_second": self.bytes / _MB / transfer_time if transfer_time else 0.0,
+                "mechanisms": dict(self.mechanisms),
+                "latency_histogram": cumulative,
+                "latency_sum_seconds": self.latency_sum,
+                "slowest_files": [
+                    {"path": path, "size": size, "seconds": seconds}
+                    for seconds, path, size in sorted(self._slowest, reverse=True)
+                ],
+                **self.extra,
+            }
+
+    def write_json(self, path):
+        _atomic_write(path, json.dumps(self.as_dict(), indent=2))
+
+    def write_prometheus(self, path):
+        _atomic_write(path, to_prometheus(self.as_dict()))
+
+
+def to_prometheus(data):
+    """Format textfile Prometheus dari hasil RunMetrics.as_dict()."""
+    lines = [
+        "# HELP pdf_splitter_phase_seconds Durasi tiap fase run.",
+        "# TYPE pdf_splitter_phase_seconds gauge",
+    ]
+    for name, seconds in sorted(data["phases"].items()):
+        lines.append(f'pdf_splitter_phase_seconds{{phase="{name}"}} {seconds:.6f}')
+    for key, help_text in (
+        ("files", "Jumlah file yang berhasil ditransfer."),
+        ("bytes", "Jumlah byte yang berhasil ditransfer."),
+        ("failures", "Jumlah transfer yang gagal."),
+        ("files_per_second", "Throughput transfer dalam file per detik."),
+        ("mb_per_second", "Throughput transfer dalam MB per detik."),
+    ):
+        lines.append(f"# HELP pdf_splitter_{key} {help_text}")
+        lines.append(f"# TYPE pdf_splitter_{key} gauge")
+        lines.append(f"pdf_splitter_{key} {data[key]}")
+    lines.append("# HELP pdf_splitter_transfers_total Jumlah transfer per mekanisme.")
+    lines.append("# TYPE pdf_splitter_transfers_total counter")
+    for mechanism, count in sorted(data["mechanisms"].items()):
+        lines.append(f'pdf_splitter_transfers_total{{mechanism="{mechanism}"}} {count}')
+    lines.append("# HELP pdf_splitter_transfer_seconds Latensi transfer per file.")
+    lines.append("# TYPE pdf_splitter_transfer_seconds histogram")
+    for bucket in data["latency_histogram"]:
+        lines.append(f'pdf_splitter_transfer_seconds_bucket{{le="{bucket["le"]}"}} {bucket["count"]}')
+    lines.append(f"pdf_splitter_transfer_seconds_sum {data['latency_sum_seconds']:.6f}")
+    lines.append(f"pdf_splitter_transfer_seconds_count {data['latency_histogram'][-1]['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def _atomic_write(path, text):
+    # Tulis ke file sementara lalu rename, agar pembaca (mis. node_exporter)
+    # tidak pernah melihat file setengah jadi.
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,13 @@
+# --- Nilai pilihan bersama untuk CLI, GUI dan inti ---
+#
+# Sengaja tanpa impor apa pun: cli.py membangun parser (termasuk `--help`)
+# dari nilai-nilai di sini, sehingga startup tidak memuat zipfile/tarfile,
+# hashlib, parser PDF, watcher, dan sebagainya.
+
+MODES = ("move", "copy")
+FORMATS = ("folder", "zip", "tar")
+DEDUP_MODES = ("keep", "skip", "hardlink")
+PARTS_DIR_NAME = ".pdf_splitter_parts"
+DEFAULT_SETTLE_SECONDS = 0.5
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_HASH_ALGORITHM = "blake2b"
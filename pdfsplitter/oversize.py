@@ -0,0 +1,190 @@
+import os
+
+from .fastcopy import _FALLBACK_ERRNOS
+from .pdfdoc import PdfDocument, PdfError, Ref, iter_refs, serialize
+
+# --- Memecah PDF yang melebihi batas folder menjadi beberapa bagian per halaman ---
+#
+# Halaman diambil berurutan ke bagian yang sedang dibangun selama perkiraan
+# ukurannya (objek yang dirujuk halaman + overhead xref) masih di bawah batas.
+# Setiap bagian berisi salinan mentah objek yang dirujuk halaman-halamannya
+# (dibaca lewat mmap, disalin per potongan), ditambah katalog dan /Pages
+# baru. Nomor objek asli dipertahankan, jadi isi objek tidak perlu ditulis
+# ulang; rujukan ke objek yang tidak ikut (mis. halaman di bagian lain)
+# menjadi rujukan ke objek tak terdefinisi, yang menurut spesifikasi PDF
+# dibaca sebagai null. Bagian ditulis segera setelah selesai direncanakan,
+# sehingga memori sebanding dengan satu bagian, bukan seluruh dokumen.
+
+_COPY_CHUNK = 8 * 1024 * 1024
+_BINARY_MARKER = b"%\xe2\xe3\xcf\xd3\n"
+_PART_OVERHEAD = 512  # header, katalog, /Pages, trailer, startxref
+_XREF_ENTRY_SIZE = 20
+_OBJECT_WRAPPER_SIZE = 32  # "num gen obj\n" ... "\nendobj\n"
+_KID_SIZE = 16
+
+# /Parent tidak diikuti: rujukan ke atas (pohon halaman, induk field form)
+# akan menarik seluruh dokumen ke setiap bagian.
+_SKIP_KEYS = (b"Parent",)
+
+
+class _ObjectIndex:
+    """Cache (ukuran, rujukan) per objek agar setiap kamus cukup di-parse sekali."""
+
+    def __init__(self, doc, skip):
+        self.doc = doc
+        self.skip = skip
+        self._info = {}
+
+    def info(self, num):
+        info = self._info.get(num)
+        if info is None:
+            obj = self.doc.get(num)
+            if obj is None:
+                info = (None, ())
+            else:
+                refs = {ref.num for ref in iter_refs(obj.value, _SKIP_KEYS)}
+                info = (obj.size, tuple(refs - self.skip))
+            self._info[num] = info
+        return info
+
+    def closure(self, value, included):
+        """Objek baru (belum ada di `included`) yang dirujuk `value`; mengembalikan (nomor, ukuran)."""
+        new = []
+        size = 0
+        seen = set()
+        stack = [ref.num for ref in iter_refs(value, _SKIP_KEYS)]
+        while stack:
+            num = stack.pop()
+            if num in included or num in seen or num in self.skip:
+                continue
+            seen.add(num)
+            object_size, refs = self.info(num)
+            if object_size is None:
+                continue  # Rujukan ke objek yang tidak ada (null)
+            new.append(num)
+            size += object_size + _XREF_ENTRY_SIZE
+            stack.extend(refs)
+        return new, size
+
+
+def part_name(path, first_page, last_page):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}_hal{first_page}-{last_page}.pdf"
+
+
+def _copy_range(doc, start, end, out):
+    # Salin di kernel bila bisa, agar halaman data tidak ikut masuk ke RSS
+    # proses lewat mmap; jika tidak didukung, salin potongan dari mmap.
+    if hasattr(os, "copy_file_range"):
+        out.flush()
+        try:
+            while start < end:
+                count = os.copy_file_range(doc.fileno(), out.fileno(), min(end - start, _COPY_CHUNK), start)
+                if count == 0:
+                    break
+                start += count
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS:
+                raise
+        # Sinkronkan posisi objek file buffered dengan posisi fd.
+        out.seek(0, os.SEEK_END)
+    data = doc.data
+    while start < end:
+        stop = min(start + _COPY_CHUNK, end)
+        out.write(data[start:stop])
+        start = stop
+
+
+def _write_part(doc, path, pages, objects, pages_num):
+    catalog_num = pages_num + 1
+    offsets = {}
+    with open(path, "wb") as out:
+        out.write(doc.header + b"\n" + _BINARY_MARKER)
+        for num in sorted(objects):
+            obj = doc.get(num)
+            offsets[num] = (out.tell(), obj.gen)
+            if obj.text is not None:
+                out.write(b"%d 0 obj\n%s\nendobj\n" % (num, obj.text))
+            else:
+                _copy_range(doc, obj.start, obj.end, out)
+                out.write(b"\n")
+        for num, gen, page in pages:
+            offsets[num] = (out.tell(), gen)
+            out.write(b"%d %d obj\n%s\nendobj\n" % (num, gen, serialize(page)))
+        kids = b" ".join(b"%d %d R" % (num, gen) for num, gen, _ in pages)
+        offsets[pages_num] = (out.tell(), 0)
+        out.write(b"%d 0 obj\n<</Type /Pages /Kids [%s] /Count %d>>\nendobj\n" % (pages_num, kids, len(pages)))
+        offsets[catalog_num] = (out.tell(), 0)
+        out.write(b"%d 0 obj\n<</Type /Catalog /Pages %d 0 R>>\nendobj\n" % (catalog_num, pages_num))
+
+        xref_offset = out.tell()
+        out.write(b"xref\n0 1\n0000000000 65535 f\r\n")
+        numbers = sorted(offsets)
+        start = 0
+        while start < len(numbers):
+            stop = start + 1
+            while stop < len(numbers) and numbers[stop] == numbers[stop - 1] + 1:
+                stop += 1
+            out.write(b"%d %d\n" % (numbers[start], stop - start))
+            for num in numbers[start:stop]:
+                out.write(b"%010d %05d n\r\n" % offsets[num])
+            start = stop
+        out.write(b"trailer\n<</Size %d /Root %d 0 R>>\nstartxref\n%d\n%%%%EOF\n"
+                  % (catalog_num + 1, catalog_num, xref_offset))
+
+
+def split_pdf(path, limit, output_dir):
+    """Memecah PDF di `path` menjadi bagian-bagian <= `limit` byte di `output_dir`.
+
+    Mengembalikan [(path_bagian, ukuran)] urut halaman. Halaman tunggal yang
+    sendirian sudah melebihi batas tetap menjadi satu bagian. Melempar
+    PdfError jika dokumen tidak bisa dipecah (rusak, terenkripsi, 1 halaman).
+    """
+    written = []
+    with PdfDocument(path) as doc:
+        tree_nodes, pages = doc.pages()
+        if len(pages) < 2:
+            raise PdfError("Dokumen hanya memiliki satu halaman")
+        index = _ObjectIndex(doc, tree_nodes)
+        pages_num = doc.next_object_number
+        parent = Ref(pages_num, 0)
+
+        def flush(first, part_pages, objects):
+            part_path = os.path.join(output_dir, part_name(path, first + 1, first + len(part_pages)))
+            try:
+                _write_part(doc, part_path, part_pages, objects, pages_num)
+            except BaseException:
+                if os.path.exists(part_path):
+                    os.unlink(part_path)
+                raise
+            written.append((part_path, os.path.getsize(part_path)))
+
+        try:
+            first = 0
+            part_pages = []
+            objects = set()
+            size = _PART_OVERHEAD
+            for page_index, (num, gen, page) in enumerate(pages):
+                page = dict(page)
+                page[b"Parent"] = parent
+                page_size = len(serialize(page)) + _OBJECT_WRAPPER_SIZE + _XREF_ENTRY_SIZE + _KID_SIZE
+                new, added = index.closure(page, objects)
+                if part_pages and size + page_size + added > limit:
+                    flush(first, part_pages, objects)
+                    first = page_index
+                    part_pages = []
+                    objects = set()
+                    size = _PART_OVERHEAD
+                    new, added = index.closure(page, objects)
+                part_pages.append((num, gen, page))
+                objects.update(new)
+                size += page_size + added
+            flush(first, part_pages, objects)
+        except BaseException:
+            for part_path, _ in written:
+                try:
+                    os.unlink(part_path)
+                except OSError:
+                    pass
+            raise
+    return written
@@ -0,0 +1,427 @@
+import math
+import os
+from bisect import bisect_left, insort
+
+# --- Mesin bin-packing untuk membagi file ke folder output_N ---
+#
+# Semua strategi menerima daftar item (path, ukuran) dan batas ukuran per bin,
+# lalu mengembalikan daftar bin; setiap bin adalah daftar item yang akan masuk
+# ke satu folder output. Urutan bin = urutan nomor folder (output_1, output_2, ...).
+#
+# Item yang lebih besar dari batas tetap ditempatkan sendirian di bin-nya
+# sendiri (perilaku yang sama dengan versi lama).
+
+_BUCKET_LOAD = 512  # Ukuran maksimum satu bucket pada _SortedCapacities
+
+
+class _SortedCapacities:
+    """Multiset terurut berisi pasangan (sisa_kapasitas, id_bin).
+
+    Disimpan sebagai daftar bucket terurut (pendekatan ala sortedcontainers):
+    pencarian memakai bisect atas nilai maksimum tiap bucket lalu bisect di
+    dalam bucket, sehingga tiap penempatan O(log n) dan penyisipan hanya
+    menggeser satu bucket kecil.
+    """
+
+    def __init__(self):
+        self._buckets = []
+        self._maxes = []
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets)
+
+    def add(self, key):
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            return
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            pos -= 1
+            self._buckets[pos].append(key)
+            self._maxes[pos] = key
+        else:
+            insort(self._buckets[pos], key)
+        bucket = self._buckets[pos]
+        if len(bucket) > _BUCKET_LOAD * 2:
+            half = len(bucket) // 2
+            self._buckets[pos:pos + 1] = [bucket[:half], bucket[half:]]
+            self._maxes[pos:pos + 1] = [bucket[half - 1], bucket[-1]]
+
+    def remove(self, key):
+        pos = bisect_left(self._maxes, key)
+        bucket = self._buckets[pos]
+        idx = bisect_left(bucket, key)
+        del bucket[idx]
+        if not bucket:
+            del self._buckets[pos]
+            del self._maxes[pos]
+        elif idx == len(bucket):
+            self._maxes[pos] = bucket[-1]
+
+    def ceiling(self, key):
+        # Kunci terkecil yang >= key, atau None jika tidak ada.
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return None
+        bucket = self._buckets[pos]
+        return bucket[bisect_left(bucket, key)]
+
+    def last(self):
+        # Kunci terbesar, atau None jika kosong.
+        return self._maxes[-1] if self._maxes else None
+
+
+class _MaxSegmentTree:
+    """Pohon segmen nilai maksimum atas sisa kapasitas tiap bin.
+
+    Dipakai oleh first-fit: mencari bin dengan indeks terkecil yang masih
+    muat untuk suatu ukuran dalam O(log n).
+    """
+
+    def __init__(self, capacity):
+        size = 1
+        while size < max(capacity, 1):
+            size *= 2
+        self._size = size
+        self._tree = [-1] * (2 * size)
+
+    def update(self, index, value):
+        i = index + self._size
+        self._tree[i] = value
+        i //= 2
+        while i:
+            left = self._tree[2 * i]
+            right = self._tree[2 * i + 1]
+            self._tree[i] = left if left >= right else right
+            i //= 2
+
+    def __len__(self):
+        return self._size
+
+    def get(self, index):
+        return self._tree[index + self._size]
+
+    def grow(self):
+        # Menggandakan kapasitas; nilai daun yang sudah ada dipertahankan.
+        leaves = self._tree[self._size:]
+        size = 2 * self._size
+        tree = [-1] * (2 * size)
+        tree[size:size + len(leaves)] = leaves
+        for i in range(size - 1, 0, -1):
+            left = tree[2 * i]
+            right = tree[2 * i + 1]
+            tree[i] = left if left >= right else right
+        self._size = size
+        self._tree = tree
+
+    def find_first(self, value):
+        # Indeks daun paling kiri dengan nilai >= value, atau -1.
+        if self._tree[1] < value:
+            return -1
+        i = 1
+        while i < self._size:
+            i *= 2
+            if self._tree[i] < value:
+                i += 1
+        return i - self._size
+
+    def find_last(self, value, end):
+        # Indeks daun paling kanan yang <= end dengan nilai >= value, atau -1.
+        tree = self._tree
+        i = end + self._size
+        if tree[i] >= value:
+            return end
+        # Naik sambil memeriksa saudara kiri; semua daun dari awal simpul i
+        # sampai `end` sudah pasti < value.
+        while i > 1:
+            if i & 1 and tree[i - 1] >= value:
+                i -= 1
+                break
+            i //= 2
+        else:
+            return -1
+        while i < self._size:
+            i = 2 * i + 1
+            if tree[i] < value:
+                i -= 1
+        return i - self._size
+
+
+def _size_order(item):
+    # Ukuran menurun; ukuran sama diurutkan menurut (direktori, nama), bukan
+    # urutan discovery yang berubah-ubah antar-run karena walker paralel.
+    return -item[1], os.path.split(item[0])
+
+
+def _sorted_decreasing(items):
+    return sorted(items, key=_size_order)
+
+
+def lower_bound(items, limit):
+    """Jumlah bin minimum teoretis (ceil(total / batas)) plus item oversize."""
+    fitting = 0
+    oversize = 0
+    for _, size in items:
+        if size > limit:
+            oversize += 1
+        else:
+            fitting += size
+    return oversize + math.ceil(fitting / limit) if limit > 0 else len(items)
+
+
+def _collect(assignments, bins):
+    # Mengubah aliran (item, id_bin) menjadi daftar bin.
+    for item, bin_id in assignments:
+        if bin_id == len(bins):
+            bins.append([item])
+        else:
+            bins[bin_id].append(item)
+    return bins
+
+
+def _first_fit_assign(items, limit, capacity=1):
+    # Generator (item, id_bin) untuk item yang sudah urut menurun. Pohon
+    # diperbesar bila perlu, jadi jumlah item tidak harus diketahui di awal.
+    tree = _MaxSegmentTree(capacity)
+    bins = 0
+    for item in items:
+        size = item[1]
+        index = tree.find_first(size) if size <= limit else -1
+        if index < 0:
+            if bins == len(tree):
+                tree.grow()
+            index = bins
+            bins += 1
+            tree.update(index, limit - size if size <= limit else -1)
+        else:
+            tree.update(index, tree.get(index) - size)
+        yield item, index
+
+
+def first_fit_decreasing(items, limit):
+    items = _sorted_decreasing(items)
+    return _collect(_first_fit_assign(items, limit, len(items)), [])
+
+
+def _best_fit_assign(items, remaining, index, limit):
+    # Menempatkan item (sudah urut menurun) ke bin dengan sisa kapasitas
+    # terkecil yang masih cukup; membuka bin baru jika tidak ada yang muat.
+    # Menghasilkan (item, id_bin); bin baru selalu mendapat id len(remaining).
+    for item in items:
+        size = item[1]
+        if size > limit:
+            remaining.append(limit - size)
+            yield item, len(remaining) - 1
+            continue
+        key = index.ceiling((size, -1))
+        if key is None:
+            remaining.append(limit - size)
+            index.add((limit - size, len(remaining) - 1))
+            yield item, len(remaining) - 1
+        else:
+            left, bin_id = key
+            index.remove(key)
+            remaining[bin_id] = left - size
+            index.add((left - size, bin_id))
+            yield item, bin_id
+
+
+def _best_fit_into(items, bins, remaining, index, limit):
+    _collect(_best_fit_assign(items, remaining, index, limit), bins)
+
+
+def best_fit_decreasing(items, limit):
+    bins = []
+    remaining = []
+    _best_fit_into(_sorted_decreasing(items), bins, remaining, _SortedCapacities(), limit)
+    return bins
+
+
+def eliminate_bins(bins, limit, max_passes=5):
+    """Mencoba mengosongkan bin dengan menyebarkan isinya ke celah bin lain.
+
+    Bin dicoba mulai dari yang paling kosong. Jika semua isinya muat di bin
+    lain, bin tersebut menjadi daftar kosong; jika tidak, penempatan
+    dibatalkan. `bins` diubah di tempat (indeks bin tidak bergeser) dan juga
+    dikembalikan.
+    """
+    remaining = [limit - sum(size for _, size in b) for b in bins]
+    alive = [True] * len(bins)
+
+    for _ in range(max_passes):
+        index = _SortedCapacities()
+        for bin_id, left in enumerate(remaining):
+            if alive[bin_id] and left >= 0:
+                index.add((left, bin_id))
+
+        improved = False
+        candidates = sorted((i for i in range(len(bins)) if alive[i] and remaining[i] >= 0),
+                            key=lambda i: remaining[i], reverse=True)
+        for victim in candidates:
+            if not alive[victim]:
+                continue
+            index.remove((remaining[victim], victim))
+            moves = []
+            for item in _sorted_decreasing(bins[victim]):
+                key = index.ceiling((item[1], -1))
+                if key is None:
+                    break
+                left, target = key
+                index.remove(key)
+                remaining[target] = left - item[1]
+                index.add((remaining[target], target))
+                moves.append((item, target))
+            else:
+                for item, target in moves:
+                    bins[target].append(item)
+                bins[victim] = []
+                alive[victim] = False
+                improved = True
+                continue
+
+            # Batalkan: kembalikan kapasitas bin tujuan.
+            for item, target in moves:
+                index.remove((remaining[target], target))
+                remaining[target] += item[1]
+                index.add((remaining[target], target))
+            index.add((remaining[victim], victim))
+
+        if not improved:
+            break
+
+    return bins
+
+
+def refine(items, limit, max_passes=5):
+    """Best-fit decreasing, lalu beberapa putaran eliminate_bins()."""
+    bins = eliminate_bins(best_fit_decreasing(items, limit), limit, max_passes)
+    return [b for b in bins if b]
+
+
+STRATEGIES = {
+    "ffd": first_fit_decreasing,
+    "bfd": best_fit_decreasing,
+    "refine": refine,
+}
+
+
+def _dominant_share(item, limits):
+    # Bagian terbesar dari batas yang dipakai item: max(ukuran/B, halaman/P, 1/F).
+    size_limit, page_limit, file_limit = limits
+    share = item[1] / size_limit
+    if page_limit:
+        share = max(share, item[2] / page_limit)
+    if file_limit:
+        share = max(share, 1 / file_limit)
+    return share
+
+
+def lower_bound_limits(items, limits):
+    """Seperti lower_bound(), tetapi untuk item (path, ukuran, halaman) dan batas gabungan."""
+    size_limit, page_limit, file_limit = limits
+    oversize = 0
+    sizes = pages = files = 0
+    for _, size, item_pages in items:
+        if size > size_limit or (page_limit and item_pages > page_limit):
+            oversize += 1
+        else:
+            sizes += size
+            pages += item_pages
+            files += 1
+    bound = math.ceil(sizes / size_limit)
+    if page_limit:
+        bound = max(bound, math.ceil(pages / page_limit))
+    if file_limit:
+        bound = max(bound, math.ceil(files / file_limit))
+    return oversize + bound
+
+
+def pack_limits(items, limits):
+    """Best-fit decreasing multi-dimensi untuk item (path, ukuran, halaman).
+
+    `limits` = (byte, halaman, file); batas halaman/file bernilai None
+    berarti tidak dibatasi. Item diurutkan menurut bagian batas terbesar
+    yang dipakainya (dominant share). Setiap item masuk ke bin yang muat di
+    semua dimensi dengan sisa halaman paling sedikit, lalu sisa byte paling
+    sedikit; jika tidak ada, bin baru dibuka. Bin yang jatah filenya habis
+    dikeluarkan dari indeks. Item yang sendirian sudah melebihi batas byte
+    atau halaman ditempatkan sendirian.
+
+    Bin dikelompokkan menurut jumlah halaman terpakai: pohon segmen atas
+    kelompok itu menyimpan sisa byte terbesar per kelompok, sehingga
+    kelompok terpadat yang masih punya halaman dan byte cukup ditemukan
+    dalam O(log H) tanpa menebak. Tanpa batas halaman semua bin berada di
+    satu kelompok (best-fit biasa menurut byte).
+    """
+    size_limit, page_limit, file_limit = limits
+    items = sorted(items, key=lambda item: (-_dominant_share(item, limits), os.path.split(item[0])))
+    if page_limit:
+        # Halaman terpakai sebuah bin tidak pernah melebihi total halaman semua item.
+        page_slots = min(page_limit, sum(item[2] for item in items if item[2] <= page_limit))
+    else:
+        page_slots = 0
+    tree = _MaxSegmentTree(page_slots + 1)  # Nilai daun: sisa byte terbesar di kelompok itu
+    groups = {}  # halaman_terpakai -> _SortedCapacities berisi (sisa_byte, id_bin)
+    bins = []
+    remaining = []  # [byte, halaman_terpakai, file] tersisa per bin
+
+    def refresh(used_pages):
+        largest = groups[used_pages].last()
+        tree.update(used_pages, largest[0] if largest is not None else -1)
+
+    for item in items:
+        _, size, pages = item
+        if not page_limit:
+            pages = 0
+        if size > size_limit or (page_limit and pages > page_limit):
+            bins.append([item])
+            remaining.append(None)
+            continue
+        used_pages = tree.find_last(size, min(page_slots, page_limit - pages) if page_limit else 0)
+        if used_pages < 0:
+            bin_id = len(bins)
+            bins.append([])
+            left = [size_limit, 0, file_limit or math.inf]
+            remaining.append(left)
+        else:
+            key = groups[used_pages].ceiling((size, -1))
+            groups[used_pages].remove(key)
+            refresh(used_pages)
+            bin_id = key[1]
+            left = remaining[bin_id]
+        bins[bin_id].append(item)
+        left[0] -= size
+        left[1] += pages
+        left[2] -= 1
+        if left[2] > 0:
+            groups.setdefault(left[1], _SortedCapacities()).add((left[0], bin_id))
+            refresh(left[1])
+    return bins
+
+
+# Strategi yang bisa menempatkan item satu per satu tanpa menyimpan isi bin.
+STREAMING_STRATEGIES = ("ffd", "bfd")
+
+
+def assign(items, limit, strategy="bfd"):
+    """Generator (item, nomor_bin mulai 0) untuk item yang SUDAH urut menurun.
+
+    Hanya menyimpan sisa kapasitas per bin, bukan isinya, sehingga item bisa
+    dialirkan dari sumber mana pun (mis. hasil external sort). Untuk input
+    yang sama hasilnya identik dengan pack() strategi yang sama.
+    """
+    if strategy == "ffd":
+        return _first_fit_assign(items, limit)
+    if strategy == "bfd":
+        return _best_fit_assign(items, [], _SortedCapacities(), limit)
+    raise ValueError(f"Strategi tidak bisa dialirkan: {strategy}")
+
+
+def pack(items, limit, strategy="bfd"):
+    """Membagi item (path, ukuran) ke dalam bin dengan batas `limit` byte."""
+    try:
+        packer = STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Strategi pengepakan tidak dikenal: {strategy}")
+    return packer(list(items), limit)
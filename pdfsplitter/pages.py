@@ -0,0 +1,122 @@
+import json
+import mmap
+import os
+import re
+
+from .metrics import _atomic_write
+from .pdfdoc import PdfDocument, PdfError
+
+# --- Pemindai jumlah halaman PDF yang cepat ---
+#
+# Jumlah halaman dibaca dari /Count pada node /Pages akar lewat xref (mmap),
+# tanpa mem-parse halaman maupun isi stream. Jika xref rusak, objek
+# /Type /Page dihitung langsung dari isi file sebagai cadangan. Pemindaian
+# berjalan di pool proses; hasilnya di-cache per (path, ukuran, mtime) agar
+# run berikutnya tidak membuka ulang file yang tidak berubah.
+
+PAGE_CACHE_FILE_NAME = ".pdf_splitter_pages.json"
+PAGE_CACHE_VERSION = 1
+
+_PAGE_OBJECT = re.compile(rb"/Type[\x00\t\n\x0c\r ]*/Page(?![A-Za-z0-9])")
+_INLINE_SCAN_LIMIT = 64  # Di bawah jumlah ini, pool proses tidak sebanding biayanya
+_CHUNK_SIZE = 32
+
+
+def _count_page_objects(path):
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise PdfError("File kosong")
+        with data:
+            return sum(1 for _ in _PAGE_OBJECT.finditer(data))
+
+
+def page_count(path):
+    """Jumlah halaman PDF di `path`; melempar PdfError/OSError jika tidak bisa ditentukan."""
+    try:
+        with PdfDocument(path, allow_encrypted=True) as doc:
+            return doc.page_count()
+    except PdfError as e:
+        # xref rusak atau object stream terenkripsi: hitung objek halaman
+        # yang tidak terkompresi.
+        count = _count_page_objects(path)
+        if not count:
+            raise e
+        return count
+
+
+def _scan_one(item):
+    # Dijalankan di proses pekerja. Mengembalikan (halaman, ukuran, mtime_ns, dari_cache, error).
+    path, cached = item
+    try:
+        stat = os.stat(path)
+        if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2], stat.st_size, stat.st_mtime_ns, True, None
+        return page_count(path), stat.st_size, stat.st_mtime_ns, False, None
+    except (PdfError, OSError) as e:
+        return None, None, None, False, str(e)
+    except Exception as e:
+        # Parser tersandung struktur yang tidak terduga; jangan hentikan pemindaian.
+        return None, None, None, False, f"{type(e).__name__}: {e}"
+
+
+class PageCache:
+    """Cache {path: [ukuran, mtime_ns, halaman]} yang disimpan sebagai JSON."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = {}
+        self._used = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == PAGE_CACHE_VERSION:
+                    self._entries = data.get("entries", {})
+            except (OSError, ValueError):
+                pass  # Cache rusak diperlakukan seperti kosong
+
+    def get(self, path):
+        return self._entries.get(path)
+
+    def put(self, path, size, mtime_ns, pages):
+        self._used[path] = [size, mtime_ns, pages]
+
+    def save(self):
+        # Hanya entri yang dipakai run ini yang disimpan, agar cache tidak
+        # terus membesar oleh file yang sudah lama dipindahkan.
+        if self.path:
+            _atomic_write(self.path, json.dumps({"version": PAGE_CACHE_VERSION, "entries": self._used}))
+
+
+def scan_pages(paths, workers=None, cache=None, on_error=None):
+    """Mengembalikan ({path: jumlah_halaman}, jumlah_dari_cache) untuk setiap path.
+
+    File yang tidak bisa dipindai dilaporkan lewat on_error(path, pesan) dan
+    tidak ada di hasil.
+    """
+    cache = cache or PageCache()
+    on_error = on_error or (lambda path, error: None)
+    items = [(path, cache.get(path)) for path in paths]
+    if len(items) <= _INLINE_SCAN_LIMIT:
+        results = map(_scan_one, items)
+        pool = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        results = pool.map(_scan_one, items, chunksize=_CHUNK_SIZE)
+    pages = {}
+    hits = 0
+    try:
+        for (path, _), (count, size, mtime_ns, hit, error) in zip(items, results):
+            if error is not None:
+                on_error(path, error)
+                continue
+            pages[path] = count
+            hits += hit
+            cache.put(path, size, mtime_ns, count)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return pages, hits
@@ -0,0 +1,490 @@
+import mmap
+import re
+import zlib
+from collections import OrderedDict, namedtuple
+
+# --- Pembaca struktur PDF minimal berbasis mmap ---
+#
+# Cukup untuk membaca xref (tabel klasik, xref stream, object stream,
+# rantai /Prev), objek tak langsung dan pohon halaman tanpa memuat seluruh
+# dokumen ke memori. Isi stream (gambar, konten halaman) tidak pernah
+# di-decode kecuali xref stream dan object stream; yang dibaca hanya kamus
+# di depannya, sehingga dokumen hasil pindaian berukuran GB tetap murah.
+
+_WS = b"\x00\t\n\x0c\r "
+_SPACE = re.compile(rb"(?:[\x00\t\n\x0c\r ]+|%[^\r\n]*)*")
+_NAME = re.compile(rb"/[^\x00\t\n\x0c\r ()<>\[\]{}/%]*")
+_NUMBER = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+_KEYWORD = re.compile(rb"[A-Za-z_]+")
+_REF_TAIL = re.compile(rb"[\x00\t\n\x0c\r ]+(\d+)[\x00\t\n\x0c\r ]+R(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])")
+_OBJ_HEADER = re.compile(rb"[\x00\t\n\x0c\r ]*(\d+)[\x00\t\n\x0c\r ]+(\d+)[\x00\t\n\x0c\r ]+obj")
+_STRING_SPECIAL = re.compile(rb"[()\\]")
+_XREF_ENTRY = re.compile(rb"(\d{10})[ ](\d{5})[ ]([nf])")
+_XREF_SUBSECTION = re.compile(rb"[\x00\t\n\x0c\r ]*(\d+)[ ]+(\d+)")
+
+# Atribut halaman yang diwarisi dari node /Pages induk
+INHERITABLE = (b"Resources", b"MediaBox", b"CropBox", b"Rotate")
+
+_OBJECT_STREAM_CACHE = 8
+# Setelah sekian objek dibaca, halaman mmap dilepas dari RSS (lihat _release)
+_RELEASE_EVERY = 32
+
+
+class PdfError(ValueError):
+    pass
+
+
+Ref = namedtuple("Ref", "num gen")
+
+
+class Name(bytes):
+    """Nama PDF tanpa garis miring di depan, mis. Name(b"Page")."""
+
+
+class Raw(bytes):
+    """Token yang disalin apa adanya saat serialisasi (bilangan real, string)."""
+
+
+def serialize(value):
+    if isinstance(value, dict):
+        return b"<<" + b"".join(b"/" + key + b" " + serialize(item) for key, item in value.items()) + b">>"
+    if isinstance(value, list):
+        return b"[" + b" ".join(serialize(item) for item in value) + b"]"
+    if isinstance(value, Ref):
+        return b"%d %d R" % value
+    if isinstance(value, Name):
+        return b"/" + value
+    if isinstance(value, Raw):
+        return bytes(value)
+    if value is True:
+        return b"true"
+    if value is False:
+        return b"false"
+    if value is None:
+        return b"null"
+    if isinstance(value, int):
+        return b"%d" % value
+    raise TypeError(f"Tidak bisa menserialisasi {type(value).__name__}")
+
+
+def iter_refs(value, skip_keys=()):
+    """Menghasilkan setiap Ref di dalam `value` (rekursif)."""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Ref):
+            yield value
+        elif isinstance(value, dict):
+            stack.extend(item for key, item in value.items() if key not in skip_keys)
+        elif isinstance(value, list):
+            stack.extend(value)
+
+
+def _skip_space(data, pos):
+    return _SPACE.match(data, pos).end()
+
+
+def parse_value(data, pos):
+    """Mem-parse satu objek PDF mulai dari `pos`; mengembalikan (nilai, posisi_akhir)."""
+    pos = _skip_space(data, pos)
+    lead = data[pos:pos + 2]
+    if lead == b"<<":
+        result = {}
+        pos += 2
+        while True:
+            pos = _skip_space(data, pos)
+            if data[pos:pos + 2] == b">>":
+                return result, pos + 2
+            match = _NAME.match(data, pos)
+            if not match:
+                raise PdfError(f"Kunci kamus tidak valid di offset {pos}")
+            value, pos = parse_value(data, match.end())
+            result[match.group()[1:]] = value
+    first = lead[:1]
+    if first == b"[":
+        result = []
+        pos += 1
+        while True:
+            pos = _skip_space(data, pos)
+            if data[pos:pos + 1] == b"]":
+                return result, pos + 1
+            value, pos = parse_value(data, pos)
+            result.append(value)
+    if first == b"/":
+        match = _NAME.match(data, pos)
+        return Name(match.group()[1:]), match.end()
+    if first == b"(":
+        depth = 0
+        scan = pos
+        while True:
+            match = _STRING_SPECIAL.search(data, scan)
+            if not match:
+                raise PdfError(f"String tidak tertutup di offset {pos}")
+            char = match.group()
+            scan = match.end()
+            if char == b"\\":
+                scan += 1
+            elif char == b"(":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return Raw(data[pos:scan]), scan
+    if first == b"<":
+        end = data.find(b">", pos)
+        if end < 0:
+            raise PdfError(f"String hex tidak tertutup di offset {pos}")
+        return Raw(data[pos:end + 1]), end + 1
+    match = _NUMBER.match(data, pos)
+    if match:
+        token = match.group()
+        if b"." in token:
+            return Raw(token), match.end()
+        ref = _REF_TAIL.match(data, match.end())
+        if ref and token.isdigit():
+            return Ref(int(token), int(ref.group(1))), ref.end()
+        return int(token), match.end()
+    match = _KEYWORD.match(data, pos)
+    if match:
+        keyword = match.group()
+        if keyword == b"true":
+            return True, match.end()
+        if keyword == b"false":
+            return False, match.end()
+        if keyword == b"null":
+            return None, match.end()
+    raise PdfError(f"Token tidak dikenal di offset {pos}")
+
+
+def _unpredict_png(data, columns):
+    # Predictor PNG (10-15) per baris; lihat spesifikasi PNG bagian 9.
+    row_size = columns + 1
+    previous = bytearray(columns)
+    output = bytearray()
+    for start in range(0, len(data) - columns, row_size):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + row_size])
+        if kind == 1:
+            for i in range(1, columns):
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+        elif kind == 2:
+            for i in range(columns):
+                row[i] = (row[i] + previous[i]) & 0xFF
+        elif kind == 3:
+            for i in range(columns):
+                left = row[i - 1] if i else 0
+                row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif kind == 4:
+            for i in range(columns):
+                a = row[i - 1] if i else 0
+                b = previous[i]
+                c = previous[i - 1] if i else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                row[i] = (row[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+        output += row
+        previous = row
+    return bytes(output)
+
+
+class PdfObject:
+    __slots__ = ("num", "gen", "value", "start", "end", "data_start", "data_end", "text")
+
+    def __init__(self, num, gen, value, start=None, end=None, data_start=None, data_end=None, text=None):
+        self.num = num
+        self.gen = gen
+        self.value = value
+        # Rentang byte "num gen obj ... endobj" di file (objek biasa), atau
+        # teks objek di dalam object stream (text).
+        self.start = start
+        self.end = end
+        self.data_start = data_start
+        self.data_end = data_end
+        self.text = text
+
+    @property
+    def size(self):
+        """Perkiraan ukuran objek ini jika ditulis ulang sebagai objek biasa."""
+        if self.text is not None:
+            return len(self.text) + 32
+        return self.end - self.start
+
+
+class PdfDocument:
+    def __init__(self, path, allow_encrypted=False):
+        self.path = path
+        # Dokumen terenkripsi hanya boleh dibuka untuk membaca struktur
+        # (angka dan nama tidak dienkripsi, string dan stream dienkripsi).
+        self.allow_encrypted = allow_encrypted
+        self._file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise PdfError("File kosong")
+        self.entries = {}  # num -> (1, offset, gen) | (2, nomor_objstm, indeks) | None (bebas)
+        self._object_streams = OrderedDict()
+        self.trailer = {}
+        self._reads = 0
+        try:
+            self._read_xref_chain()
+        except Exception:
+            self.close()
+            raise
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        self.data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def header(self):
+        end = self.data.find(b"\n", 0, 32)
+        header = self.data[:end if end > 0 else 8].rstrip(b"\r")
+        return header if header.startswith(b"%PDF-") else b"%PDF-1.7"
+
+    @property
+    def next_object_number(self):
+        return max(self.trailer.get(b"Size", 0), max(self.entries, default=0) + 1)
+
+    # --- xref ---
+
+    def _read_xref_chain(self):
+        tail = self.data.rfind(b"startxref", max(0, len(self.data) - 4096))
+        if tail < 0:
+            raise PdfError("startxref tidak ditemukan")
+        offset, _ = parse_value(self.data, tail + len(b"startxref"))
+        seen = set()
+        while offset is not None and offset not in seen:
+            seen.add(offset)
+            trailer = self._read_xref_section(offset)
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            offset = trailer.get(b"Prev")
+        if b"Encrypt" in self.trailer and not self.allow_encrypted:
+            raise PdfError("Dokumen terenkripsi")
+        if not isinstance(self.trailer.get(b"Root"), Ref):
+            raise PdfError("Trailer tidak memiliki /Root")
+
+    def _read_xref_section(self, offset):
+        data = self.data
+        pos = _skip_space(data, offset)
+        if data[pos:pos + 4] != b"xref":
+            return self._read_xref_stream(pos)
+        pos += 4
+        entries = []
+        while True:
+            match = _XREF_SUBSECTION.match(data, pos)
+            if not match:
+                break
+            first, count = int(match.group(1)), int(match.group(2))
+            pos = match.end()
+            for num in range(first, first + count):
+                entry = _XREF_ENTRY.search(data, pos, pos + 40)
+                if not entry:
+                    raise PdfError(f"Entri xref rusak di offset {pos}")
+                pos = entry.end()
+                if entry.group(3) == b"n":
+                    entries.append((num, (1, int(entry.group(1)), int(entry.group(2)))))
+                else:
+                    entries.append((num, None))
+        pos = _skip_space(data, pos)
+        if data[pos:pos + 7] != b"trailer":
+            raise PdfError("Kata kunci trailer tidak ditemukan")
+        trailer, _ = parse_value(data, pos + 7)
+        # File hibrida: entri xref stream (objek terkompresi) lebih diutamakan.
+        if isinstance(trailer.get(b"XRefStm"), int):
+            self._read_xref_stream(trailer[b"XRefStm"])
+        for num, entry in entries:
+            self.entries.setdefault(num, entry)
+        return trailer
+
+    def _read_xref_stream(self, offset):
+        obj = self._read_plain_object(offset)
+        if obj.data_start is None or obj.value.get(b"Type") != b"XRef":
+            raise PdfError(f"Xref tidak valid di offset {offset}")
+        data = self.decode_stream(obj)
+        widths = obj.value[b"W"]
+        index = obj.value.get(b"Index", [0, obj.value[b"Size"]])
+        pos = 0
+        for first, count in zip(index[0::2], index[1::2]):
+            for num in range(first, first + count):
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[pos:pos + width], "big") if width else None)
+                    pos += width
+                kind = 1 if fields[0] is None else fields[0]
+                if kind == 1:
+                    self.entries.setdefault(num, (1, fields[1], fields[2] or 0))
+                elif kind == 2:
+                    self.entries.setdefault(num, (2, fields[1], fields[2] or 0))
+                else:
+                    self.entries.setdefault(num, None)
+        return obj.value
+
+    # --- Objek ---
+
+    def _release(self):
+        # Kernel memetakan halaman (bahkan folio besar) di sekitar setiap
+        # objek yang dibaca; tanpa ini RSS tumbuh mendekati ukuran file.
+        # Data tetap ada di page cache, hanya pemetaannya yang dilepas.
+        if hasattr(mmap, "MADV_DONTNEED"):
+            self.data.madvise(mmap.MADV_DONTNEED)
+
+    def _read_plain_object(self, offset, num=None):
+        data = self.data
+        self._reads += 1
+        if self._reads % _RELEASE_EVERY == 0:
+            self._release()
+        match = _OBJ_HEADER.match(data, offset)
+        if not match or (num is not None and int(match.group(1)) != num):
+            raise PdfError(f"Objek {num} tidak ditemukan di offset {offset}")
+        start = _skip_space(data, offset)
+        value, pos = parse_value(data, match.end())
+        pos = _skip_space(data, pos)
+        data_start = data_end = None
+        if data[pos:pos + 6] == b"stream":
+            data_start = pos + 6
+            if data[data_start:data_start + 2] == b"\r\n":
+                data_start += 2
+            elif data[data_start:data_start + 1] in (b"\n", b"\r"):
+                data_start += 1
+            length = value.get(b"Length")
+            if isinstance(length, Ref):
+                length = self.resolve(length)
+            data_end = data_start + length if isinstance(length, int) else None
+            check = _skip_space(data, data_end) if data_end is not None else None
+            if check is None or data[check:check + 9] != b"endstream":
+                # /Length tidak bisa dipercaya; cari penanda akhir stream.
+                found = data.find(b"endstream", data_start)
+                if found < 0:
+                    raise PdfError(f"endstream untuk objek {num} tidak ditemukan")
+                data_end = found
+            pos = data.find(b"endstream", data_end) + 9
+        end = data.find(b"endobj", pos)
+        if end < 0:
+            raise PdfError(f"endobj untuk objek {num} tidak ditemukan")
+        return PdfObject(int(match.group(1)), int(match.group(2)), value, start, end + 6, data_start, data_end)
+
+    def get(self, num):
+        """Mengembalikan PdfObject untuk nomor objek `num`, atau None jika tidak ada."""
+        entry = self.entries.get(num)
+        if entry is None:
+            return None
+        if entry[0] == 1:
+            return self._read_plain_object(entry[1], num)
+        text = self._object_stream(entry[1]).get(num)
+        if text is None:
+            return None
+        value, _ = parse_value(text, 0)
+        return PdfObject(num, 0, value, text=text)
+
+    def resolve(self, value):
+        """Mengikuti Ref (bertingkat) sampai ke nilai langsung."""
+        seen = set()
+        while isinstance(value, Ref) and value.num not in seen:
+            seen.add(value.num)
+            obj = self.get(value.num)
+            value = obj.value if obj is not None else None
+        return value
+
+    def decode_stream(self, obj):
+        raw = self.data[obj.data_start:obj.data_end]
+        filters = obj.value.get(b"Filter")
+        params = self.resolve(obj.value.get(b"DecodeParms")) or {}
+        if isinstance(filters, list):
+            if len(filters) != 1:
+                raise PdfError("Rantai filter stream tidak didukung")
+            filters = filters[0]
+            params = params[0] if isinstance(params, list) and params else params
+        if filters is None:
+            return raw
+        if filters != b"FlateDecode":
+            raise PdfError(f"Filter /{filters.decode('latin-1')} tidak didukung")
+        data = zlib.decompressobj().decompress(raw)
+        predictor = params.get(b"Predictor", 1) if isinstance(params, dict) else 1
+        if predictor >= 10:
+            data = _unpredict_png(data, params.get(b"Columns", 1))
+        elif predictor != 1:
+            raise PdfError(f"Predictor {predictor} tidak didukung")
+        return data
+
+    def _object_stream(self, num):
+        cached = self._object_streams.get(num)
+        if cached is not None:
+            self._object_streams.move_to_end(num)
+            return cached
+        entry = self.entries.get(num)
+        if entry is None or entry[0] != 1:
+            raise PdfError(f"Object stream {num} tidak ditemukan")
+        obj = self._read_plain_object(entry[1], num)
+        data = self.decode_stream(obj)
+        first = obj.value[b"First"]
+        header = [int(token) for token in data[:first].split()]
+        numbers = header[0::2]
+        offsets = [first + offset for offset in header[1::2]] + [len(data)]
+        objects = {number: data[offsets[i]:offsets[i + 1]].strip(_WS) for i, number in enumerate(numbers)}
+        self._object_streams[num] = objects
+        if len(self._object_streams) > _OBJECT_STREAM_CACHE:
+            self._object_streams.popitem(last=False)
+        return objects
+
+    # --- Pohon halaman ---
+
+    def page_count(self):
+        """Jumlah halaman dari /Count node /Pages akar, tanpa menelusuri pohon.
+
+        Jika /Count tidak ada atau tidak valid, pohon halaman ditelusuri.
+        """
+        catalog = self.resolve(self.trailer[b"Root"])
+        if not isinstance(catalog, dict):
+            raise PdfError("Katalog tidak ditemukan")
+        root = self.resolve(catalog.get(b"Pages"))
+        count = self.resolve(root.get(b"Count")) if isinstance(root, dict) else None
+        if isinstance(count, int) and count >= 0:
+            return count
+        return len(self.pages()[1])
+
+    def pages(self):
+        """Mengembalikan (nomor_node_pohon, [(nomor, gen, kamus_halaman)]).
+
+        Atribut yang diwarisi dari node /Pages induk disalin ke kamus halaman.
+        """
+        catalog = self.resolve(self.trailer[b"Root"])
+        if not isinstance(catalog, dict) or not isinstance(catalog.get(b"Pages"), Ref):
+            raise PdfError("Katalog tidak memiliki /Pages")
+        tree_nodes = {self.trailer[b"Root"].num}
+        pages = []
+        stack = [(catalog[b"Pages"], {})]
+        while stack:
+            ref, inherited = stack.pop()
+            if not isinstance(ref, Ref) or ref.num in tree_nodes:
+                continue
+            obj = self.get(ref.num)
+            if obj is None or not isinstance(obj.value, dict):
+                continue
+            node = obj.value
+            if node.get(b"Type") == b"Pages" or b"Kids" in node:
+                tree_nodes.add(ref.num)
+                inherited = dict(inherited)
+                for key in INHERITABLE:
+                    if key in node:
+                        inherited[key] = node[key]
+                kids = self.resolve(node.get(b"Kids")) or []
+                # Dibalik agar urutan halaman terjaga saat diambil dari stack.
+                stack.extend((kid, inherited) for kid in reversed(kids))
+            else:
+                tree_nodes.add(ref.num)
+                page = dict(node)
+                for key, value in inherited.items():
+                    page.setdefault(key, value)
+                pages.append((ref.num, obj.gen, page))
+        return tree_nodes, pages
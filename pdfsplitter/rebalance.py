@@ -0,0 +1,235 @@
+import os
+import re
+import time
+
+from . import journal
+from .ledger import Ledger
+from .metrics import RunMetrics
+from .packing import _SortedCapacities, _best_fit_into, _sorted_decreasing, eliminate_bins, lower_bound
+from .transfer import DEFAULT_WORKERS, TransferExecutor, TransferJob, unique_name
+
+# --- Menyusun ulang folder output_N yang sudah ada dengan perpindahan minimal ---
+#
+# Langkah-langkahnya:
+#   1. Pindai semua file di output_1..output_K.
+#   2. Folder yang melebihi batas baru menyimpan file terbesarnya yang masih
+#      muat; sisanya "dikeluarkan" (file yang tetap di tempat tidak dipindah).
+#   3. File yang dikeluarkan ditempatkan best-fit ke celah di folder yang
+#      ada, atau ke folder baru jika tidak muat.
+#   4. (Opsional) folder paling kosong dibongkar ke celah folder lain jika
+#      seluruh isinya muat, sehingga jumlah folder berkurang.
+#   5. Folder kosong dihapus dan penomoran dirapatkan dengan rename direktori.
+
+_OUTPUT_FOLDER = re.compile(r"^output_(\d+)$")
+
+
+def _ignore(_):
+    pass
+
+
+def list_output_folders(destination):
+    """Mengembalikan [(nomor, path_folder)] untuk setiap output_N, urut nomor."""
+    folders = []
+    with os.scandir(destination) as entries:
+        for entry in entries:
+            match = _OUTPUT_FOLDER.match(entry.name)
+            if match and entry.is_dir(follow_symlinks=False):
+                folders.append((int(match.group(1)), entry.path))
+    folders.sort()
+    return folders
+
+
+def scan_output_folders(destination):
+    """Mengembalikan [(nomor, path_folder, [(path_file, ukuran)])] urut nomor."""
+    folders = []
+    for index, path in list_output_folders(destination):
+        files = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    files.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+        folders.append((index, path, files))
+    return folders
+
+
+def plan_rebalance(folders, limit, consolidate=True):
+    """Menghitung susunan baru; mengembalikan daftar bin sejajar dengan `folders`.
+
+    Bin ke-i (i < len(folders)) adalah isi baru folder ke-i; bin tambahan
+    di belakangnya adalah folder baru. Item yang berada di bin berbeda dari
+    folder asalnya harus dipindahkan.
+    """
+    bins = []
+    evicted = []
+    for _, _, files in folders:
+        kept = []
+        used = 0
+        for item in _sorted_decreasing(files):
+            size = item[1]
+            # File tunggal yang melebihi batas tetap tinggal sendirian.
+            if used + size <= limit or (not kept and size > limit):
+                kept.append(item)
+                used += size
+            else:
+                evicted.append(item)
+        bins.append(kept)
+
+    remaining = [limit - sum(size for _, size in b) for b in bins]
+    index = _SortedCapacities()
+    for bin_id, left in enumerate(remaining):
+        if left >= 0:
+            index.add((left, bin_id))
+    _best_fit_into(_sorted_decreasing(evicted), bins, remaining, index, limit)
+
+    if consolidate:
+        eliminate_bins(bins, limit)
+    return bins
+
+
+class Rebalancer:
+    def __init__(self, destination_folder, size_limit_mb, workers=DEFAULT_WORKERS, consolidate=True,
+                 renumber=True, on_progress=None, on_status=None, on_log=None):
+        self.destination_folder = destination_folder
+        self.size_limit_bytes = size_limit_mb * 1024 * 1024
+        self.workers = workers
+        self.consolidate = consolidate
+        self.renumber = renumber
+        self.ledger = Ledger()
+        self.metrics = RunMetrics()
+
+        self.on_progress = on_progress or _ignore
+        self.on_status = on_status or _ignore
+        self.on_log = on_log or _ignore
+
+    def _log(self, message):
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.on_log(f"[{timestamp}] {message}")
+
+    def run(self):
+        """Menjalankan rebalance; mengembalikan (sukses, pesan, ukuran_folder)."""
+        try:
+            self._log(f"Memulai rebalance folder output di '{self.destination_folder}'...")
+            if not os.path.isdir(self.destination_folder):
+                return False, "Folder tujuan tidak ditemukan.", {}
+            if journal.has_plan(self.destination_folder):
+                self._log("Error: Ada run pembagian yang belum selesai. Selesaikan atau lanjutkan run tersebut dahulu.")
+                return False, "Ada run sebelumnya yang belum selesai di folder tujuan.", {}
+
+            self.on_status("Memindai folder output...")
+            with self.metrics.phase("discovery"):
+                folders = scan_output_folders(self.destination_folder)
+            if not folders:
+                return False, "Tidak ada folder output_N di folder tujuan.", {}
+            all_files = [item for _, _, files in folders for item in files]
+            self._log(f"{len(folders)} folder output berisi {len(all_files)} file ditemukan.")
+
+            with self.metrics.phase("planning"):
+                bins = plan_rebalance(folders, self.size_limit_bytes, self.consolidate)
+            self.metrics.extra["folders"] = sum(1 for b in bins if b)
+            self.metrics.extra["folders_lower_bound"] = lower_bound(all_files, self.size_limit_bytes)
+
+            jobs = self._build_jobs(folders, bins)
+            moved_bytes = sum(job.size for job in jobs)
+            total_bytes = sum(size for _, size in all_files)
+            self._log(f"Susunan baru: {self.metrics.extra['folders']} folder "
+                      f"(batas bawah teoretis: {self.metrics.extra['folders_lower_bound']}). "
+                      f"{len(jobs)} dari {len(all_files)} file perlu dipindah "
+                      f"({moved_bytes / (1024 * 1024):.2f} dari {total_bytes / (1024 * 1024):.2f} MB).")
+
+            failures = self._execute(jobs)
+
+            with self.metrics.phase("summary"):
+                removed = self._remove_empty_folders(folders)
+                renamed = self._renumber_folders() if self.renumber else {}
+                # Ukuran akhir dari ledger, bukan dari pemindaian ulang.
+                folder_sizes = {}
+                for path, size in self.ledger.folder_paths_sizes().items():
+                    if path not in removed:
+                        folder_sizes[os.path.basename(renamed.get(path, path))] = size
+            if removed:
+                self._log(f"{len(removed)} folder kosong dihapus.")
+            if any(name.startswith("output_") and not os.path.isdir(os.path.join(self.destination_folder, name))
+                   for name in os.listdir(self.destination_folder)):
+                self._log("Catatan: manifest checksum lama (output_N.<algoritme>) tidak lagi sesuai setelah rebalance.")
+
+            if failures:
+                self._log(f"{failures} file gagal dipindahkan.")
+            self._log("Rebalance selesai.")
+            return True, "Rebalance folder output selesai!", folder_sizes
+
+        except Exception as e:
+            self._log(f"Terjadi kesalahan fatal selama rebalance: {e}")
+            return False, f"Terjadi kesalahan: {e}", {}
+
+    def _build_jobs(self, folders, bins):
+        next_index = folders[-1][0] + 1
+        targets = []
+        for bin_id in range(len(bins)):
+            if bin_id < len(folders):
+                targets.append(folders[bin_id][1])
+            else:
+                path = os.path.join(self.destination_folder, f"output_{next_index:01d}")
+                next_index += 1
+                os.makedirs(path, exist_ok=True)
+                targets.append(path)
+
+        taken = {}
+        for target in targets:
+            self.ledger.open_folder(target)
+            taken[target] = set(os.listdir(target))
+
+        jobs = []
+        for target, items in zip(targets, bins):
+            for path, size in items:
+                if os.path.dirname(path) == target:
+                    self.ledger.record(target, os.path.basename(path), size)
+                    continue
+                name = unique_name(taken[target], os.path.basename(path))
+                taken[target].add(name)
+                jobs.append(TransferJob(path, os.path.join(target, name), size, target))
+        return jobs
+
+    def _execute(self, jobs):
+        total_bytes = sum(job.size for job in jobs)
+        processed_bytes = 0
+        failures = 0
+        with self.metrics.phase("transfer"):
+            for job, error in TransferExecutor(self.workers).run(jobs):
+                processed_bytes += job.size
+                if error is None:
+                    self.ledger.record(job.folder, os.path.basename(job.destination), job.size)
+                    self.metrics.record_transfer(job.source, job.size, job.elapsed, job.mechanism)
+                    self._log(f"Memindahkan '{os.path.basename(job.source)}' dari "
+                              f"'{os.path.basename(os.path.dirname(job.source))}' ke '{os.path.basename(job.folder)}'")
+                else:
+                    failures += 1
+                    # File tetap berada di folder asalnya.
+                    self.ledger.record(os.path.dirname(job.source), os.path.basename(job.source), job.size)
+                    self.metrics.record_failure()
+                    self._log(f"Gagal memindahkan '{os.path.basename(job.source)}': {error}")
+                if total_bytes:
+                    self.on_progress(int(processed_bytes * 100 / total_bytes))
+        self.on_progress(100)
+        return failures
+
+    def _remove_empty_folders(self, folders):
+        removed = set()
+        for _, path, _ in folders:
+            try:
+                os.rmdir(path)
+                removed.add(path)
+            except OSError:
+                pass  # Tidak kosong
+        return removed
+
+    def _renumber_folders(self):
+        # Rapatkan penomoran: output_1..output_K tanpa celah. Diproses urut
+        # naik, sehingga nomor tujuan selalu sudah kosong.
+        renamed = {}
+        for new_index, (index, path) in enumerate(list_output_folders(self.destination_folder), start=1):
+            if index != new_index:
+                new_path = os.path.join(self.destination_folder, f"output_{new_index:01d}")
+                os.rename(path, new_path)
+                renamed[path] = new_path
+                self._log(f"Mengganti nama '{os.path.basename(path)}' menjadi '{os.path.basename(new_path)}'")
+        return renamed
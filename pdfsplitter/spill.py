@@ -0,0 +1,210 @@
+import heapq
+import json
+import os
+import struct
+from array import array
+from collections import OrderedDict
+
+from .transfer import TransferJob
+
+# --- Mode memori terbatas untuk sumber berisi jutaan file ---
+#
+# Daftar (path, ukuran) biasa memakan ratusan byte per file (tuple, objek
+# str path lengkap, int). Di sini path dipecah menjadi nomor direktori +
+# nama file: setiap direktori disimpan sekali sebagai (nomor_induk, nama),
+# sedangkan angka dan nama file disimpan di array/bytearray. Jika perkiraan
+# memori penampung melewati anggaran, isinya diurutkan dan ditulis ke file
+# run sementara; run-run itu digabung (k-way merge) saat dibaca kembali.
+# Urutan hasilnya sama persis dengan sorted() di memori, jadi penempatan
+# file tidak berubah.
+
+SPILL_DIR_NAME = ".pdf_splitter_spill"
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+_RECORD_HEADER = struct.Struct("<qqqqH")
+# Perkiraan byte per rekaman di penampung: empat angka + offset nama di
+# array, ditambah objek sementara (indeks, kunci tuple) saat diurutkan.
+_RECORD_OVERHEAD = 5 * 8 + 160
+_RUN_BUFFER_SIZE = 256 * 1024
+_PATH_CACHE_SIZE = 4096  # Path direktori lengkap yang disimpan oleh DirectoryTable.path()
+
+
+class DirectoryTable:
+    """Path direktori yang di-intern sebagai (nomor_induk, nama).
+
+    Prefiks bersama (mis. /data/arsip/2023) hanya disimpan sekali, tidak
+    diulang di setiap path file. Path lengkap dibangun ulang saat diminta;
+    hanya _PATH_CACHE_SIZE path yang terakhir dipakai disimpan (LRU), jadi
+    memorinya tidak tumbuh per direktori.
+    """
+
+    def __init__(self):
+        self._parents = array("q")
+        self._names = []
+        self._ids = {}
+        self._last = (None, -1)
+        self._paths = OrderedDict()
+
+    def __len__(self):
+        return len(self._names)
+
+    def intern(self, directory):
+        # discover() mengirim file per direktori, jadi pencarian terakhir
+        # hampir selalu kena.
+        if directory == self._last[0]:
+            return self._last[1]
+        parent, name = os.path.split(directory)
+        if parent == directory or not name:
+            key = (-1, directory)  # Akar filesystem ("/", "C:\\") atau ""
+        else:
+            key = (self.intern(parent), name)
+        dir_id = self._ids.get(key)
+        if dir_id is None:
+            dir_id = len(self._names)
+            self._ids[key] = dir_id
+            self._parents.append(key[0])
+            self._names.append(key[1])
+        self._last = (directory, dir_id)
+        return dir_id
+
+    def path(self, dir_id):
+        cached = self._paths.get(dir_id)
+        if cached is not None:
+            self._paths.move_to_end(dir_id)
+            return cached
+        parts = []
+        parent = dir_id
+        while parent >= 0:
+            parts.append(self._names[parent])
+            parent = self._parents[parent]
+        parts.reverse()
+        path = self._paths[dir_id] = os.path.join(*parts)
+        if len(self._paths) > _PATH_CACHE_SIZE:
+            self._paths.popitem(last=False)
+        return path
+
+
+class ExternalSorter:
+    """Mengurutkan rekaman (a, b, c, d, nama) dengan anggaran memori terbatas.
+
+    a-d adalah bilangan bulat 64-bit, `nama` sebuah str. `key(rekaman)`
+    menentukan urutan seperti pada sorted(); kunci harus membedakan setiap
+    rekaman agar urutan tidak bergantung pada urutan penambahan. Setelah semua rekaman
+    ditambahkan, hasil urut bisa diiterasi berkali-kali; close() menghapus
+    file run.
+    """
+
+    def __init__(self, key, budget_bytes, spill_dir):
+        self.key = key
+        self.budget_bytes = budget_bytes
+        self.spill_dir = spill_dir
+        self.runs = []
+        self.count = 0
+        self._order = None
+        self._reset()
+
+    def _reset(self):
+        self._columns = [array("q") for _ in range(4)]
+        self._names = bytearray()
+        self._offsets = array("Q", [0])
+        self._buffered_bytes = 0
+
+    def add(self, a, b, c, d, name):
+        encoded = os.fsencode(name)
+        for column, value in zip(self._columns, (a, b, c, d)):
+            column.append(value)
+        self._names += encoded
+        self._offsets.append(len(self._names))
+        self.count += 1
+        self._buffered_bytes += _RECORD_OVERHEAD + len(encoded)
+        if self._buffered_bytes >= self.budget_bytes:
+            self._spill()
+
+    def _record(self, i):
+        a, b, c, d = (column[i] for column in self._columns)
+        return a, b, c, d, os.fsdecode(bytes(self._names[self._offsets[i]:self._offsets[i + 1]]))
+
+    def _sorted_buffer(self):
+        if self._order is None:
+            key = self.key
+            record = self._record
+            self._order = sorted(range(len(self._columns[0])), key=lambda i: key(record(i)))
+        return (self._record(i) for i in self._order)
+
+    def _spill(self):
+        path = os.path.join(self.spill_dir, f"run_{id(self):x}_{len(self.runs)}.bin")
+        header = _RECORD_HEADER
+        with open(path, "wb", buffering=_RUN_BUFFER_SIZE) as out:
+            for a, b, c, d, name in self._sorted_buffer():
+                encoded = os.fsencode(name)
+                out.write(header.pack(a, b, c, d, len(encoded)))
+                out.write(encoded)
+        self.runs.append(path)
+        self._order = None
+        self._reset()
+
+    @staticmethod
+    def _read_run(path):
+        header = _RECORD_HEADER
+        with open(path, "rb", buffering=_RUN_BUFFER_SIZE) as f:
+            while True:
+                data = f.read(header.size)
+                if not data:
+                    return
+                a, b, c, d, length = header.unpack(data)
+                yield a, b, c, d, os.fsdecode(f.read(length))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        if not self.runs:
+            return self._sorted_buffer()
+        if len(self._columns[0]):
+            self._spill()
+        return heapq.merge(*(self._read_run(path) for path in self.runs), key=self.key)
+
+    def close(self):
+        for path in self.runs:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self.runs = []
+        self._order = None
+        self._reset()
+
+
+class JobSpill:
+    """Daftar TransferJob di file (satu baris JSON per job), bisa diiterasi berkali-kali."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.total_bytes = 0
+        self._file = open(path, "w", encoding="utf-8", buffering=_RUN_BUFFER_SIZE)
+
+    def add(self, job):
+        self._file.write(json.dumps([job.source, job.destination, job.size, job.folder]))
+        self._file.write("\n")
+        self.count += 1
+        self.total_bytes += job.size
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        self.close()
+        folder = None
+        with open(self.path, encoding="utf-8", buffering=_RUN_BUFFER_SIZE) as f:
+            for index, line in enumerate(f):
+                source, destination, size, job_folder = json.loads(line)
+                if job_folder != folder:
+                    folder = job_folder  # Satu objek str per folder, dipakai bersama
+                job = TransferJob(source, destination, size, folder)
+                job.index = index
+                yield job
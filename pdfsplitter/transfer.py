@@ -0,0 +1,136 @@
+import os
+import shutil
+import time
+
+# --- Eksekutor pemindahan file secara paralel ---
+#
+# Setiap pasangan (perangkat sumber, perangkat tujuan) mendapat pool thread
+# sendiri, sehingga disk lambat/jaringan tidak menghambat disk lain dan jumlah
+# transfer bersamaan ke satu perangkat bisa dibatasi.
+
+DEFAULT_WORKERS = 4
+
+
+def move_file(source, destination):
+    """Memindahkan satu file; mengembalikan mekanisme yang dipakai.
+
+    Sama seperti shutil.move untuk file biasa: coba os.rename dulu (instan
+    pada filesystem yang sama), jika gagal salin lalu hapus sumber.
+    """
+    try:
+        os.rename(source, destination)
+        return "rename"
+    except OSError:
+        shutil.copy2(source, destination)
+        os.unlink(source)
+        return "copy"
+
+
+def unique_name(taken, name):
+    """Mengembalikan `name`, atau "nama (2).pdf", "nama (3).pdf", ... jika sudah ada di `taken`."""
+    if name not in taken:
+        return name
+    stem, ext = os.path.splitext(name)
+    counter = 2
+    while f"{stem} ({counter}){ext}" in taken:
+        counter += 1
+    return f"{stem} ({counter}){ext}"
+
+
+def move_job(job):
+    return move_file(job.source, job.destination)
+
+
+class TransferJob:
+    __slots__ = ("source", "destination", "size", "folder", "index", "mechanism", "elapsed", "digest")
+
+    def __init__(self, source, destination, size, folder):
+        self.source = source
+        self.destination = destination
+        self.size = size
+        self.folder = folder
+        self.index = None  # Posisi dalam rencana (untuk jurnal)
+        # Diisi setelah transfer selesai
+        self.mechanism = None
+        self.elapsed = 0.0
+        self.digest = None
+
+
+class TransferExecutor:
+    """Menjalankan TransferJob pada pool thread per perangkat.
+
+    `device_workers` memetakan path (sembarang path di perangkat tersebut)
+    ke jumlah worker untuk perangkat itu. Perangkat yang tidak disebut memakai
+    `default_workers`. Konkurensi satu pasangan sumber/tujuan adalah nilai
+    terkecil dari keduanya.
+
+    `transfer(job)` menjalankan satu job dan mengembalikan nama mekanisme
+    yang dipakai; boleh juga mengisi `job.digest`.
+    """
+
+    def __init__(self, default_workers=DEFAULT_WORKERS, device_workers=None, transfer=move_job):
+        self.default_workers = max(1, int(default_workers))
+        self.transfer = transfer
+        self._device_limits = {}
+        for path, workers in (device_workers or {}).items():
+            self._device_limits[os.stat(path).st_dev] = max(1, int(workers))
+        self._dir_devices = {}
+        self._pools = {}
+
+    def _device_of(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        device = self._dir_devices.get(directory)
+        if device is None:
+            device = os.stat(directory).st_dev
+            self._dir_devices[directory] = device
+        return device
+
+    def _pool_for(self, job):
+        key = (self._device_of(job.source), self._device_of(job.destination))
+        entry = self._pools.get(key)
+        if entry is None:
+            workers = min(self._device_limits.get(key[0], self.default_workers),
+                          self._device_limits.get(key[1], self.default_workers))
+            from concurrent.futures import ThreadPoolExecutor
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-transfer")
+            entry = self._pools[key] = (pool, workers)
+        return entry[0]
+
+    def _in_flight_limit(self):
+        # Dua kali total worker: cukup agar worker tidak pernah menganggur.
+        return 2 * sum(workers for _, workers in self._pools.values())
+
+    def _run_one(self, job):
+        start = time.perf_counter()
+        job.mechanism = self.transfer(job)
+        job.elapsed = time.perf_counter() - start
+
+    def run(self, jobs):
+        """Generator yang menghasilkan (job, error) sesuai urutan selesai.
+
+        `error` bernilai None jika transfer berhasil. Jumlah job yang sedang
+        berjalan dibatasi agar antrean tidak memuat seluruh rencana sekaligus.
+        """
+        pending = {}
+        try:
+            for job in jobs:
+                future = self._pool_for(job).submit(self._run_one, job)
+                pending[future] = job
+                if len(pending) >= self._in_flight_limit():
+                    yield from self._drain(pending)
+            while pending:
+                yield from self._drain(pending)
+        finally:
+            self.shutdown()
+
+    def _drain(self, pending):
+        from concurrent.futures import FIRST_COMPLETED, wait
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            job = pending.pop(future)
+            yield job, future.exception()
+
+    def shutdown(self):
+        for pool, _ in self._pools.values():
+            pool.shutdown(wait=True)
+        self._pools.clear()
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import errno
+import shutil
+
+from .fastcopy import _FALLBACK_ERRNOS
+from .options import DEFAULT_HASH_ALGORITHM
+
+# --- Checksum streaming untuk verifikasi isi file ---
+#
+# File dibaca dengan buffer berukuran tetap, sehingga memori tetap kecil
+# berapa pun ukuran PDF-nya. Default BLAKE2b (512 bit, kompatibel dengan
+# `b2sum`); algoritme xxHash dipakai jika paket `xxhash` terpasang.
+#
+# Biaya I/O verifikasi per file:
+#   - salin (mode copy, atau move lintas perangkat): sumber di-hash di dalam
+#     loop salin, jadi tidak ada pembacaan tambahan; hanya jalur salin
+#     kernel (copy_file_range/reflink) yang tidak dipakai
+#   - rename/hardlink: tidak ada data yang disalin, jadi file dibaca sekali
+#     untuk digest manifest
+#   - paranoid: tujuan dibaca ulang setelah ditulis dan dibandingkan dengan
+#     digest sumber (satu pembacaan penuh tambahan per file yang disalin)
+
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
+class VerificationError(OSError):
+    pass
+
+
+def new_hasher(algorithm=DEFAULT_HASH_ALGORITHM):
+    if algorithm.startswith("xxh"):
+        try:
+            import xxhash
+        except ImportError:
+            raise ValueError(f"Algoritme '{algorithm}' membutuhkan paket 'xxhash' (pip install xxhash).")
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+
+def hash_file(path, algorithm=DEFAULT_HASH_ALGORITHM, buffer_size=HASH_BUFFER_SIZE):
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            hasher.update(view[:count])
+    return hasher.hexdigest()
+
+
+def copy_and_hash(source, destination, algorithm=DEFAULT_HASH_ALGORITHM, buffer_size=HASH_BUFFER_SIZE):
+    # Sumber di-hash sambil disalin, jadi tidak ada pembacaan tambahan.
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(source, "rb", buffering=0) as src, open(destination, "wb", buffering=0) as dst:
+        while True:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            hasher.update(view[:count])
+            dst.write(view[:count])
+        os.fsync(dst.fileno())
+    return hasher.hexdigest()
+
+
+def _check_destination(destination, digest, algorithm, buffer_size):
+    # Mode paranoid: baca ulang tujuan dari disk dan bandingkan.
+    if hash_file(destination, algorithm, buffer_size) != digest:
+        os.unlink(destination)
+        raise VerificationError(f"Checksum tidak cocok untuk '{destination}'")
+
+
+def move_verified(source, destination, algorithm=DEFAULT_HASH_ALGORITHM, buffer_size=HASH_BUFFER_SIZE,
+                  paranoid=False):
+    """Memindahkan file dan menghitung digest-nya; mengembalikan (mekanisme, digest).
+
+    Pada rename isi file tidak berubah; file dibaca sekali untuk manifest.
+    Pada salin-lalu-hapus, digest dihitung selama penyalinan; dengan
+    `paranoid` tujuan dibaca ulang dan dibandingkan sebelum sumber dihapus.
+    """
+    try:
+        os.rename(source, destination)
+    except OSError:
+        pass
+    else:
+        return "rename", hash_file(destination, algorithm, buffer_size)
+
+    digest = copy_and_hash(source, destination, algorithm, buffer_size)
+    if paranoid:
+        _check_destination(destination, digest, algorithm, buffer_size)
+    try:
+        shutil.copystat(source, destination)
+    except OSError:
+        pass
+    os.unlink(source)
+    return "copy", digest
+
+
+def copy_verified(source, destination, algorithm=DEFAULT_HASH_ALGORITHM, buffer_size=HASH_BUFFER_SIZE,
+                  hardlink=True, paranoid=False):
+    """Menyalin file sambil menghitung digest-nya; mengembalikan (mekanisme, digest).
+
+    Hardlink menunjuk ke inode yang sama, jadi cukup di-hash sekali. Dengan
+    `paranoid` tujuan dibaca ulang dan dibandingkan setelah disalin.
+    """
+    if hardlink:
+        try:
+            os.link(source, destination)
+            return "hardlink", hash_file(destination, algorithm, buffer_size)
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS and e.errno != errno.EMLINK:
+                raise
+
+    digest = copy_and_hash(source, destination, algorithm, buffer_size)
+    if paranoid:
+        _check_destination(destination, digest, algorithm, buffer_size)
+    shutil.copystat(source, destination)
+    return "buffered", digest
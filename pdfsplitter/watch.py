@@ -0,0 +1,554 @@
+import json
+import os
+import select
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+from .discovery import DEFAULT_INCLUDE, _compile_patterns, _matches
+from .ledger import Ledger
+from .metrics import RunMetrics, _atomic_write
+from .options import DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_SECONDS, PARTS_DIR_NAME
+from .oversize import split_pdf
+from .packing import _SortedCapacities
+from .pdfdoc import PdfError
+from .rebalance import list_output_folders, scan_output_folders
+from .transfer import move_file
+
+# --- Mode pantau: menempatkan PDF baru secara bertahap tanpa memindai ulang ---
+#
+# Sisa kapasitas setiap folder output_N disimpan di memori (dan di file
+# status di folder tujuan), sehingga run berikutnya melanjutkan penomoran dan
+# pengisian folder alih-alih mulai lagi dari output_1. File baru ditemukan
+# lewat inotify (Linux, via ctypes) atau, jika tidak tersedia, dengan
+# memeriksa mtime setiap direktori dan hanya membaca ulang direktori yang
+# berubah. File yang masih ditulis ditunggu sampai ukuran dan mtime-nya
+# stabil selama `settle_seconds`, lalu ditempatkan best-fit ke folder yang
+# masih muat.
+
+STATE_FILE_NAME = ".pdf_splitter_bins.json"
+STATE_VERSION = 2
+PARTS_MANIFEST_NAME = "sumber.json"  # Di setiap folder bagian: PDF asli dan daftar bagiannya
+
+_WAIT_SLICE = 0.25  # Batas lama menunggu sekali, agar stop() cepat direspons
+
+
+def _ignore(_):
+    pass
+
+
+def _scan_tree(root, on_dir):
+    """Menjelajah `root` sekali; memanggil on_dir(path, stat) dan mengembalikan path file."""
+    files = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            on_dir(directory, os.stat(directory))
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append(entry.path)
+        except OSError:
+            continue  # Direktori hilang atau tidak terbaca
+    return files
+
+
+# --- Sumber kejadian file ---
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class _InotifySource:
+    """Watch inotify per direktori; direktori baru otomatis ikut dipantau."""
+
+    kind = "inotify"
+
+    def __init__(self, root):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify hanya tersedia di Linux")
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._ctypes = ctypes
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd = fd
+        self.root = root
+        self._dirs = {}  # wd -> path direktori
+
+    def _watch(self, path, stat):
+        wd = self._add_watch(self._fd, os.fsencode(path), _IN_MASK)
+        if wd < 0:
+            errno = self._ctypes.get_errno()
+            # ENOSPC: batas fs.inotify.max_user_watches tercapai.
+            raise OSError(errno, f"inotify_add_watch '{path}': {os.strerror(errno)}")
+        self._dirs[wd] = path
+
+    def add_tree(self, root):
+        return _scan_tree(root, self._watch)
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        files = []
+        pos = 0
+        while pos + _INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, pos)
+            name = data[pos + _INOTIFY_EVENT.size:pos + _INOTIFY_EVENT.size + length].rstrip(b"\0")
+            pos += _INOTIFY_EVENT.size + length
+            if mask & _IN_Q_OVERFLOW:
+                # Antrean kernel penuh: kejadian hilang, jelajahi ulang sekali.
+                files.extend(self.add_tree(self.root))
+                continue
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    files.extend(self.add_tree(path))
+            elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                files.append(path)
+        return files
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _PollingSource:
+    """Cadangan tanpa inotify: hanya direktori yang mtime-nya berubah yang dibaca ulang."""
+
+    kind = "polling"
+
+    def __init__(self, root, interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self._dirs = {}  # path direktori -> mtime_ns
+        self._next_poll = time.monotonic() + interval
+
+    def _watch(self, path, stat):
+        self._dirs[path] = stat.st_mtime_ns
+
+    def add_tree(self, root):
+        return _scan_tree(root, self._watch)
+
+    def wait(self, timeout):
+        now = time.monotonic()
+        if now < self._next_poll:
+            time.sleep(min(timeout, self._next_poll - now))
+            return []
+        self._next_poll = now + self.interval
+        files = []
+        for directory, mtime in list(self._dirs.items()):
+            try:
+                stat = os.stat(directory)
+            except OSError:
+                del self._dirs[directory]
+                continue
+            if stat.st_mtime_ns == mtime:
+                continue
+            self._dirs[directory] = stat.st_mtime_ns
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path not in self._dirs:
+                                files.extend(self.add_tree(entry.path))
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append(entry.path)
+            except OSError:
+                continue
+        return files
+
+    def close(self):
+        pass
+
+
+def open_source(root, poll_interval=DEFAULT_POLL_INTERVAL, polling=False):
+    """Mengembalikan (sumber_kejadian, file_yang_sudah_ada, alasan_fallback)."""
+    reason = None
+    if not polling:
+        source = None
+        try:
+            source = _InotifySource(root)
+            return source, source.add_tree(root), None
+        except OSError as e:
+            if source is not None:
+                source.close()
+            reason = str(e)
+    source = _PollingSource(root, poll_interval)
+    return source, source.add_tree(root), reason
+
+
+# --- Status folder output ---
+
+class BinState:
+    """Byte terpakai per folder output_N, plus indeks sisa kapasitas untuk best-fit.
+
+    Mtime setiap folder ikut disimpan. Run batch dan Rebalancer mengubah
+    folder output_N tanpa memperbarui file status, jadi saat dimuat status
+    hanya dipercaya jika daftar folder dan mtime-nya masih sama; jika tidak,
+    folder dipindai ulang.
+    """
+
+    def __init__(self, destination, limit):
+        self.destination = destination
+        self.limit = limit
+        self.used = {}  # nomor folder -> byte terpakai
+        self.mtimes = {}  # nomor folder -> st_mtime_ns folder saat status terakhir disimpan
+        self.skipped = {}  # path sumber yang sengaja tidak dipindah -> [ukuran, mtime_ns]
+        self._capacities = _SortedCapacities()
+
+    @property
+    def path(self):
+        return os.path.join(self.destination, STATE_FILE_NAME)
+
+    @property
+    def open_folders(self):
+        """Jumlah folder yang masih punya sisa kapasitas."""
+        return len(self._capacities)
+
+    def load(self):
+        """Memuat status; mengembalikan asal status ("file", "scan" atau "baru")."""
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.skipped = data.get("skipped", {})
+            if data.get("version") == STATE_VERSION and self._matches_disk(data["bins"]):
+                for index, used, mtime_ns in data["bins"]:
+                    self._set(index, used)
+                    self.mtimes[index] = mtime_ns
+                return "file"
+        # Belum ada status (atau sudah usang): hitung dari folder output yang ada.
+        folders = scan_output_folders(self.destination)
+        for index, path, files in folders:
+            self._set(index, sum(size for _, size in files))
+            self.mtimes[index] = os.stat(path).st_mtime_ns
+        return "scan" if folders else "baru"
+
+    def _matches_disk(self, bins):
+        recorded = {index: (used, mtime_ns) for index, used, mtime_ns in bins}
+        on_disk = dict(list_output_folders(self.destination))
+        for index, path in on_disk.items():
+            if index not in recorded or recorded[index][1] != os.stat(path).st_mtime_ns:
+                return False
+        # Folder yang tercatat berisi tetapi sudah tidak ada (mis. dirapatkan Rebalancer).
+        return all(index in on_disk or not used for index, (used, _) in recorded.items())
+
+    def touch(self, index):
+        """Mencatat mtime folder setelah isinya diubah oleh mode pantau."""
+        try:
+            self.mtimes[index] = os.stat(self.folder(index)).st_mtime_ns
+        except OSError:
+            self.mtimes.pop(index, None)
+
+    def save(self):
+        bins = [[index, used, self.mtimes.get(index)] for index, used in sorted(self.used.items())]
+        data = {"version": STATE_VERSION, "limit": self.limit, "bins": bins, "skipped": self.skipped}
+        _atomic_write(self.path, json.dumps(data))
+
+    def _set(self, index, used):
+        old = self.used.get(index)
+        if old is not None and old < self.limit:
+            self._capacities.remove((self.limit - old, index))
+        self.used[index] = used
+        if used < self.limit:
+            self._capacities.add((self.limit - used, index))
+
+    def folder(self, index):
+        return os.path.join(self.destination, f"output_{index:01d}")
+
+    def reserve(self, size):
+        """Memilih folder best-fit untuk `size` byte dan mencatatnya; mengembalikan nomornya."""
+        fit = self._capacities.ceiling((size, 0)) if size <= self.limit else None
+        index = fit[1] if fit is not None else max(self.used, default=0) + 1
+        self._set(index, self.used.get(index, 0) + size)
+        return index
+
+    def release(self, index, size):
+        self._set(index, self.used[index] - size)
+
+
+class WatchSplitter:
+    def __init__(self, source_folder, destination_folder, size_limit_mb, include=DEFAULT_INCLUDE, exclude=(),
+                 split_oversize=True, settle_seconds=DEFAULT_SETTLE_SECONDS, poll_interval=DEFAULT_POLL_INTERVAL,
+                 polling=False, on_progress=None, on_status=None, on_log=None):
+        self.source_folder = os.path.abspath(source_folder)
+        self.destination_folder = os.path.abspath(destination_folder)
+        self.size_limit_bytes = size_limit_mb * 1024 * 1024
+        self.include = _compile_patterns(include)
+        self.exclude = _compile_patterns(exclude)
+        self.split_oversize = split_oversize
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.polling = polling
+        self.state = BinState(self.destination_folder, self.size_limit_bytes)
+        self.ledger = Ledger()
+        self.metrics = RunMetrics()
+        self._pending = {}  # path -> (ukuran, mtime_ns, sejak_stabil, pertama_terlihat)
+        self._failed = {}  # path -> (ukuran, mtime_ns) transfer yang gagal
+        self._stop = threading.Event()
+        self._latency_total = 0.0
+
+        self.on_progress = on_progress or _ignore
+        self.on_status = on_status or _ignore
+        self.on_log = on_log or _ignore
+
+    def _log(self, message):
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.on_log(f"[{timestamp}] {message}")
+
+    def stop(self):
+        """Menghentikan run() dari thread lain."""
+        self._stop.set()
+
+    def run(self):
+        """Memantau folder sumber sampai stop(); mengembalikan (sukses, pesan, ukuran_folder)."""
+        source = None
+        try:
+            if not os.path.isdir(self.source_folder):
+                return False, "Folder sumber tidak ditemukan.", {}
+            os.makedirs(self.destination_folder, exist_ok=True)
+            origin = self.state.load()
+            if origin == "scan":
+                self.state.save()  # Ganti status usang dengan hasil pindai ulang
+            self._log(f"Status folder output dimuat ({origin}): {len(self.state.used)} folder, "
+                      f"{self.state.open_folders} masih punya sisa kapasitas.")
+            self._recover_parts()
+
+            source, existing, fallback_reason = open_source(self.source_folder, self.poll_interval, self.polling)
+            if fallback_reason:
+                self._log(f"inotify tidak tersedia ({fallback_reason}); memakai polling setiap "
+                          f"{self.poll_interval:g} detik.")
+            self._log(f"Memantau '{self.source_folder}' ({source.kind}). {len(existing)} file sudah ada.")
+            self._observe(existing)
+
+            while not self._stop.is_set():
+                self._place_ready()
+                self._observe(source.wait(self._next_timeout()))
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            self._log(f"Terjadi kesalahan fatal dalam mode pantau: {e}")
+            return False, f"Terjadi kesalahan: {e}", {}
+        finally:
+            if source is not None:
+                source.close()
+        self._log(f"Pemantauan dihentikan. {self.metrics.files} file ditempatkan.")
+        return True, "Pemantauan dihentikan.", self.ledger.folder_sizes()
+
+    def _accepted(self, path):
+        if path.startswith(self.destination_folder + os.sep):
+            return False
+        name = os.path.basename(path).lower()
+        relative = os.path.relpath(path, self.source_folder).replace(os.sep, "/").lower()
+        return _matches(self.include, name, relative) and not _matches(self.exclude, name, relative)
+
+    def _observe(self, paths):
+        now = time.monotonic()
+        for path in paths:
+            if not self._accepted(path):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            key = [stat.st_size, stat.st_mtime_ns]
+            if self.state.skipped.get(path) == key or self._failed.get(path) == tuple(key):
+                continue
+            previous = self._pending.get(path)
+            if previous is None:
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now, now)
+            elif previous[:2] != (stat.st_size, stat.st_mtime_ns):
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now, previous[3])
+
+    def _next_timeout(self):
+        if not self._pending:
+            return _WAIT_SLICE
+        earliest = min(since for _, _, since, _ in self._pending.values())
+        return max(0.0, min(_WAIT_SLICE, earliest + self.settle_seconds - time.monotonic()))
+
+    def _place_ready(self):
+        now = time.monotonic()
+        for path, (size, mtime, since, first_seen) in list(self._pending.items()):
+            if now - since < self.settle_seconds:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]  # Dihapus/dipindah sebelum sempat ditempatkan
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now, first_seen)
+                continue
+            del self._pending[path]
+            self._place(path, size, mtime, first_seen)
+
+    def _remove_original(self, path, size, mtime):
+        # Semua bagian sudah dipindahkan; PDF asli dihapus agar tidak dipecah
+        # lagi oleh run batch berikutnya atas folder sumber yang sama.
+        try:
+            stat = os.stat(path)
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                return  # Berubah sejak dipecah; akan ditempatkan ulang sebagai file baru
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self._log(f"Peringatan: Gagal menghapus PDF asli '{os.path.basename(path)}': {e}")
+            # Semua bagiannya sudah ditempatkan: jangan dipecah lagi selama file aslinya tidak berubah.
+            self.state.skipped[path] = [size, mtime]
+            self.state.save()
+            return
+        if self.state.skipped.pop(path, None) is not None:
+            self.state.save()
+
+    def _recover_parts(self):
+        """Menempatkan bagian yang tertinggal di PARTS_DIR_NAME dari run sebelumnya."""
+        parts_root = os.path.join(self.destination_folder, PARTS_DIR_NAME)
+        try:
+            names = sorted(os.listdir(parts_root))
+        except FileNotFoundError:
+            return
+        for name in names:
+            parts_dir = os.path.join(parts_root, name)
+            try:
+                with open(os.path.join(parts_dir, PARTS_MANIFEST_NAME), encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                # Pemecahan terputus sebelum selesai: file asli masih utuh di
+                # folder sumber dan akan dipecah ulang.
+                self._log(f"Membersihkan bagian sisa pemecahan yang tidak selesai '{name}'.")
+                shutil.rmtree(parts_dir, ignore_errors=True)
+                continue
+            self._log(f"Melanjutkan penempatan bagian '{os.path.basename(manifest['source'])}' dari run sebelumnya.")
+            self._place_parts(parts_dir, manifest, time.monotonic())
+        self._remove_parts_root()
+
+    def _remove_parts_root(self):
+        try:
+            os.rmdir(os.path.join(self.destination_folder, PARTS_DIR_NAME))
+        except OSError:
+            pass  # Masih ada bagian lain yang menunggu
+
+    def _split(self, path, size, mtime):
+        """Memecah PDF ke subfolder unik di PARTS_DIR_NAME; mengembalikan (folder, manifest) atau None."""
+        parts_root = os.path.join(self.destination_folder, PARTS_DIR_NAME)
+        parts_dir = None
+        try:
+            os.makedirs(parts_root, exist_ok=True)
+            # mkdtemp: dua PDF dengan mtime sama tidak berbagi folder bagian.
+            parts_dir = tempfile.mkdtemp(prefix=f"{mtime}_", dir=parts_root)
+            items = split_pdf(path, self.size_limit_bytes, parts_dir)
+            # Manifest ditulis terakhir: folder bagian tanpa manifest berarti
+            # pemecahan terputus dan isinya boleh dibuang.
+            manifest = {"source": path, "size": size, "mtime_ns": mtime,
+                        "parts": [os.path.basename(item_path) for item_path, _ in items]}
+            _atomic_write(os.path.join(parts_dir, PARTS_MANIFEST_NAME), json.dumps(manifest))
+        except (PdfError, OSError) as e:
+            if parts_dir is not None:
+                shutil.rmtree(parts_dir, ignore_errors=True)
+                self._remove_parts_root()
+            self._log(f"Peringatan: '{os.path.basename(path)}' melebihi batas dan tidak bisa dipecah: {e}. "
+                      "File ditempatkan utuh.")
+            return None
+        self._log(f"'{os.path.basename(path)}' ({size / (1024 * 1024):.2f} MB) dipecah menjadi "
+                  f"{len(items)} bagian; file asli dihapus setelah semua bagiannya dipindahkan.")
+        return parts_dir, manifest
+
+    def _place_parts(self, parts_dir, manifest, first_seen):
+        path, size, mtime = manifest["source"], manifest["size"], manifest["mtime_ns"]
+        items = []
+        for name in manifest["parts"]:
+            item_path = os.path.join(parts_dir, name)
+            try:
+                items.append((item_path, os.path.getsize(item_path)))
+            except FileNotFoundError:
+                continue  # Sudah dipindahkan sebelum run terhenti
+        if not self._place_items(path, size, mtime, first_seen, items):
+            return  # Bagian yang gagal tetap di folder bagian untuk run berikutnya
+        # Asli baru dianggap selesai setelah semua bagiannya ditempatkan.
+        try:
+            os.unlink(os.path.join(parts_dir, PARTS_MANIFEST_NAME))
+            os.rmdir(parts_dir)
+        except OSError as e:
+            self._log(f"Peringatan: Gagal membersihkan folder bagian '{parts_dir}': {e}")
+            return  # Dicoba lagi oleh _recover_parts() pada run berikutnya
+        self._remove_parts_root()
+        self._remove_original(path, size, mtime)
+
+    def _place(self, path, size, mtime, first_seen):
+        if size > self.size_limit_bytes and self.split_oversize:
+            split = self._split(path, size, mtime)
+            if split is not None:
+                self._place_parts(*split, first_seen)
+                return
+        self._place_items(path, size, mtime, first_seen, [(path, size)])
+
+    def _place_items(self, path, size, mtime, first_seen, items):
+        """Memindahkan `items` (file itu sendiri atau bagian-bagiannya); True jika semuanya berhasil."""
+        placed = True
+        for item_path, item_size in items:
+            index = self.state.reserve(item_size)
+            # Simpan dulu sebelum memindah: jika proses mati, kapasitas
+            # tercatat berlebih (aman), bukan kurang.
+            self.state.save()
+            folder = self.state.folder(index)
+            name = os.path.basename(item_path)
+            start = time.perf_counter()
+            try:
+                os.makedirs(folder, exist_ok=True)
+                destination = os.path.join(folder, name)
+                stem, ext = os.path.splitext(name)
+                counter = 2
+                while os.path.exists(destination):
+                    destination = os.path.join(folder, f"{stem} ({counter}){ext}")
+                    counter += 1
+                mechanism = move_file(item_path, destination)
+            except OSError as e:
+                self.state.release(index, item_size)
+                self.state.touch(index)
+                self.state.save()
+                self._failed[path] = (size, mtime)
+                self.metrics.record_failure()
+                self._log(f"Gagal memindahkan '{name}': {e}")
+                placed = False
+                continue
+            self.state.touch(index)
+            self.state.save()
+            self.ledger.record(folder, os.path.basename(destination), item_size)
+            self.metrics.record_transfer(item_path, item_size, time.perf_counter() - start, mechanism)
+            latency = time.monotonic() - first_seen
+            self._latency_total += latency
+            self.metrics.extra["placement_latency_max"] = max(self.metrics.extra.get("placement_latency_max", 0.0),
+                                                              latency)
+            self.metrics.extra["placement_latency_avg"] = self._latency_total / self.metrics.files
+            self._log(f"Memindahkan '{name}' ({item_size / (1024 * 1024):.2f} MB) ke "
+                      f"'{os.path.basename(folder)}' (latensi {latency:.2f} s)")
+            self.on_status(f"{self.metrics.files} file ditempatkan; terakhir '{name}' ke '{os.path.basename(folder)}'")
+        return placed
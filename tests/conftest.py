@@ -0,0 +1,106 @@
+import os
+import zlib
+
+import pytest
+
+# --- Pembuat PDF kecil untuk pengujian ---
+#
+# Setiap halaman berisi content stream teks + satu gambar acak berukuran
+# `image_size` byte, jadi ukuran file bisa diatur untuk pengujian pemecahan.
+# xref="classic" menulis tabel xref biasa; xref="stream" menyimpan objek
+# non-stream di object stream (FlateDecode) dengan xref stream berprediktor
+# PNG, seperti keluaran penulis PDF modern.
+
+
+def write_pdf(path, pages, image_size=1000, xref="classic"):
+    objects = {}
+    streams = {}
+    counter = [0]
+
+    def new():
+        counter[0] += 1
+        return counter[0]
+
+    catalog, root, font = new(), new(), new()
+    objects[font] = b"<</Type /Font /Subtype /Type1 /BaseFont /Helvetica>>"
+    page_nums = []
+    for i in range(pages):
+        page, content, image, length = new(), new(), new(), new()
+        page_nums.append(page)
+        streams[image] = (b"<</Type /XObject /Subtype /Image /Width 1 /Height %d /ColorSpace /DeviceGray "
+                          b"/BitsPerComponent 8 /Length %d 0 R>>" % (image_size, length), os.urandom(image_size))
+        objects[length] = b"%d" % image_size
+        text = b"BT /F1 24 Tf 72 720 Td (Halaman %d) Tj ET q 100 0 0 100 72 72 cm /Im0 Do Q" % (i + 1)
+        streams[content] = (b"<</Length %d>>" % len(text), text)
+        objects[page] = (b"<</Type /Page /Parent %d 0 R /Contents %d 0 R "
+                         b"/Resources <</Font <</F1 %d 0 R>> /XObject <</Im0 %d 0 R>>>>>>"
+                         % (root, content, font, image))
+    kids = b" ".join(b"%d 0 R" % num for num in page_nums)
+    objects[root] = b"<</Type /Pages /Kids [%s] /Count %d /MediaBox [0 0 612 792]>>" % (kids, pages)
+    objects[catalog] = b"<</Type /Catalog /Pages %d 0 R>>" % root
+
+    out = bytearray(b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n")
+    offsets = {}
+
+    def write_stream(num, dictionary, data):
+        offsets[num] = len(out)
+        out.extend(b"%d 0 obj\n%s\nstream\n%s\nendstream\nendobj\n" % (num, dictionary, data))
+
+    if xref == "classic":
+        for num in sorted(set(objects) | set(streams)):
+            if num in streams:
+                write_stream(num, *streams[num])
+            else:
+                offsets[num] = len(out)
+                out.extend(b"%d 0 obj\n%s\nendobj\n" % (num, objects[num]))
+        start = len(out)
+        size = counter[0] + 1
+        out.extend(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for num in range(1, size):
+            out.extend(b"%010d 00000 n \n" % offsets[num])
+        out.extend(b"trailer\n<</Size %d /Root %d 0 R>>\nstartxref\n%d\n%%%%EOF\n" % (size, catalog, start))
+    else:
+        object_stream, xref_stream = new(), new()
+        inner = sorted(objects)
+        header = b""
+        body = b""
+        for num in inner:
+            header += b"%d %d " % (num, len(body))
+            body += objects[num] + b"\n"
+        for num in sorted(streams):
+            write_stream(num, *streams[num])
+        packed = zlib.compress(header + body)
+        write_stream(object_stream, b"<</Type /ObjStm /N %d /First %d /Filter /FlateDecode /Length %d>>"
+                     % (len(inner), len(header), len(packed)), packed)
+        size = counter[0] + 1
+        offsets[xref_stream] = len(out)
+        rows = []
+        for num in range(size):
+            if num == 0:
+                rows.append(bytes([0, 0, 0, 0, 0, 0xFF, 0xFF]))
+            elif num in objects:
+                rows.append(bytes([2]) + object_stream.to_bytes(4, "big") + inner.index(num).to_bytes(2, "big"))
+            else:
+                rows.append(bytes([1]) + offsets[num].to_bytes(4, "big") + bytes(2))
+        raw = b""
+        previous = bytes(7)
+        for row in rows:
+            raw += b"\x02" + bytes((a - b) & 0xFF for a, b in zip(row, previous))  # Prediktor PNG "Up"
+            previous = row
+        packed = zlib.compress(raw)
+        write_stream(xref_stream, b"<</Type /XRef /Size %d /W [1 4 2] /Root %d 0 R /Filter /FlateDecode "
+                     b"/DecodeParms <</Predictor 12 /Columns 7>> /Length %d>>" % (size, catalog, len(packed)),
+                     packed)
+        out.extend(b"startxref\n%d\n%%%%EOF\n" % offsets[xref_stream])
+    with open(path, "wb") as f:
+        f.write(out)
+    return path
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    def make(name, pages, image_size=1000, xref="classic", folder=None):
+        directory = tmp_path / folder if folder else tmp_path
+        directory.mkdir(parents=True, exist_ok=True)
+        return write_pdf(str(directory / name), pages, image_size, xref)
+    return make
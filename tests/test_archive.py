@@ -0,0 +1,57 @@
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from pdfsplitter.archive import entry_overhead, next_volume_index, volume_overhead, volume_path, write_volume
+from pdfsplitter.ledger import output_index
+from pdfsplitter.verify import hash_file
+
+
+@pytest.mark.parametrize("output_format", ["zip", "tar"])
+def test_volume_size_within_estimated_overhead(tmp_path, output_format):
+    names = ["a.pdf", "nama dengan spasi.pdf", "ünïcode.pdf", "x" * 180 + ".pdf"]
+    sizes = [0, 1, 511, 70000]
+    files = []
+    for name, size in zip(names, sizes):
+        path = tmp_path / f"src_{size}.bin"
+        path.write_bytes(os.urandom(size))
+        files.append((str(path), name, size))
+    estimate = volume_overhead(output_format) + sum(size + entry_overhead(output_format, name, size)
+                                                     for _, name, size in files)
+    path = volume_path(str(tmp_path), 1, output_format)
+    digests = {}
+    volume_size = write_volume(output_format, path, files, hash_algorithm="sha256",
+                               on_file=lambda source, name, size, seconds, digest: digests.update({name: digest}))
+    assert volume_size == os.path.getsize(path)
+    assert volume_size <= estimate
+    assert digests == {name: hash_file(source, "sha256") for source, name, _ in files}
+
+    if output_format == "zip":
+        with zipfile.ZipFile(path) as archive:
+            assert archive.testzip() is None
+            assert sorted(archive.namelist()) == sorted(names)
+    else:
+        with tarfile.open(path) as archive:
+            assert sorted(archive.getnames()) == sorted(names)
+
+
+def test_next_volume_index_skips_existing(tmp_path):
+    assert next_volume_index(str(tmp_path), "zip") == 1
+    (tmp_path / "output_1.zip").write_bytes(b"")
+    (tmp_path / "output_4.zip").write_bytes(b"")
+    (tmp_path / "output_9.tar").write_bytes(b"")
+    assert next_volume_index(str(tmp_path), "zip") == 5
+
+
+def test_failed_volume_leaves_no_partial_file(tmp_path):
+    path = volume_path(str(tmp_path), 1, "zip")
+    with pytest.raises(OSError):
+        write_volume("zip", path, [(str(tmp_path / "tidak_ada.pdf"), "tidak_ada.pdf", 10)])
+    assert os.listdir(tmp_path) == []
+
+
+def test_output_index_sorts_folders_and_volumes():
+    names = ["output_10.tar", "output_2", "output_1.zip", "lain"]
+    assert sorted(names, key=output_index) == ["output_1.zip", "output_2", "output_10.tar", "lain"]
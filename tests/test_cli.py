@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pdfsplitter
+from pdfsplitter.cli import main
+from pdfsplitter.core import PdfSplitter
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_source(tmp_path, count=6, size=400 * 1024):
+    source = tmp_path / "sumber"
+    source.mkdir()
+    for i in range(count):
+        (source / f"f{i}.pdf").write_bytes(bytes([i]) * size)
+    return source
+
+
+def run_python(*args):
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, cwd=PACKAGE_ROOT)
+
+
+def test_cli_never_imports_qt():
+    result = run_python("-c", "import sys, pdfsplitter, pdfsplitter.cli; "
+                              "print(sorted(m for m in sys.modules if m.startswith('PyQt')))")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+    result = run_python("-m", "pdfsplitter", "--help")
+    assert result.returncode == 0
+    assert "--limit" in result.stdout
+
+
+def test_help_does_not_load_heavy_modules():
+    heavy = ["hashlib", "tarfile", "zipfile", "pdfsplitter.archive", "pdfsplitter.core", "pdfsplitter.pdfdoc",
+             "pdfsplitter.rebalance", "pdfsplitter.watch"]
+    result = run_python("-c", "import sys, contextlib, io, pdfsplitter.cli\n"
+                              "with contextlib.suppress(SystemExit), contextlib.redirect_stdout(io.StringIO()):\n"
+                              "    pdfsplitter.cli.main(['--help'])\n"
+                              f"print([m for m in {heavy!r} if m in sys.modules])")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
+def test_package_exports_load_on_first_access():
+    assert pdfsplitter.WatchSplitter.__module__ == "pdfsplitter.watch"
+    assert set(pdfsplitter.__all__) <= set(dir(pdfsplitter))
+    with pytest.raises(AttributeError):
+        pdfsplitter.tidak_ada
+
+
+def test_cli_json_summary_in_copy_mode(tmp_path, capsys):
+    source = make_source(tmp_path)
+    destination = tmp_path / "tujuan"
+    code = main([str(source), str(destination), "--limit", "1", "--mode", "copy", "--json"])
+    summary = json.loads(capsys.readouterr().out)
+    assert code == 0
+    assert summary["success"]
+    assert sum(summary["folders"].values()) == 6 * 400 * 1024
+    assert all(size <= 1024 * 1024 for size in summary["folders"].values())
+    assert len(os.listdir(source)) == 6
+
+
+def test_cli_rejects_invalid_arguments(tmp_path):
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(tmp_path), str(tmp_path / "tujuan"), "--limit", "0"])
+    assert excinfo.value.code == 2
+    with pytest.raises(SystemExit):
+        main([str(tmp_path), str(tmp_path / "tujuan"), "--watch", "--mode", "copy"])
+
+
+def test_core_reports_failure_without_raising(tmp_path):
+    logs = []
+    success, message, sizes = PdfSplitter(str(tmp_path / "tidak_ada"), str(tmp_path / "tujuan"), 1,
+                                          on_log=logs.append).run()
+    assert not success
+    assert message
+    assert sizes == {}
+    assert main([str(tmp_path / "tidak_ada"), str(tmp_path / "tujuan"), "-q"]) == 1
@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+import pdfsplitter.dedup as dedup
+from pdfsplitter.core import PdfSplitter
+from pdfsplitter.dedup import REPORT_FILE_NAME, find_duplicates
+
+MB = 1024 * 1024
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return (str(path), len(data))
+
+
+def test_stages_only_read_files_that_still_collide(tmp_path, monkeypatch):
+    block = 16
+    same = b"a" * 100
+    files = [
+        write(tmp_path / "a1.pdf", same),
+        write(tmp_path / "a2.pdf", same),
+        write(tmp_path / "unik.pdf", b"u" * 77),  # Ukuran unik: tidak pernah dibaca
+        # Awal dan akhir sama, tengah berbeda: hanya hash penuh yang membedakan.
+        write(tmp_path / "t1.pdf", b"h" * block + b"1" * 68 + b"t" * block),
+        write(tmp_path / "t2.pdf", b"h" * block + b"2" * 68 + b"t" * block),
+        write(tmp_path / "kecil1.pdf", b"k" * 20),
+        write(tmp_path / "kecil2.pdf", b"k" * 20),
+    ]
+    partial_reads = []
+    real_partial = dedup.partial_hash
+
+    def counting_partial(path, *args):
+        partial_reads.append(os.path.basename(path))
+        return real_partial(path, *args)
+
+    monkeypatch.setattr(dedup, "partial_hash", counting_partial)
+    groups = find_duplicates(files, workers=2, block_size=block)
+    assert "unik.pdf" not in partial_reads
+    assert [[os.path.basename(p) for p in paths] for _, _, paths in groups] == [
+        ["a1.pdf", "a2.pdf"], ["kecil1.pdf", "kecil2.pdf"]]
+
+
+def make_duplicates(tmp_path, copies=3, size=int(0.86 * MB)):
+    source = tmp_path / "sumber"
+    data = os.urandom(size)
+    for i in range(copies):
+        write(source / f"d{i}" / f"salinan{i}.pdf", data)
+    write(source / "lain.pdf", os.urandom(100 * 1024))
+    return source
+
+
+def logical_sizes(destination):
+    return {folder.name: sum(path.stat().st_size for path in folder.iterdir())
+            for folder in destination.glob("output_*")}
+
+
+@pytest.mark.parametrize("mode", ["keep", "skip", "hardlink"])
+def test_dedup_modes(tmp_path, mode):
+    source = make_duplicates(tmp_path)
+    destination = tmp_path / "tujuan"
+    success, _, sizes = PdfSplitter(str(source), str(destination), 1, dedup=mode).run()
+    assert success
+    report = json.loads((destination / REPORT_FILE_NAME).read_text(encoding="utf-8"))
+    assert report["duplicate_files"] == 2
+    placed = sorted(path.name for folder in destination.glob("output_*") for path in folder.iterdir())
+    left = sorted(path.name for path in source.rglob("*.pdf"))
+    if mode == "skip":
+        assert placed == ["lain.pdf", "salinan0.pdf"]
+        assert left == ["salinan1.pdf", "salinan2.pdf"]
+    else:
+        assert placed == ["lain.pdf", "salinan0.pdf", "salinan1.pdf", "salinan2.pdf"]
+        assert left == []
+    # Ukuran logis setiap folder di disk (hardlink dihitung penuh) tidak melebihi batas.
+    assert logical_sizes(destination) == sizes
+    assert all(size <= MB for size in sizes.values())
+
+
+def test_hardlinks_share_the_canonical_inode(tmp_path):
+    source = make_duplicates(tmp_path)
+    destination = tmp_path / "tujuan"
+    PdfSplitter(str(source), str(destination), 1, dedup="hardlink", mode="copy").run()
+    inodes = {path.stat().st_ino for path in destination.rglob("salinan*.pdf")}
+    assert len(inodes) == 1
+    assert len(list(source.rglob("*.pdf"))) == 4
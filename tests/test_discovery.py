@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from pdfsplitter.discovery import discover
+
+
+def touch(path, size=1):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+def found(root, **kwargs):
+    return sorted(os.path.relpath(path, root).replace(os.sep, "/") for path, _ in discover(str(root), **kwargs))
+
+
+def test_parallel_walk_finds_every_pdf_with_size(tmp_path):
+    expected = {}
+    for d in range(20):
+        for f in range(15):
+            path = tmp_path / f"d{d % 4}" / f"sub{d}" / f"f{f}.pdf"
+            touch(path, d + f)
+            expected[str(path)] = d + f
+    touch(tmp_path / "catatan.txt")
+    for workers in (1, 8):
+        assert dict(discover(str(tmp_path), workers=workers)) == expected
+
+
+def test_include_and_exclude_patterns(tmp_path):
+    touch(tmp_path / "a.PDF")
+    touch(tmp_path / "b.txt")
+    touch(tmp_path / "draf" / "c.pdf")
+    touch(tmp_path / "arsip" / "lama" / "d.pdf")
+    touch(tmp_path / "arsip" / "e.pdf")
+    assert found(tmp_path) == ["a.PDF", "arsip/e.pdf", "arsip/lama/d.pdf", "draf/c.pdf"]
+    assert found(tmp_path, include=("*.txt",)) == ["b.txt"]
+    # Pola tanpa "/" mencocokkan nama (juga memangkas direktori); dengan "/" mencocokkan path relatif.
+    assert found(tmp_path, exclude=("draf",)) == ["a.PDF", "arsip/e.pdf", "arsip/lama/d.pdf"]
+    assert found(tmp_path, exclude=("arsip/lama",)) == ["a.PDF", "arsip/e.pdf", "draf/c.pdf"]
+
+
+def test_unreadable_entries_are_reported(tmp_path, monkeypatch):
+    touch(tmp_path / "ok" / "a.pdf")
+    touch(tmp_path / "rusak" / "b.pdf")
+    real_scandir = os.scandir
+
+    def failing_scandir(path):
+        if os.path.basename(path) == "rusak":
+            raise PermissionError(13, "ditolak", path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", failing_scandir)
+    errors = []
+    files = [path for path, _ in discover(str(tmp_path), on_error=lambda path, e: errors.append(path))]
+    assert files == [str(tmp_path / "ok" / "a.pdf")]
+    assert errors == [str(tmp_path / "rusak")]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlink tidak tersedia")
+def test_symlink_loops_are_visited_once(tmp_path):
+    touch(tmp_path / "a" / "b" / "f.pdf")
+    os.symlink(tmp_path / "a", tmp_path / "a" / "b" / "kembali")
+    os.symlink(tmp_path, tmp_path / "a" / "akar")
+    assert found(tmp_path) == ["a/b/f.pdf"]
+    assert found(tmp_path, follow_symlinks=True) == ["a/b/f.pdf"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlink tidak tersedia")
+def test_directory_reached_by_two_symlinks_uses_smallest_path(tmp_path):
+    for d in range(30):
+        touch(tmp_path / "data" / f"d{d}" / "f.pdf")
+    source = tmp_path / "sumber"
+    source.mkdir()
+    os.symlink(tmp_path / "data", source / "b_link")
+    os.symlink(tmp_path / "data", source / "a_link")
+    os.symlink(tmp_path / "data" / "d7", source / "a_link_d7")
+    expected = sorted(f"a_link/d{d}/f.pdf" for d in range(30) if d != 7) + ["a_link_d7/f.pdf"]
+    for _ in range(5):
+        assert found(source, follow_symlinks=True, workers=8) == sorted(expected)
@@ -0,0 +1,26 @@
+import errno
+import os
+
+import pytest
+
+import pdfsplitter.fastcopy as fastcopy
+
+
+def test_copy_file_falls_back_and_preserves_content(tmp_path):
+    source = tmp_path / "a.pdf"
+    source.write_bytes(os.urandom(300000))
+    mechanism = fastcopy.copy_file(str(source), str(tmp_path / "b.pdf"), hardlink=False)
+    assert mechanism in dict(fastcopy._METHODS)
+    assert (tmp_path / "b.pdf").read_bytes() == source.read_bytes()
+
+
+def test_copy_file_raises_when_every_mechanism_fails(tmp_path, monkeypatch):
+    source = tmp_path / "a.pdf"
+    source.write_bytes(b"isi")
+
+    def unsupported(*args):
+        raise OSError(errno.EINVAL, "tidak didukung")
+
+    monkeypatch.setattr(fastcopy, "_METHODS", tuple((name, unsupported) for name, _ in fastcopy._METHODS))
+    with pytest.raises(OSError):
+        fastcopy.copy_file(str(source), str(tmp_path / "b.pdf"), hardlink=False)
@@ -0,0 +1,144 @@
+import os
+
+import pytest
+
+import pdfsplitter.core as core
+from pdfsplitter import journal
+from pdfsplitter.core import PdfSplitter
+from pdfsplitter.transfer import TransferJob
+from pdfsplitter.verify import hash_file
+
+
+def make_source(tmp_path, count=12, size=300 * 1024):
+    source = tmp_path / "sumber"
+    source.mkdir()
+    for i in range(count):
+        (source / f"f{i:02d}.pdf").write_bytes(bytes([i]) * (size + i))
+    return source
+
+
+def output_files(destination):
+    found = {}
+    for folder in sorted(os.listdir(destination)):
+        path = os.path.join(destination, folder)
+        if folder.startswith("output_") and os.path.isdir(path):
+            for name in os.listdir(path):
+                found[name] = folder
+    return found
+
+
+def test_plan_and_journal_round_trip(tmp_path):
+    jobs = [TransferJob(f"/s/{i}.pdf", f"/d/output_1/{i}.pdf", i * 10, "/d/output_1") for i in range(5)]
+    journal.save_plan(str(tmp_path), jobs, {"strategy": "bfd"})
+    settings, entries = journal.load_plan(str(tmp_path))
+    assert settings == {"strategy": "bfd"}
+    assert entries == [(j.source, j.destination, j.size, j.folder) for j in jobs]
+
+    run_journal = journal.Journal(str(tmp_path))
+    run_journal.record(0, "abc")
+    run_journal.record(3)
+    run_journal.close()
+    with open(journal.journal_path(str(tmp_path)), "a", encoding="utf-8") as f:
+        f.write('{"i": 4, "d"')  # Baris terakhir terpotong saat proses mati
+    assert journal.read_journal(str(tmp_path)) == {0: "abc", 3: None}
+
+    journal.clear(str(tmp_path))
+    assert not journal.has_plan(str(tmp_path))
+
+
+def test_new_plan_discards_old_journal(tmp_path):
+    journal.save_plan(str(tmp_path), [], {})
+    run_journal = journal.Journal(str(tmp_path))
+    run_journal.record(0)
+    run_journal.close()
+    journal.save_plan(str(tmp_path), [], {})
+    assert journal.read_journal(str(tmp_path)) == {}
+
+
+def test_failed_run_resumes_without_duplicates(tmp_path, monkeypatch):
+    source = make_source(tmp_path)
+    destination = tmp_path / "tujuan"
+    real_move = core.move_job
+
+    def flaky(job):
+        if job.source.endswith(("f03.pdf", "f07.pdf")):
+            raise OSError(5, "kegagalan simulasi")
+        return real_move(job)
+
+    monkeypatch.setattr(core, "move_job", flaky)
+    success, message, _ = PdfSplitter(str(source), str(destination), 1).run()
+    assert not success
+    assert message.startswith("2 file gagal")
+    assert journal.has_plan(str(destination))
+    assert sorted(os.listdir(source)) == ["f03.pdf", "f07.pdf"]
+
+    # Tanpa mode lanjutkan, run baru ditolak agar rencana lama tidak tertimpa.
+    success, _, _ = PdfSplitter(str(source), str(destination), 1).run()
+    assert not success
+
+    monkeypatch.setattr(core, "move_job", real_move)
+    success, _, sizes = PdfSplitter(str(source), str(destination), 1, resume=True).run()
+    assert success
+    assert os.listdir(source) == []
+    assert not journal.has_plan(str(destination))
+    assert sorted(output_files(destination)) == [f"f{i:02d}.pdf" for i in range(12)]
+    assert all(size <= 1024 * 1024 for size in sizes.values())
+
+
+def test_resume_reconciles_transfers_missing_from_journal(tmp_path, monkeypatch):
+    source = make_source(tmp_path, count=6)
+    destination = tmp_path / "tujuan"
+
+    def always_fail(job):
+        raise OSError(5, "mati")
+
+    monkeypatch.setattr(core, "move_job", always_fail)
+    PdfSplitter(str(source), str(destination), 1).run()
+    _, entries = journal.load_plan(str(destination))
+
+    # Proses "mati" setelah rename pertama selesai tetapi sebelum jurnal ditulis.
+    first_source, first_destination, _, _ = entries[0]
+    os.rename(first_source, first_destination)
+    monkeypatch.undo()
+
+    logs = []
+    success, _, _ = PdfSplitter(str(source), str(destination), 1, resume=True, on_log=logs.append).run()
+    assert success
+    assert any("ternyata sudah selesai" in line for line in logs)
+    assert len(output_files(destination)) == 6
+
+
+def test_reconciled_transfers_are_hashed_when_verifying(tmp_path, monkeypatch):
+    source = make_source(tmp_path, count=4)
+    destination = tmp_path / "tujuan"
+
+    def always_fail(*args):
+        raise OSError(5, "mati")
+
+    monkeypatch.setattr(core, "move_verified", always_fail)
+    assert not PdfSplitter(str(source), str(destination), 1, verify=True).run()[0]
+    _, entries = journal.load_plan(str(destination))
+    first_source, first_destination, _, _ = entries[0]
+    os.rename(first_source, first_destination)
+    monkeypatch.undo()
+
+    success, _, _ = PdfSplitter(str(source), str(destination), 1, resume=True, verify=True).run()
+    assert success
+    listed = {}
+    for manifest in destination.glob("output_*.blake2b"):
+        for line in manifest.read_text(encoding="utf-8").splitlines():
+            digest, name = line.split("  ")
+            listed[name] = digest
+    assert len(listed) == 4
+    relative = os.path.relpath(first_destination, destination).replace(os.sep, "/")
+    assert listed[relative] == hash_file(first_destination)
+
+
+@pytest.mark.parametrize("budget", [None, 1])
+def test_fresh_run_does_not_refill_existing_folders(tmp_path, budget):
+    source = make_source(tmp_path, count=4)
+    destination = tmp_path / "tujuan"
+    (destination / "output_1").mkdir(parents=True)
+    (destination / "output_1" / "lama.pdf").write_bytes(b"x" * (900 * 1024))
+    PdfSplitter(str(source), str(destination), 1, memory_budget_mb=budget).run()
+    assert os.listdir(destination / "output_1") == ["lama.pdf"]
@@ -0,0 +1,55 @@
+import threading
+
+from pdfsplitter.logsink import BufferedLogSink
+
+
+def test_drain_returns_lines_and_latest_status():
+    sink = BufferedLogSink()
+    sink.log("satu")
+    sink.status("memindai")
+    sink.progress(10)
+    sink.status("memindahkan")
+    sink.progress(55)
+    sink.log("dua")
+    assert sink.drain() == (["satu", "dua"], "memindahkan", 55)
+    assert sink.drain() == ([], None, None)
+
+
+def test_overflow_keeps_newest_lines_and_reports_dropped(tmp_path):
+    log_path = tmp_path / "run.log"
+    sink = BufferedLogSink(str(log_path), max_pending_lines=5)
+    for i in range(12):
+        sink.log(f"baris {i}")
+    lines, _, _ = sink.drain()
+    assert lines[0] == f"... 7 baris log dilewati (lihat {log_path}) ..."
+    assert lines[1:] == [f"baris {i}" for i in range(7, 12)]
+    sink.close()
+    # File log tetap lengkap walaupun antrean GUI terpotong.
+    assert log_path.read_text(encoding="utf-8").splitlines() == [f"baris {i}" for i in range(12)]
+
+
+def test_concurrent_writers_lose_no_lines():
+    sink = BufferedLogSink(max_pending_lines=100000)
+    drained = []
+    stop = threading.Event()
+
+    def drainer():
+        while not stop.is_set():
+            drained.extend(sink.drain()[0])
+
+    def writer(worker):
+        for i in range(2000):
+            sink.log(f"{worker}:{i}")
+            sink.progress(i)
+
+    reader = threading.Thread(target=drainer)
+    reader.start()
+    writers = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    reader.join()
+    drained.extend(sink.drain()[0])
+    assert sorted(drained) == sorted(f"{n}:{i}" for n in range(4) for i in range(2000))
@@ -0,0 +1,62 @@
+import json
+import pstats
+
+from pdfsplitter.core import PdfSplitter
+from pdfsplitter.metrics import LATENCY_BUCKETS, RunMetrics, to_prometheus
+
+
+def test_histogram_slowest_files_and_mechanisms():
+    metrics = RunMetrics(slowest_files=2)
+    for i, seconds in enumerate([0.0005, 0.02, 3.0, 100.0]):
+        metrics.record_transfer(f"f{i}.pdf", 10, seconds, "rename" if i % 2 else "copy")
+    metrics.record_failure()
+    data = metrics.as_dict()
+    assert data["files"] == 4 and data["bytes"] == 40 and data["failures"] == 1
+    assert data["mechanisms"] == {"copy": 2, "rename": 2}
+    counts = {bucket["le"]: bucket["count"] for bucket in data["latency_histogram"]}
+    assert counts[0.001] == 1
+    assert counts[0.025] == 2
+    assert counts[LATENCY_BUCKETS[-1]] == 3
+    assert counts["+Inf"] == 4
+    assert [entry["path"] for entry in data["slowest_files"]] == ["f3.pdf", "f2.pdf"]
+
+
+def test_prometheus_textfile_format():
+    metrics = RunMetrics()
+    with metrics.phase("transfer"):
+        metrics.record_transfer("a.pdf", 2048, 0.01, "rename")
+    text = to_prometheus(metrics.as_dict())
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            assert line.split()[1] in ("HELP", "TYPE")
+            continue
+        name, value = line.rsplit(" ", 1)
+        samples[name] = float(value)
+    assert samples["pdf_splitter_files"] == 1
+    assert samples["pdf_splitter_bytes"] == 2048
+    assert samples['pdf_splitter_transfers_total{mechanism="rename"}'] == 1
+    assert samples['pdf_splitter_transfer_seconds_bucket{le="+Inf"}'] == 1
+    assert samples["pdf_splitter_transfer_seconds_count"] == 1
+    assert 'pdf_splitter_phase_seconds{phase="transfer"}' in samples
+
+
+def test_run_writes_metrics_and_profile(tmp_path):
+    source = tmp_path / "sumber"
+    source.mkdir()
+    for i in range(5):
+        (source / f"f{i}.pdf").write_bytes(b"x" * (300 * 1024))
+    published = []
+    success, _, _ = PdfSplitter(
+        str(source), str(tmp_path / "tujuan"), 1,
+        metrics_json=str(tmp_path / "m.json"), metrics_prom=str(tmp_path / "m.prom"),
+        profile_path=str(tmp_path / "run.prof"), on_metrics=published.append,
+    ).run()
+    assert success
+    data = json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))
+    assert data["files"] == 5
+    assert data["bytes"] == 5 * 300 * 1024
+    assert {"discovery", "planning", "transfer"} <= set(data["phases"])
+    assert published and published[0]["files"] == 5
+    assert "pdf_splitter_files 5" in (tmp_path / "m.prom").read_text(encoding="utf-8")
+    assert pstats.Stats(str(tmp_path / "run.prof")).total_calls > 0
@@ -0,0 +1,177 @@
+import itertools
+import random
+
+import pytest
+
+from pdfsplitter.packing import (STRATEGIES, _MaxSegmentTree, _SortedCapacities, _sorted_decreasing, assign,
+                                 eliminate_bins, lower_bound, pack)
+
+LIMIT = 1000
+
+
+def random_items(rng, count, low=1, high=LIMIT):
+    return [(f"/sumber/d{rng.randrange(5)}/f{i}.pdf", rng.randint(low, high)) for i in range(count)]
+
+
+def assert_valid(bins, items, limit):
+    placed = sorted(item for folder in bins for item in folder)
+    assert placed == sorted(items), "setiap item harus ditempatkan tepat sekali"
+    for folder in bins:
+        assert folder, "tidak boleh ada bin kosong"
+        total = sum(size for _, size in folder)
+        if total > limit:
+            assert len(folder) == 1, "hanya item oversize yang boleh melebihi batas, sendirian"
+
+
+# Implementasi acuan O(n^2) tanpa struktur data khusus.
+
+def naive_first_fit(items, limit):
+    bins, remaining = [], []
+    for item in _sorted_decreasing(items):
+        size = item[1]
+        for i, left in enumerate(remaining):
+            if size <= limit and left >= size:
+                bins[i].append(item)
+                remaining[i] -= size
+                break
+        else:
+            bins.append([item])
+            remaining.append(limit - size if size <= limit else -1)
+    return bins
+
+
+def naive_best_fit(items, limit):
+    bins, remaining = [], []
+    for item in _sorted_decreasing(items):
+        size = item[1]
+        fits = [(left, i) for i, left in enumerate(remaining) if size <= limit and left >= size]
+        if fits:
+            _, i = min(fits)
+            bins[i].append(item)
+            remaining[i] -= size
+        else:
+            bins.append([item])
+            remaining.append(limit - size)
+    return bins
+
+
+def optimum(items, limit):
+    # Jumlah bin minimum lewat pencarian menyeluruh (hanya untuk input kecil).
+    sizes = sorted((size for _, size in items), reverse=True)
+    for count in range(1, len(sizes) + 1):
+        for assignment in itertools.product(range(count), repeat=len(sizes)):
+            loads = [0] * count
+            for size, target in zip(sizes, assignment):
+                loads[target] += size
+            if max(loads) <= limit:
+                return count
+    return len(sizes)
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+@pytest.mark.parametrize("seed", range(20))
+def test_strategies_respect_limit(strategy, seed):
+    rng = random.Random(seed)
+    items = random_items(rng, rng.randint(1, 300), high=LIMIT + 200)
+    bins = pack(items, LIMIT, strategy)
+    assert_valid(bins, items, LIMIT)
+    assert len(bins) >= lower_bound(items, LIMIT)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_ffd_bfd_match_naive_reference(seed):
+    rng = random.Random(seed)
+    items = random_items(rng, rng.randint(1, 200), high=LIMIT + 50)
+    assert pack(items, LIMIT, "ffd") == naive_first_fit(items, LIMIT)
+    assert pack(items, LIMIT, "bfd") == naive_best_fit(items, LIMIT)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_small_inputs_against_brute_force_optimum(seed):
+    rng = random.Random(seed)
+    items = random_items(rng, rng.randint(1, 7), low=100)
+    best = optimum(items, LIMIT)
+    for strategy in STRATEGIES:
+        count = len(pack(items, LIMIT, strategy))
+        # Jaminan FFD/BFD: paling banyak 11/9 OPT + 6/9 bin.
+        assert best <= count <= 11 * best / 9 + 6 / 9
+
+
+@pytest.mark.parametrize("strategy", ["ffd", "bfd"])
+def test_assign_streams_same_plan_as_pack(strategy):
+    rng = random.Random(7)
+    items = random_items(rng, 500, high=LIMIT + 100)
+    bins = []
+    for item, bin_id in assign(_sorted_decreasing(items), LIMIT, strategy):
+        if bin_id == len(bins):
+            bins.append([])
+        bins[bin_id].append(item)
+    assert bins == pack(items, LIMIT, strategy)
+
+
+def test_plan_independent_of_input_order():
+    rng = random.Random(3)
+    items = [(f"/s/d{i % 7}/f{i}.pdf", rng.choice([10, 100, 250])) for i in range(300)]
+    expected = pack(items, LIMIT, "bfd")
+    for _ in range(5):
+        rng.shuffle(items)
+        assert pack(items, LIMIT, "bfd") == expected
+
+
+def test_oversize_items_get_their_own_bin():
+    items = [("a", 5000), ("b", 10), ("c", 990)]
+    bins = pack(items, LIMIT, "bfd")
+    assert [("a", 5000)] in bins
+    assert lower_bound(items, LIMIT) == 2
+
+
+def test_eliminate_bins_empties_spreadable_bin():
+    bins = [[("a", 600)], [("b", 600)], [("c", 300), ("d", 100)]]
+    result = eliminate_bins([list(b) for b in bins], LIMIT)
+    assert sum(1 for b in result if b) == 2
+    assert_valid([b for b in result if b], [item for b in bins for item in b], LIMIT)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_refine_never_worse_than_bfd(seed):
+    rng = random.Random(seed)
+    items = random_items(rng, 400, high=600)
+    assert len(pack(items, LIMIT, "refine")) <= len(pack(items, LIMIT, "bfd"))
+
+
+def test_sorted_capacities_matches_sorted_list():
+    rng = random.Random(11)
+    capacities = _SortedCapacities()
+    reference = []
+    # Cukup banyak kunci agar bucket terbelah (_BUCKET_LOAD) dan dihapus lagi.
+    for step in range(5000):
+        if reference and rng.random() < 0.4:
+            key = reference.pop(rng.randrange(len(reference)))
+            capacities.remove(key)
+        else:
+            key = (rng.randrange(2000), step)
+            reference.append(key)
+            capacities.add(key)
+        assert len(capacities) == len(reference)
+        probe = (rng.randrange(2100), -1)
+        expected = min((k for k in reference if k >= probe), default=None)
+        assert capacities.ceiling(probe) == expected
+
+
+def test_segment_tree_find_first_and_grow():
+    rng = random.Random(5)
+    tree = _MaxSegmentTree(3)
+    values = []
+    for step in range(300):
+        if step == len(tree):
+            tree.grow()
+        value = rng.randrange(100)
+        tree.update(step, value)
+        values.append(value)
+        probe = rng.randrange(110)
+        expected = next((i for i, v in enumerate(values) if v >= probe), -1)
+        assert tree.find_first(probe) == expected
+        assert tree.get(step) == value
+        end = rng.randrange(len(values))
+        expected = max((i for i, v in enumerate(values[:end + 1]) if v >= probe), default=-1)
+        assert tree.find_last(probe, end) == expected
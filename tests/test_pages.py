@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+from pdfsplitter.core import PdfSplitter
+from pdfsplitter.packing import _dominant_share, lower_bound_limits, pack, pack_limits
+from pdfsplitter.pages import PageCache, page_count, scan_pages
+from pdfsplitter.pdfdoc import PdfDocument, PdfError
+
+LIMIT = 1000
+XREF_KINDS = ["classic", "stream"]
+
+
+@pytest.mark.parametrize("xref", XREF_KINDS)
+def test_page_count_matches_page_tree(make_pdf, xref):
+    path = make_pdf("doc.pdf", 7, xref=xref)
+    assert page_count(path) == 7
+
+
+def test_encrypted_document_only_opens_for_structure(make_pdf):
+    path = make_pdf("rahasia.pdf", 4)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data.replace(b"trailer\n<</Size", b"trailer\n<</Encrypt 3 0 R /Size"))
+    with pytest.raises(PdfError):
+        PdfDocument(path)
+    assert page_count(path) == 4
+
+
+def test_page_count_falls_back_when_xref_is_broken(make_pdf):
+    path = make_pdf("rusak.pdf", 5)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:data.rindex(b"startxref")])
+    assert page_count(path) == 5
+
+
+def test_scan_pages_uses_cache_and_reports_errors(make_pdf, tmp_path):
+    paths = [make_pdf(f"f{i}.pdf", i + 1, xref=XREF_KINDS[i % 2]) for i in range(4)]
+    broken = tmp_path / "bukan.pdf"
+    broken.write_bytes(b"%PDF-1.4\nbukan pdf")
+    errors = []
+    cache = PageCache(str(tmp_path / "cache.json"))
+    pages, hits = scan_pages(paths + [str(broken)], cache=cache, on_error=lambda p, e: errors.append(p))
+    assert pages == {path: i + 1 for i, path in enumerate(paths)}
+    assert hits == 0
+    assert errors == [str(broken)]
+    cache.save()
+
+    pages_again, hits = scan_pages(paths, cache=PageCache(str(tmp_path / "cache.json")))
+    assert pages_again == pages
+    assert hits == len(paths)
+
+
+@pytest.mark.parametrize("limits", [(LIMIT, 30, None), (LIMIT, None, 4), (LIMIT, 20, 3), (LIMIT, None, None)])
+@pytest.mark.parametrize("seed", range(10))
+def test_pack_limits_respects_every_dimension(limits, seed):
+    rng = random.Random(seed)
+    items = [(f"f{i}", rng.randint(0, LIMIT + 100), rng.choice([1, 2, 5, 40])) for i in range(300)]
+    bins = pack_limits(items, limits)
+    size_limit, page_limit, file_limit = limits
+    assert sorted(item for b in bins for item in b) == sorted(items)
+    for folder in bins:
+        if len(folder) == 1:
+            continue
+        assert sum(item[1] for item in folder) <= size_limit
+        assert page_limit is None or sum(item[2] for item in folder) <= page_limit
+        assert file_limit is None or len(folder) <= file_limit
+    assert len(bins) >= lower_bound_limits(items, limits)
+
+
+def test_pack_limits_without_extra_limits_is_close_to_bfd():
+    rng = random.Random(2)
+    items = [(f"f{i}", rng.randint(1, LIMIT), 1) for i in range(500)]
+    bins = pack_limits(items, (LIMIT, None, None))
+    assert len(bins) <= len(pack([(p, s) for p, s, _ in items], LIMIT, "bfd")) + 1
+
+
+def naive_first_fit_limits(items, limits):
+    # First-fit decreasing multi-dimensi O(n^2) dengan pemeriksaan setiap dimensi.
+    size_limit, page_limit, file_limit = limits
+    bins, remaining = [], []
+    for item in sorted(items, key=lambda item: (-_dominant_share(item, limits), item[0])):
+        _, size, pages = item
+        pages = pages if page_limit else 0
+        for i, left in enumerate(remaining):
+            if left and left[0] >= size and left[1] >= pages and left[2] >= 1:
+                bins[i].append(item)
+                left[0] -= size
+                left[1] -= pages
+                left[2] -= 1
+                break
+        else:
+            bins.append([item])
+            fits = size <= size_limit and pages <= (page_limit or 0)
+            remaining.append([size_limit - size, (page_limit or 0) - pages, (file_limit or len(items)) - 1]
+                             if fits else None)
+    return bins
+
+
+@pytest.mark.parametrize("workload", ["campuran", "berkorelasi", "berlawanan", "kecil_banyak_file"])
+@pytest.mark.parametrize("seed", range(3))
+def test_pack_limits_matches_first_fit_bin_count(workload, seed):
+    rng = random.Random(seed)
+    limits = (LIMIT, 1000, None)
+    items = []
+    for i in range(1500):
+        size = rng.randint(1, LIMIT // 3)
+        if workload == "campuran":
+            pages = rng.randint(1, 300)
+        elif workload == "berkorelasi":
+            pages = max(1, size * 3 // 2 + rng.randint(-40, 40))
+        elif workload == "berlawanan":
+            pages = max(1, 340 - size + rng.randint(0, 20))
+        else:
+            size = rng.randint(1, LIMIT // 20)
+            pages = rng.randint(1, 60)
+            limits = (LIMIT, 200, 25)
+        items.append((f"f{i}", size, pages))
+    bins = len(pack_limits(items, limits))
+    reference = len(naive_first_fit_limits(items, limits))
+    assert lower_bound_limits(items, limits) <= bins <= reference * 1.02 + 1
+
+
+def test_run_respects_max_pages_and_max_files(make_pdf, tmp_path):
+    for i in range(10):
+        make_pdf(f"f{i}.pdf", i % 4 + 1, folder="sumber")
+    destination = tmp_path / "tujuan"
+    success, _, _ = PdfSplitter(str(tmp_path / "sumber"), str(destination), 100, max_pages=6, max_files=3).run()
+    assert success
+    placed = 0
+    for folder in destination.glob("output_*"):
+        files = [str(path) for path in folder.iterdir()]
+        assert len(files) <= 3
+        assert sum(page_count(path) for path in files) <= 6
+        placed += len(files)
+    assert placed == 10
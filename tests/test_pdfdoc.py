@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from pdfsplitter.core import PdfSplitter
+from pdfsplitter.oversize import split_pdf
+from pdfsplitter.pdfdoc import PdfDocument, PdfError
+
+XREF_KINDS = ["classic", "stream"]
+
+
+@pytest.mark.parametrize("xref", XREF_KINDS)
+def test_page_count_and_page_tree(make_pdf, xref):
+    path = make_pdf("doc.pdf", 7, xref=xref)
+    with PdfDocument(path) as doc:
+        assert doc.page_count() == 7
+        _, pages = doc.pages()
+        assert len(pages) == 7
+        assert all(page[b"Type"] == b"Page" for _, _, page in pages)
+
+
+@pytest.mark.parametrize("xref", XREF_KINDS)
+def test_split_pdf_parts_within_limit_and_readable(make_pdf, tmp_path, xref):
+    path = make_pdf("besar.pdf", 12, image_size=20000, xref=xref)
+    limit = 70000
+    assert os.path.getsize(path) > limit
+    out = tmp_path / "parts"
+    out.mkdir()
+    parts = split_pdf(path, limit, str(out))
+    assert len(parts) > 1
+    total_pages = 0
+    for part_path, part_size in parts:
+        assert part_size == os.path.getsize(part_path)
+        assert part_size <= limit
+        with PdfDocument(part_path) as doc:
+            count = doc.page_count()
+            assert count == len(doc.pages()[1])
+        total_pages += count
+    assert total_pages == 12
+
+
+def test_split_single_page_document_is_rejected(make_pdf, tmp_path):
+    path = make_pdf("satu.pdf", 1, image_size=50000)
+    with pytest.raises(PdfError):
+        split_pdf(path, 10000, str(tmp_path))
+
+
+def test_split_keeps_oversized_single_page_as_one_part(make_pdf, tmp_path):
+    path = make_pdf("halaman_besar.pdf", 3, image_size=40000)
+    out = tmp_path / "parts"
+    out.mkdir()
+    parts = split_pdf(path, 20000, str(out))
+    assert len(parts) == 3  # Setiap halaman sudah melebihi batas sendirian
+
+
+@pytest.mark.parametrize("mode", ["move", "copy"])
+def test_run_splits_oversized_pdf_and_handles_original(make_pdf, tmp_path, mode):
+    path = make_pdf("besar.pdf", 12, image_size=150000, folder="sumber")
+    assert os.path.getsize(path) > 1024 * 1024
+    destination = tmp_path / "tujuan"
+    success, _, sizes = PdfSplitter(str(tmp_path / "sumber"), str(destination), 1, mode=mode).run()
+    assert success
+    assert all(size <= 1024 * 1024 for size in sizes.values())
+    pages = 0
+    for folder in destination.glob("output_*"):
+        for part in folder.iterdir():
+            with PdfDocument(str(part)) as doc:
+                pages += doc.page_count()
+    assert pages == 12
+    # Mode move menghapus aslinya setelah semua bagian dipindahkan; mode copy membiarkannya.
+    assert os.path.exists(path) == (mode == "copy")
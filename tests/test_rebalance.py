@@ -0,0 +1,67 @@
+import os
+import random
+
+from pdfsplitter.rebalance import Rebalancer, list_output_folders, plan_rebalance
+
+LIMIT = 1000
+MB = 1024 * 1024
+
+
+def moved_items(folders, bins):
+    moved = []
+    for bin_id, items in enumerate(bins):
+        origin = folders[bin_id][1] if bin_id < len(folders) else None
+        moved.extend(item for item in items if os.path.dirname(item[0]) != origin)
+    return moved
+
+
+def make_folders(spec):
+    return [(i + 1, f"/t/output_{i + 1}", [(f"/t/output_{i + 1}/f{j}.pdf", size) for j, size in enumerate(sizes)])
+            for i, sizes in enumerate(spec)]
+
+
+def test_folders_within_limit_are_left_alone():
+    folders = make_folders([[400, 300], [900], [50, 50, 50]])
+    bins = plan_rebalance(folders, LIMIT, consolidate=False)
+    assert moved_items(folders, bins) == []
+
+
+def test_only_overflow_is_moved_into_existing_gaps():
+    folders = make_folders([[600, 300, 200], [100]])
+    bins = plan_rebalance(folders, LIMIT)
+    assert moved_items(folders, bins) == [("/t/output_1/f2.pdf", 200)]
+    assert [sum(size for _, size in b) for b in bins] == [900, 300]
+
+
+def test_random_plans_respect_limit_and_move_only_evicted_files():
+    rng = random.Random(9)
+    for _ in range(20):
+        spec = [[rng.randint(1, 800) for _ in range(rng.randint(1, 8))] for _ in range(rng.randint(1, 10))]
+        folders = make_folders(spec)
+        bins = plan_rebalance(folders, LIMIT, consolidate=False)
+        assert sorted(item for b in bins for item in b) == sorted(item for f in folders for item in f[2])
+        assert all(sum(size for _, size in b) <= LIMIT for b in bins)
+        # Tanpa konsolidasi sebuah file hanya dipindah jika tidak muat lagi di folder asalnya.
+        stayed = {path: sum(size for item_path, size in bins[i] if os.path.dirname(item_path) == path)
+                  for i, (_, path, _) in enumerate(folders)}
+        for path, size in moved_items(folders, bins):
+            assert stayed[os.path.dirname(path)] + size > LIMIT
+
+
+def test_rebalancer_shrinks_limit_and_renumbers(tmp_path):
+    for folder, sizes in (("output_1", [600, 500, 400]), ("output_3", [300])):
+        (tmp_path / folder).mkdir()
+        for i, kb in enumerate(sizes):
+            (tmp_path / folder / f"{folder}_{i}.pdf").write_bytes(b"x" * (kb * 1024))
+    inode_before = os.stat(tmp_path / "output_1" / "output_1_0.pdf").st_ino
+    success, _, sizes = Rebalancer(str(tmp_path), 1).run()
+    assert success
+    folders = list_output_folders(str(tmp_path))
+    assert [index for index, _ in folders] == list(range(1, len(folders) + 1))
+    on_disk = {os.path.basename(path): sum(os.path.getsize(os.path.join(path, n)) for n in os.listdir(path))
+               for _, path in folders}
+    assert on_disk == sizes
+    assert all(size <= MB for size in on_disk.values())
+    assert sum(on_disk.values()) == 1800 * 1024
+    # File terbesar tetap di folder asalnya.
+    assert os.stat(tmp_path / "output_1" / "output_1_0.pdf").st_ino == inode_before
@@ -0,0 +1,105 @@
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from pdfsplitter.core import PdfSplitter
+from pdfsplitter.spill import _PATH_CACHE_SIZE, DirectoryTable, ExternalSorter
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_directory_table_round_trip():
+    table = DirectoryTable()
+    directories = ["/data/arsip/2023", "/data/arsip/2024", "/data/lain", "/data/arsip/2023/sub", "relatif/a"]
+    ids = [table.intern(d) for d in directories]
+    assert [table.path(i) for i in ids] == directories
+    assert table.intern("/data/arsip/2023") == ids[0]
+    assert len(table) < sum(d.count("/") + 1 for d in directories)  # Prefiks bersama disimpan sekali
+
+
+def test_directory_table_path_cache_is_bounded():
+    table = DirectoryTable()
+    ids = [table.intern(f"/data/arsip/klien_{i}") for i in range(_PATH_CACHE_SIZE * 3)]
+    assert [table.path(i) for i in ids] == [f"/data/arsip/klien_{i}" for i in range(_PATH_CACHE_SIZE * 3)]
+    assert len(table._paths) == _PATH_CACHE_SIZE
+
+
+def test_external_sort_with_spills_matches_sorted(tmp_path):
+    rng = random.Random(4)
+    records = [(rng.randrange(50), rng.randrange(1000), i, 0, f"nama_{i}_ü.pdf") for i in range(3000)]
+    key = lambda record: (-record[0], record[4])  # noqa: E731
+    sorter = ExternalSorter(key, 20000, str(tmp_path))
+    for record in records:
+        sorter.add(*record)
+    assert sorter.runs, "anggaran kecil harus memaksa spill ke disk"
+    expected = sorted(records, key=key)
+    assert list(sorter) == expected
+    assert list(sorter) == expected  # Bisa diiterasi berkali-kali
+    sorter.close()
+    assert not [name for name in os.listdir(tmp_path) if name.startswith("run_")]
+
+
+def test_external_sort_in_memory(tmp_path):
+    sorter = ExternalSorter(lambda record: record[4], 10 ** 9, str(tmp_path))
+    for name in ["c", "a", "b"]:
+        sorter.add(0, 0, 0, 0, name)
+    assert [record[4] for record in sorter] == ["a", "b", "c"]
+    assert not sorter.runs
+
+
+def layout(destination):
+    return {folder.name: sorted(p.name for p in folder.iterdir()) for folder in destination.glob("output_*")}
+
+
+def test_bounded_plan_matches_in_memory_plan(tmp_path):
+    rng = random.Random(6)
+    source = tmp_path / "sumber"
+    for i in range(60):
+        folder = source / f"d{i % 5}" / f"s{i % 3}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"f{i}.pdf").write_bytes(bytes([i]) * rng.choice([50, 200, 300]) * 1024)
+    results = []
+    for budget in (None, 1):
+        destination = tmp_path / f"tujuan_{budget}"
+        success, _, sizes = PdfSplitter(str(source), str(destination), 1, mode="copy",
+                                        memory_budget_mb=budget).run()
+        assert success
+        results.append((layout(destination), sizes))
+    assert results[0] == results[1]
+
+
+PEAK_RSS_SCRIPT = """
+import sys
+from pdfsplitter.core import PdfSplitter
+files, per_directory, destination = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+prefix = "/data/" + "arsip_dengan_nama_panjang/" * 6
+splitter = PdfSplitter(destination, destination, 1, memory_budget_mb=4)
+splitter._iter_discover = lambda: ((f"{prefix}klien_{i // per_directory}/dok_{i}.pdf", 1000 + i % 5000)
+                                   for i in range(files))
+splitter._plan_bounded()
+# VmHWM milik proses ini saja; ru_maxrss ikut mewarisi puncak proses induk (pytest).
+with open("/proc/self/status") as status:
+    print(next(line.split()[1] for line in status if line.startswith("VmHWM:")))
+"""
+
+
+def peak_rss_kb(tmp_path, files, per_directory):
+    destination = tmp_path / f"tujuan_{per_directory}"
+    destination.mkdir()
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+    result = subprocess.run([sys.executable, "-c", PEAK_RSS_SCRIPT, str(files), str(per_directory), str(destination)],
+                            capture_output=True, text=True, env=env, check=True)
+    return int(result.stdout.split()[-1])
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="butuh /proc (Linux)")
+def test_bounded_plan_memory_does_not_keep_full_paths_per_directory(tmp_path):
+    files = 40000
+    few = peak_rss_kb(tmp_path, files, per_directory=1000)
+    many = peak_rss_kb(tmp_path, files, per_directory=1)
+    # Per direktori hanya nama yang di-intern (~250 byte); path lengkap
+    # (~200 karakter di sini) tidak boleh ikut tersimpan untuk setiap direktori.
+    assert (many - few) * 1024 / files < 350
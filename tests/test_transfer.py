@@ -0,0 +1,90 @@
+import threading
+import time
+
+from pdfsplitter.ledger import Ledger
+from pdfsplitter.transfer import TransferExecutor, TransferJob, unique_name
+
+
+def make_jobs(tmp_path, count):
+    source = tmp_path / "sumber"
+    destination = tmp_path / "tujuan"
+    source.mkdir()
+    destination.mkdir()
+    jobs = []
+    for i in range(count):
+        (source / f"f{i}.pdf").write_bytes(b"x" * (i + 1))
+        jobs.append(TransferJob(str(source / f"f{i}.pdf"), str(destination / f"f{i}.pdf"), i + 1, str(destination)))
+    return jobs
+
+
+def test_executor_moves_every_job_and_reports_errors(tmp_path):
+    jobs = make_jobs(tmp_path, 40)
+
+    def transfer(job):
+        if job.size % 10 == 0:
+            raise OSError(5, "kegagalan simulasi")
+        return "uji"
+
+    results = list(TransferExecutor(4, transfer=transfer).run(jobs))
+    assert sorted(job.size for job, _ in results) == list(range(1, 41))
+    failed = sorted(job.size for job, error in results if error is not None)
+    assert failed == [10, 20, 30, 40]
+    assert all(job.mechanism == "uji" for job, error in results if error is None)
+
+
+def test_executor_respects_device_worker_limit(tmp_path):
+    jobs = make_jobs(tmp_path, 30)
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+
+    def transfer(job):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.005)
+        with lock:
+            active[0] -= 1
+        return "uji"
+
+    executor = TransferExecutor(8, {str(tmp_path): 2}, transfer=transfer)
+    assert len(list(executor.run(jobs))) == 30
+    assert peak[0] <= 2
+
+
+def test_executor_bounds_jobs_in_flight(tmp_path):
+    jobs = make_jobs(tmp_path, 50)
+    submitted = [0]
+
+    def generate():
+        for job in jobs:
+            submitted[0] += 1
+            yield job
+
+    results = TransferExecutor(2, transfer=lambda job: "uji").run(generate())
+    next(results)
+    # Antrean tidak boleh menelan seluruh rencana sebelum hasil diambil.
+    assert submitted[0] <= 2 * 2
+    results.close()
+
+
+def test_ledger_totals_under_concurrent_records():
+    ledger = Ledger()
+
+    def record(worker):
+        for i in range(1000):
+            ledger.record(f"/tujuan/output_{i % 3 + 1}", f"w{worker}_{i}.pdf", 2)
+
+    threads = [threading.Thread(target=record, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sizes = ledger.folder_sizes()
+    assert sum(sizes.values()) == 8 * 1000 * 2
+    assert sizes["output_1"] == 8 * 334 * 2
+
+
+def test_unique_name_appends_counter():
+    assert unique_name(set(), "a.pdf") == "a.pdf"
+    assert unique_name({"a.pdf", "a (2).pdf"}, "a.pdf") == "a (3).pdf"
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+import pdfsplitter.verify as verify
+from pdfsplitter.core import PdfSplitter
+from pdfsplitter.verify import VerificationError, copy_verified, hash_file, move_verified
+
+
+@pytest.mark.parametrize("paranoid", [False, True])
+def test_verified_transfers_return_source_digest(tmp_path, paranoid):
+    source = tmp_path / "a.pdf"
+    source.write_bytes(os.urandom(100000))
+    expected = hash_file(str(source))
+    mechanism, digest = copy_verified(str(source), str(tmp_path / "b.pdf"), hardlink=False, paranoid=paranoid)
+    assert (mechanism, digest) == ("buffered", expected)
+    _, digest = move_verified(str(source), str(tmp_path / "c.pdf"), paranoid=paranoid)
+    assert digest == expected
+    assert not source.exists()
+
+
+def test_paranoid_detects_corrupted_destination(tmp_path, monkeypatch):
+    source = tmp_path / "a.pdf"
+    source.write_bytes(b"isi asli")
+    real_copy = verify.copy_and_hash
+
+    def corrupting_copy(src, dst, *args):
+        digest = real_copy(src, dst, *args)
+        with open(dst, "ab") as f:
+            f.write(b"rusak")
+        return digest
+
+    monkeypatch.setattr(verify, "copy_and_hash", corrupting_copy)
+    with pytest.raises(VerificationError):
+        copy_verified(str(source), str(tmp_path / "b.pdf"), hardlink=False, paranoid=True)
+    assert not (tmp_path / "b.pdf").exists()
+
+
+def test_verified_run_writes_checkable_manifests(tmp_path):
+    source = tmp_path / "sumber"
+    source.mkdir()
+    for i in range(4):
+        (source / f"f{i}.pdf").write_bytes(os.urandom(400 * 1024))
+    destination = tmp_path / "tujuan"
+    success, _, _ = PdfSplitter(str(source), str(destination), 1, mode="copy", verify=True).run()
+    assert success
+    checked = 0
+    for manifest in sorted(destination.glob(f"output_*.{verify.DEFAULT_HASH_ALGORITHM}")):
+        for line in manifest.read_text(encoding="utf-8").splitlines():
+            digest, relative = line.split("  ", 1)
+            assert hash_file(str(destination / relative)) == digest
+            checked += 1
+    assert checked == 4
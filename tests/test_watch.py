@@ -0,0 +1,127 @@
+import os
+import time
+
+import pdfsplitter.watch as watch
+from pdfsplitter.options import PARTS_DIR_NAME
+from pdfsplitter.watch import BinState, WatchSplitter
+
+LIMIT = 1000
+MB = 1024 * 1024
+
+
+def fill(folder, name, size):
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / name).write_bytes(b"x" * size)
+
+
+def test_state_file_is_trusted_while_folders_are_unchanged(tmp_path):
+    fill(tmp_path / "output_1", "a.pdf", 600)
+    state = BinState(str(tmp_path), LIMIT)
+    assert state.load() == "scan"
+    state.save()
+
+    reloaded = BinState(str(tmp_path), LIMIT)
+    assert reloaded.load() == "file"
+    assert reloaded.used == {1: 600}
+    assert reloaded.open_folders == 1
+
+
+def test_state_is_rebuilt_after_outside_changes(tmp_path):
+    fill(tmp_path / "output_1", "a.pdf", 600)
+    state = BinState(str(tmp_path), LIMIT)
+    state.load()
+    state.save()
+
+    # Run batch menambah file dan folder baru tanpa memperbarui status.
+    fill(tmp_path / "output_1", "b.pdf", 300)
+    fill(tmp_path / "output_2", "c.pdf", 500)
+    reloaded = BinState(str(tmp_path), LIMIT)
+    assert reloaded.load() == "scan"
+    assert reloaded.used == {1: 900, 2: 500}
+
+
+def test_state_is_rebuilt_after_folders_are_renumbered(tmp_path):
+    fill(tmp_path / "output_1", "a.pdf", 100)
+    fill(tmp_path / "output_2", "b.pdf", 900)
+    state = BinState(str(tmp_path), LIMIT)
+    state.load()
+    state.save()
+
+    # Rebalancer merapatkan penomoran: output_1 dihapus, output_2 jadi output_1.
+    os.unlink(tmp_path / "output_1" / "a.pdf")
+    os.rmdir(tmp_path / "output_1")
+    os.rename(tmp_path / "output_2", tmp_path / "output_1")
+    reloaded = BinState(str(tmp_path), LIMIT)
+    assert reloaded.load() == "scan"
+    assert reloaded.used == {1: 900}
+
+
+def split_watcher(source, destination):
+    destination.mkdir(exist_ok=True)
+    watcher = WatchSplitter(str(source), str(destination), 1)
+    watcher.state.load()
+    return watcher
+
+
+def place(watcher, path):
+    stat = os.stat(path)
+    watcher._place(path, stat.st_size, stat.st_mtime_ns, time.monotonic())
+
+
+def placed_names(destination):
+    return sorted(path.name for path in destination.glob("output_*/*.pdf"))
+
+
+def test_split_parts_of_files_with_same_mtime_do_not_collide(tmp_path, make_pdf, monkeypatch):
+    destination = tmp_path / "tujuan"
+    first = make_pdf("doc.pdf", 6, image_size=300 * 1024, folder="sumber/a")
+    second = make_pdf("doc.pdf", 6, image_size=300 * 1024, folder="sumber/b")
+    mtime = os.stat(first).st_mtime_ns
+    os.utime(second, ns=(mtime, mtime))
+    watcher = split_watcher(tmp_path / "sumber", destination)
+
+    # Bagian terakhir file pertama gagal dipindahkan dan tertinggal.
+    real_move = watch.move_file
+    moves = []
+
+    def flaky_move(source_path, destination_path):
+        moves.append(source_path)
+        if len(moves) == 2:
+            raise OSError("disk penuh")
+        return real_move(source_path, destination_path)
+
+    monkeypatch.setattr(watch, "move_file", flaky_move)
+    place(watcher, first)
+    leftover = os.listdir(destination / PARTS_DIR_NAME)
+    assert len(leftover) == 1
+    # Asli belum dianggap selesai: tetap di sumber dan tidak dilewati.
+    assert os.path.exists(first)
+    assert first not in watcher.state.skipped
+
+    place(watcher, second)
+    assert not os.path.exists(second)
+    assert os.listdir(destination / PARTS_DIR_NAME) == leftover
+    assert len(placed_names(destination)) == 3
+
+    # Run berikutnya menempatkan bagian yang tertinggal lalu menghapus aslinya.
+    monkeypatch.setattr(watch, "move_file", real_move)
+    restarted = split_watcher(tmp_path / "sumber", destination)
+    restarted._recover_parts()
+    assert not (destination / PARTS_DIR_NAME).exists()
+    assert not os.path.exists(first)
+    assert len(placed_names(destination)) == 4
+    assert all(size <= MB for size in restarted.state.used.values())
+
+
+def test_interrupted_split_is_cleaned_up_on_start(tmp_path, make_pdf):
+    destination = tmp_path / "tujuan"
+    original = make_pdf("doc.pdf", 6, image_size=300 * 1024, folder="sumber")
+    # Pemecahan terputus: bagian ada, manifest belum ditulis.
+    interrupted = destination / PARTS_DIR_NAME / "123_abc"
+    interrupted.mkdir(parents=True)
+    (interrupted / "doc_hal1-3.pdf").write_bytes(b"setengah")
+    watcher = split_watcher(tmp_path / "sumber", destination)
+    watcher._recover_parts()
+    assert not (destination / PARTS_DIR_NAME).exists()
+    assert placed_names(destination) == []
+    assert os.path.exists(original)